@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark `Webscraper.download()` against the approach of the
+former example ``examples/save_photo.py``, which loaded all urls in
+streaming mode and wrote the bodies one after the other in chunks of 256
+bytes.
+
+Run it with the package installed::
+
+    python benchmarks/bench_download.py
+
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import xscrapers.webscraper as ws
+
+from server import BenchmarkServer
+
+N_FILES = 64
+FILE_SIZE = 2 * 2**20
+REPEAT = 3
+
+
+def sequential(urls, dest: Path) -> float:
+    webscraper = ws.Webscraper("html.parser", get_params={"stream": True})
+    start = time.perf_counter()
+    webscraper.get(urls)
+    for i, res in enumerate(webscraper.res):
+        with (dest / f"picture-{i}.png").open(mode="wb") as pic:
+            for chunk in res.iter_content(chunk_size=256):
+                pic.write(chunk)
+    return N_FILES * FILE_SIZE / 1e6 / (time.perf_counter() - start)
+
+
+def download(urls, dest: Path, chunk_size: int = None) -> float:
+    kwargs = {} if chunk_size is None else {"chunk_size": chunk_size}
+    with ws.Webscraper("html.parser") as webscraper:
+        return webscraper.download(urls, dest, **kwargs).mb_per_second
+
+
+if __name__ == "__main__":
+    body = b"\x89PNG\r\n\x1a\n" + b"\0" * (FILE_SIZE - 8)
+    modes = {
+        "sequential, 256 B": sequential,
+        "download(), 64 KiB": lambda urls, dest: download(
+            urls, dest, 2**16),
+        "download(), 1 MiB": download,
+    }
+    best = dict.fromkeys(modes, 0.0)
+    with BenchmarkServer(body=body, content_type="image/png") as server:
+        urls = [server.url(f"/{i}.png") for i in range(N_FILES)]
+        for _ in range(REPEAT):
+            for mode, func in modes.items():
+                with tempfile.TemporaryDirectory() as dest:
+                    best[mode] = max(best[mode], func(urls, Path(dest)))
+    print(f"{N_FILES} files of {FILE_SIZE // 2**20} MiB")
+    for mode, rate in best.items():
+        print(f"  {mode:20s} {rate:8.1f} MB/s")
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the resolution of the encodings of pages without a
+charset in the content-type header.
+
+The `EncodingResolver` searches a bounded prefix of the first page of a
+template and takes the encoding of the others from its cache, while before,
+5 % of every body was searched for a declaration and, without one,
+BeautifulSoup detected the encoding on its own.
+
+Run it with the package installed::
+
+    python benchmarks/bench_encoding.py
+
+"""
+
+import time
+
+import requests
+from bs4.dammit import EncodingDetector, UnicodeDammit
+
+import xscrapers.webscraper as ws
+from xscrapers.encoding import EncodingResolver
+
+from server import BenchmarkServer
+
+N_PAGES = 50
+PAGE_SIZE = 2**20
+
+
+def _timed(func, responses):
+    start = time.perf_counter()
+    for res in responses:
+        func(res)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    with BenchmarkServer(size=PAGE_SIZE, content_type="text/html") as server:
+        urls = [server.url(f"/items/{i}.html") for i in range(N_PAGES)]
+        with requests.Session() as session:
+            responses = [session.get(url) for url in urls]
+        results = {
+            "declaration in 5 % of the body": _timed(
+                lambda res: EncodingDetector.find_declared_encoding(
+                    res.content, is_html=True), responses),
+            "UnicodeDammit": _timed(
+                lambda res: UnicodeDammit(res.content, is_html=True),
+                responses),
+            "EncodingResolver": _timed(
+                EncodingResolver().resolve, responses),
+        }
+        with ws.Webscraper("html.parser") as webscraper:
+            webscraper.get(urls)
+            webscraper.parse(name="title")
+            stats = webscraper.encodings.stats
+    print(f"{N_PAGES} pages of {PAGE_SIZE // 1024} KiB without charset")
+    for name, elapsed in results.items():
+        print(f"{name:32s} {elapsed * 1000:8.2f} ms")
+    print(f"Webscraper.encodings.stats: {stats['detected']} detected, "
+          f"{stats['cached']} cached, {stats['http']} from the header")
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the overhead of the hooks of the requests and parses,
+without hooks, with disabled hooks, with a hook which does nothing and with
+the cProfile profiler of the stages.
+
+Run it with the package installed::
+
+    python benchmarks/bench_hooks.py
+
+"""
+
+import time
+
+import xscrapers.webscraper as ws
+from xscrapers.hooks import Hook, StageProfiler
+
+from server import BenchmarkServer
+
+N_PAGES = 500
+PAGE_SIZE = 50 * 1024
+PARSER = "html.parser"
+REPEAT = 3
+
+
+class NoopHook(Hook):
+
+    def before_request(self, method, url, kwargs):
+        pass
+
+    def after_response(self, method, url, res, seconds):
+        pass
+
+    def before_parse(self, res):
+        pass
+
+    def after_parse(self, res, obj, seconds):
+        pass
+
+
+def pages_per_second(url: str, mode: str) -> float:
+    hooks = {
+        "none": None,
+        "disabled": [NoopHook()],
+        "noop": [NoopHook()],
+        "profiled": [StageProfiler()],
+    }[mode]
+    with ws.Webscraper(PARSER, hooks=hooks) as webscraper:
+        if mode == "disabled":
+            webscraper.hooks.disable()
+        start = time.perf_counter()
+        webscraper.get([url] * N_PAGES)
+        webscraper.parse(name="title")
+        dur = time.perf_counter() - start
+    return N_PAGES / dur
+
+
+if __name__ == "__main__":
+    modes = ["none", "disabled", "noop", "profiled"]
+    with BenchmarkServer(size=PAGE_SIZE) as server:
+        url = server.url("/")
+        pages_per_second(url, "none")  # warm up
+        best = dict.fromkeys(modes, 0.0)
+        for _ in range(REPEAT):
+            for mode in modes:
+                best[mode] = max(best[mode], pages_per_second(url, mode))
+    print(f"{N_PAGES} pages of {PAGE_SIZE // 1024} KiB, get() and parse()")
+    for mode, rate in best.items():
+        print(f"  hooks {mode:8s}  {rate:8.1f} pages/s")
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the time to import the modules of the package in a
+fresh interpreter, as in short-lived worker processes and CLI invocations.
+
+Each import runs in a new interpreter in an empty directory, which is
+checked for files created by the import. Pass the source trees to compare,
+e.g. a checkout of an older commit::
+
+    git worktree add /tmp/old <commit>
+    python benchmarks/bench_import.py . /tmp/old
+
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+MODULES = [
+    "xscrapers",
+    "xscrapers.webscraper",
+    "xscrapers.tools",
+    "xscrapers.webdriver",
+]
+REPEAT = 7
+
+
+def import_time(
+    source: Path,
+    module: str,
+) -> tuple:
+    """Get the median time of importing a module in a fresh interpreter,
+    minus the start up time of the interpreter, and the files created."""
+    times = {}
+    for script in ["pass", f"import {module}"]:
+        samples = []
+        for _ in range(REPEAT):
+            with tempfile.TemporaryDirectory() as cwd:
+                start = time.perf_counter()
+                subprocess.run(
+                    [sys.executable, "-c", script],
+                    cwd=cwd,
+                    env={"PYTHONPATH": str(source)},
+                    check=True,
+                )
+                samples.append(time.perf_counter() - start)
+                created = sorted(path.name for path in Path(cwd).iterdir())
+        times[script] = statistics.median(samples)
+    return times[f"import {module}"] - times["pass"], created
+
+
+if __name__ == "__main__":
+    sources = [Path(arg).resolve() for arg in sys.argv[1:]] \
+        or [Path(__file__).resolve().parents[1]]
+    for source in sources:
+        print(source)
+        for module in MODULES:
+            elapsed, created = import_time(source, module)
+            print(f"  {module:24s} {elapsed * 1000:8.1f} ms  "
+                  f"created: {created or '-'}")
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the memory of `Webscraper.pipeline()` in lean mode,
+which replaces the responses by `ResponseRecord` objects once they are
+parsed, against keeping the full responses.
+
+Run it with the package installed::
+
+    python benchmarks/bench_lean.py
+
+"""
+
+import tracemalloc
+
+import xscrapers.webscraper as ws
+
+from server import BenchmarkServer
+
+N_PAGES = 300
+PAGE_SIZE = 100 * 1024
+PARSER = "html.parser"
+
+
+def _length(soup) -> int:
+    return len(soup.p.text)
+
+
+def run(url: str, lean: bool) -> tuple:
+    """Load and parse `N_PAGES` pages and return the peak memory and the
+    memory retained by the scraper in MiB."""
+    urls = [f"{url}?page={i}" for i in range(N_PAGES)]
+    with ws.Webscraper(PARSER, lean=lean) as webscraper:
+        tracemalloc.start()
+        webscraper.pipeline(urls, name="p", extract=_length)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert webscraper.data == [PAGE_SIZE] * N_PAGES
+    return peak / 2**20, retained / 2**20
+
+
+if __name__ == "__main__":
+    with BenchmarkServer(size=PAGE_SIZE) as server:
+        url = server.url("/")
+        for lean in [False, True]:
+            peak, retained = run(url, lean)
+            print(f"lean={lean!s:5}: peak {peak:7.1f} MiB, "
+                  f"retained {retained:7.1f} MiB")
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the extraction of links from the raw content with
+`Parser.links()` against the BeautifulSoup based `Parser.href()`.
+
+Run it with the package installed::
+
+    python benchmarks/bench_links.py
+
+"""
+
+import time
+
+import xscrapers.tools as tools
+
+from server import BenchmarkServer
+
+N_PAGES = 50
+N_LINKS = 2000
+PARSERS = ["html.parser", "lxml"]
+
+
+def page(n_links: int) -> bytes:
+    """Get a page with `n_links` relative links between some text."""
+    rows = "".join(
+        f'<li><p>Item {i}</p><a href="/item/{i}?b=2&a=1#top">{i}</a></li>'
+        for i in range(n_links))
+    return f"<html><body><ul>{rows}</ul></body></html>".encode("utf-8")
+
+
+def run(parser: str, url: str, fast: bool) -> float:
+    """Extract the links of `N_PAGES` pages and return the pages per second.
+    """
+    with tools.Parser(parser, doc_cache=None) as scraper:
+        scraper.get([url] * N_PAGES)
+        start = time.perf_counter()
+        data = scraper.links() if fast else scraper.href(None)
+        dur = time.perf_counter() - start
+    assert len(next(iter(data.values()))) == N_LINKS
+    return N_PAGES / dur
+
+
+if __name__ == "__main__":
+    with BenchmarkServer(body=page(N_LINKS)) as server:
+        url = server.url("/")
+        fast = run(PARSERS[0], url, True)
+        print(f"Parser.links():                {fast:8.1f} pages/s")
+        for parser in PARSERS:
+            soup = run(parser, url, False)
+            print(f"Parser.href() ({parser:11s}):   {soup:8.1f} pages/s"
+                  f"  (speedup {fast / soup:.1f}x)")
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the overhead of the verbose mode of the webscraper.
+
+The cost of the report of a response in the fetching thread is compared
+between formatting it right away and writing it with a `FileHandler`, as
+the verbose mode did before, and the queue-based log, in which the report
+is formatted and written by a background thread.
+
+Run it with the package installed::
+
+    python benchmarks/bench_logging.py
+
+"""
+
+import logging
+import os
+import tempfile
+import time
+
+import requests
+
+import xscrapers.webscraper as ws
+from xscrapers.logs import ScraperLog, flush_logging
+
+from server import BenchmarkServer
+
+N_PAGES = 1000
+N_REPORTS = 20000
+REPEAT = 3
+PARSER = "html.parser"
+
+
+def eager_callback(res: requests.Response, log: logging.Logger) -> None:
+    """The report of the verbose mode before."""
+    msg = f"\n----- REPORT START -----\n" \
+          f"URL: {res.url}\n" \
+          f"Time: {res.elapsed.total_seconds():.3f}s\n" \
+          f"Encoding: {res.encoding}\n" \
+          f"Reason: {res.reason}\n" \
+          f"Status Code: {res.status_code}\n" \
+          f"Certificate: {None}\n" \
+          f"----- REPORT END -----\n"
+    log.debug(msg)
+
+
+def per_report(func, res) -> float:
+    start = time.perf_counter()
+    for _ in range(N_REPORTS):
+        func(res)
+    return (time.perf_counter() - start) / N_REPORTS
+
+
+def pages_per_second(url: str, verbose: bool) -> float:
+    with ws.Webscraper(PARSER, verbose=verbose) as webscraper:
+        start = time.perf_counter()
+        webscraper.get([url] * N_PAGES)
+        dur = time.perf_counter() - start
+    return N_PAGES / dur
+
+
+if __name__ == "__main__":
+    with BenchmarkServer() as server:
+        url = server.url("/")
+        res = requests.get(url)
+        pages_per_second(url, False)  # warm up
+        # alternate the modes and keep the best of each
+        results = {"verbose=False": 0.0, "verbose=True": 0.0}
+        for _ in range(REPEAT):
+            for verbose in [False, True]:
+                results[f"verbose={verbose}"] = max(
+                    results[f"verbose={verbose}"],
+                    pages_per_second(url, verbose))
+    flush_logging()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_log = logging.getLogger("bench.sync")
+        sync_log.propagate = False
+        sync_log.setLevel(logging.DEBUG)
+        handler = logging.FileHandler(os.path.join(tmp, "sync.log"))
+        handler.setFormatter(logging.Formatter(
+            "%(asctime)s:[%(threadName)-12.12s]:%(levelname)s:%(name)s:"
+            "%(message)s"))
+        sync_log.addHandler(handler)
+        eager = per_report(lambda res: eager_callback(res, sync_log), res)
+        handler.close()
+    queued_log = ScraperLog(logging.DEBUG)
+    queued = per_report(lambda res: ws.callback(res, log=queued_log), res)
+    flush_logging()
+    off_log = ScraperLog(logging.WARNING)
+    off = per_report(lambda res: ws.callback(res, log=off_log), res)
+
+    print(f"{N_PAGES} pages")
+    for name, rate in results.items():
+        print(f"  {name:14s} {rate:8.1f} pages/s")
+    print("Cost of a report in the fetching thread")
+    print(f"  eager, FileHandler   {eager * 1e6:8.2f} us")
+    print(f"  lazy, queue          {queued * 1e6:8.2f} us")
+    print(f"  below the level      {off * 1e6:8.2f} us")
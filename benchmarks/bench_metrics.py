@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the overhead of timing the stages of the requests and
+parses, and print the breakdown per stage.
+
+Run it with the package installed::
+
+    python benchmarks/bench_metrics.py
+
+"""
+
+import time
+
+import xscrapers.webscraper as ws
+from xscrapers.metrics import STAGES, Metrics
+
+from server import BenchmarkServer
+
+N_PAGES = 500
+PAGE_SIZE = 50 * 1024
+PARSER = "html.parser"
+REPEAT = 3
+
+
+def pages_per_second(url: str, metrics: Metrics = None) -> float:
+    with ws.Webscraper(PARSER, metrics=metrics) as webscraper:
+        start = time.perf_counter()
+        webscraper.get([url] * N_PAGES)
+        webscraper.parse(name="title")
+        dur = time.perf_counter() - start
+    return N_PAGES / dur
+
+
+if __name__ == "__main__":
+    with BenchmarkServer(size=PAGE_SIZE) as server:
+        url = server.url("/")
+        pages_per_second(url)  # warm up
+        best = {"off": 0.0, "on": 0.0}
+        for _ in range(REPEAT):
+            metrics = Metrics()
+            best["off"] = max(best["off"], pages_per_second(url))
+            best["on"] = max(best["on"], pages_per_second(url, metrics))
+    print(f"{N_PAGES} pages of {PAGE_SIZE // 1024} KiB, get() and parse()")
+    for mode, rate in best.items():
+        print(f"  metrics {mode:3s}  {rate:8.1f} pages/s")
+    print("Mean duration per stage of the last run")
+    stages = metrics.snapshot()["seconds"]["127.0.0.1"]
+    for stage in STAGES:
+        if stage in stages:
+            hist = stages[stage]
+            print(f"  {stage:9s} {hist['sum'] / hist['count'] * 1000:8.3f} ms"
+                  f"  ({hist['count']} observations)")
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the reuse of pooled connections against tearing down
+the session after every request, as the webscraper did before.
+
+Run it with the package installed::
+
+    python benchmarks/bench_pool.py
+
+"""
+
+import time
+
+import xscrapers.webscraper as ws
+
+from server import BenchmarkServer
+
+N_REQUESTS = 500
+PARSER = "html.parser"
+
+
+def run(teardown: bool, url: str) -> float:
+    """Send `N_REQUESTS` GET requests and return the requests per second."""
+    with ws.Webscraper(PARSER) as webscraper:
+        start = time.perf_counter()
+        for _ in range(N_REQUESTS):
+            webscraper.get(url)
+            if teardown:
+                webscraper.close()
+        dur = time.perf_counter() - start
+    return N_REQUESTS / dur
+
+
+if __name__ == "__main__":
+    with BenchmarkServer() as server:
+        url = server.url("/")
+        # warm up the server and the imports
+        run(False, url)
+        teardown = run(True, url)
+        pooled = run(False, url)
+    print(f"Session teardown per request: {teardown:8.1f} requests/s")
+    print(f"Pooled connections:           {pooled:8.1f} requests/s")
+    print(f"Speedup:                      {pooled / teardown:8.2f}x")
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the extraction of 15 fields per page with a compiled
+`Schema` against ad-hoc `find()` calls on fully parsed BeautifulSoup
+documents.
+
+Run it with the package installed::
+
+    python benchmarks/bench_schema.py
+
+"""
+
+import time
+
+import xscrapers.tools as tools
+
+from server import BenchmarkServer
+
+N_PAGES = 50
+N_FIELDS = 15
+N_NOISE = 500
+
+
+def page() -> bytes:
+    """Get a page with `N_FIELDS` fields between unrelated paragraphs."""
+    noise = "".join(f"<p class='text'>Paragraph {i} <b>bold</b> <a href='/{i}'>"
+                    f"link</a></p>" for i in range(N_NOISE))
+    fields = "".join(f"<span class='f{i}'>{i}.5</span>"
+                     for i in range(N_FIELDS))
+    return f"<html><head><title>Quote</title></head><body>{noise}" \
+        f"<div class='quote'>{fields}</div>{noise}</body></html>".encode()
+
+
+def adhoc(scraper: tools.Parser) -> list:
+    """Extract the fields from fully parsed documents with `find()`."""
+    scraper.data = None
+    scraper.parse()
+    return [
+        {f"f{i}": float(soup.find("span", attrs={"class": f"f{i}"}).text)
+         for i in range(N_FIELDS)}
+        for soup in scraper.data
+    ]
+
+
+def run(scraper: tools.Parser, schema: tools.Schema = None) -> float:
+    """Extract the fields of all pages and return the pages per second."""
+    start = time.perf_counter()
+    if schema is None:
+        records = adhoc(scraper)
+    else:
+        records = list(scraper.extract(schema).values())
+    dur = time.perf_counter() - start
+    assert records[0]["f3"] == 3.5
+    return N_PAGES / dur
+
+
+if __name__ == "__main__":
+    fields = {f"f{i}": tools.Field(f"div.quote span.f{i}", convert=float)
+              for i in range(N_FIELDS)}
+    with BenchmarkServer(body=page()) as server:
+        urls = [server.url(f"/{i}") for i in range(N_PAGES)]
+        with tools.Parser("html.parser", doc_cache=None) as scraper:
+            scraper.get(urls)
+            baseline = run(scraper)
+            print(f"find() on full documents:  {baseline:8.1f} pages/s")
+            for backend in ["bs4", "lxml"]:
+                schema = tools.Schema(fields, backend=backend)
+                rate = run(scraper, schema)
+                print(f"Schema (backend={backend:4s}):     {rate:8.1f} pages/s"
+                      f"  (speedup {rate / baseline:.1f}x)")
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the download of a large file in one stream and in
+byte ranges over parallel connections, from a server which limits the
+bandwidth of each connection, as the internet usually does.
+
+Run it with the package installed::
+
+    python benchmarks/bench_segmented.py
+
+"""
+
+import tempfile
+
+import xscrapers.webscraper as ws
+
+from server import BenchmarkServer
+
+FILE_SIZE = 64 * 2**20
+# the bandwidth of each connection in bytes per second
+BANDWIDTH = 25 * 2**20
+SEGMENT_SIZE = 4 * 2**20
+
+
+def mb_per_second(url: str, max_in_flight: int = None) -> float:
+    with ws.Webscraper("html.parser") as webscraper, \
+            tempfile.TemporaryDirectory() as dest:
+        if max_in_flight is None:
+            report = webscraper.download(url, dest)
+        else:
+            report = webscraper.download_segmented(
+                url, dest, segment_size=SEGMENT_SIZE,
+                max_in_flight=max_in_flight)
+        assert not report.errors, report.errors
+        return report.mb_per_second
+
+
+if __name__ == "__main__":
+    body = b"\0" * FILE_SIZE
+    with BenchmarkServer(
+            body=body,
+            content_type="application/octet-stream",
+            bandwidth=BANDWIDTH) as server:
+        url = server.url("/data.bin")
+        print(f"A file of {FILE_SIZE // 2**20} MiB, "
+              f"{BANDWIDTH // 2**20} MiB/s per connection")
+        print(f"  one stream        {mb_per_second(url):8.1f} MB/s")
+        for max_in_flight in [2, 4, 8]:
+            print(f"  {max_in_flight} ranges at once "
+                  f"{mb_per_second(url, max_in_flight):8.1f} MB/s")
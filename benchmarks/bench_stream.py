@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark `Webscraper.stream_parse()`, which stops the download
+as soon as the <head></head> element is complete, against downloading and
+parsing the whole page with `get()` and `parse()`.
+
+Run it with the package installed::
+
+    python benchmarks/bench_stream.py
+
+"""
+
+import time
+
+import xscrapers.webscraper as ws
+
+from server import BenchmarkServer
+
+N_PAGES = 50
+PAGE_SIZE = 2**20
+PARSER = "html.parser"
+
+
+def run(url: str, stream: bool) -> tuple:
+    """Get the <head></head> of `N_PAGES` pages and return the pages per
+    second and the number of bytes downloaded per page."""
+    urls = [f"{url}?page={i}" for i in range(N_PAGES)]
+    with ws.Webscraper(PARSER) as webscraper:
+        start = time.perf_counter()
+        if stream:
+            webscraper.stream_parse(urls, "head")
+        else:
+            webscraper.get(urls)
+            webscraper.parse(name="head")
+        dur = time.perf_counter() - start
+        size = sum(len(res.content) for res in webscraper.res) / N_PAGES
+    assert all(soup.title.text == "Bench" for soup in webscraper.data)
+    return N_PAGES / dur, size
+
+
+if __name__ == "__main__":
+    body = b"<html><head><title>Bench</title></head><body>" \
+        + b"<p>" + b"x" * PAGE_SIZE + b"</p></body></html>"
+    with BenchmarkServer(body=body) as server:
+        url = server.url("/")
+        full, full_size = run(url, False)
+        stream, stream_size = run(url, True)
+    print(f"get() + parse():  {full:8.1f} pages/s "
+          f"{full_size / 1024:8.0f} KiB/page")
+    print(f"stream_parse():   {stream:8.1f} pages/s "
+          f"{stream_size / 1024:8.0f} KiB/page")
+    print(f"Speedup:          {stream / full:8.2f}x")
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the conversion of html tables to DataFrames directly
+from the parsed elements against serializing each table with `prettify()`
+and parsing it again with `pd.read_html()`, as `Parser.table()` did before.
+
+Run it with the package installed::
+
+    python benchmarks/bench_tables.py
+
+"""
+
+import time
+
+import pandas as pd
+
+import xscrapers.tools as tools
+
+from server import BenchmarkServer
+
+N_PAGES = 10
+N_TABLES = 40
+N_ROWS = 20
+PARSER = "lxml"
+
+
+def page(n_tables: int, n_rows: int) -> bytes:
+    """Get a page with `n_tables` tables of `n_rows` rows each."""
+    head = "<thead><tr><th rowspan='2'>Name</th><th colspan='2'>Price</th>" \
+        "</tr><tr><th>Bid</th><th>Ask</th></tr></thead>"
+    rows = "".join(
+        f"<tr><td>Stock {i}</td><td>{i},000.5</td><td>{i + 1}.25</td></tr>"
+        for i in range(n_rows))
+    tables = "".join(
+        f"<p>Table {i}</p><table>{head}<tbody>{rows}</tbody></table>"
+        for i in range(n_tables))
+    return f"<html><body>{tables}</body></html>".encode("utf-8")
+
+
+def prettify_tables(tables: list) -> list:
+    """The former implementation of `Parser.table()`."""
+    return [pd.read_html(table.prettify(), flavor="bs4")[0]
+            for table in tables]
+
+
+def run(scraper: tools.Parser, mode: str) -> float:
+    """Extract the tables of all pages and return the pages per second."""
+    scraper.data = None
+    start = time.perf_counter()
+    if mode == "prettify":
+        scraper.parse(name="table")
+        data = [prettify_tables(soup("table")) for soup in scraper.data]
+    elif mode == "table":
+        data = list(scraper.table(None).values())
+    else:
+        data = [tools.read_tables(res.content) for res in scraper.res]
+    dur = time.perf_counter() - start
+    assert all(len(dfs) == N_TABLES for dfs in data)
+    return N_PAGES / dur
+
+
+if __name__ == "__main__":
+    with BenchmarkServer(body=page(N_TABLES, N_ROWS)) as server:
+        urls = [server.url(f"/{i}") for i in range(N_PAGES)]
+        with tools.Parser(PARSER, doc_cache=None) as scraper:
+            scraper.get(urls)
+            prettify = run(scraper, "prettify")
+            table = run(scraper, "table")
+            raw = run(scraper, "raw")
+    print(f"prettify + pd.read_html: {prettify:8.2f} pages/s")
+    print(f"Parser.table():          {table:8.2f} pages/s"
+          f"  (speedup {table / prettify:.1f}x)")
+    print(f"read_tables():           {raw:8.2f} pages/s"
+          f"  (speedup {raw / prettify:.1f}x)")
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """Benchmark the construction of the User-Agent of a scraper by the
+bundled `UserAgentPool` against ``fake_useragent.UserAgent()``, which was
+built by each `Webscraper` before.
+
+Run it with the package installed (fake_useragent is optional)::
+
+    python benchmarks/bench_useragents.py
+
+"""
+
+import time
+
+import xscrapers.webscraper as ws
+from xscrapers.useragents import UserAgentPool
+
+N = 200
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    for _ in range(N):
+        func()
+    return (time.perf_counter() - start) / N
+
+
+if __name__ == "__main__":
+    results = {"UserAgentPool": _timed(lambda: UserAgentPool().get())}
+    try:
+        from fake_useragent import UserAgent
+    except ImportError:
+        pass
+    else:
+        results["fake_useragent.UserAgent"] = _timed(
+            lambda: UserAgent().random)
+    results["Webscraper"] = _timed(
+        lambda: ws.Webscraper("html.parser").close())
+    for name, elapsed in results.items():
+        print(f"{name:26s} {elapsed * 1e6:10.1f} us per construction")
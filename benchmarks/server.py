@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """A local HTTP server used as stand-in for live websites
+in the benchmarks.
+"""
+
+import functools
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+@functools.lru_cache(maxsize=256)
+def synthetic_page(
+    idx: int,
+    size: int = 10240,
+    tables: int = 0,
+    links: int = 0,
+    rows: int = 10,
+) -> bytes:
+    """Get a synthetic html page.
+
+    Parameters
+    ----------
+    idx : int
+        The number of the page, which its title and links depend on.
+    size : int
+        The minimum size of the page in bytes, the page is padded with
+        paragraphs, by default 10240.
+    tables : int
+        The number of tables, by default 0.
+    links : int
+        The number of links, relative, absolute and external ones in turn,
+        by default 0.
+    rows : int
+        The number of rows of each table, by default 10.
+
+    Returns
+    -------
+    bytes
+        The page encoded as UTF-8.
+
+    """
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>Page {idx}</title></head><body><h1>Page {idx}</h1>",
+    ]
+    for i in range(links):
+        target = idx * links + i
+        href = [f"/page/{target}", f"/page/{target}?ref={idx}",
+                f"https://example.com/{target}"][i % 3]
+        parts.append(f"<a href='{href}'>link {i}</a>")
+    for i in range(tables):
+        body = "".join(
+            f"<tr><td>row {j}</td><td>{j * 1000 + i:,}</td>"
+            f"<td>{j / 7:.3f}</td></tr>"
+            for j in range(rows))
+        parts.append(
+            f"<table id='t{i}'><tr><th>Name</th><th>Count</th>"
+            f"<th>Share</th></tr>{body}</table>")
+    page = "".join(parts)
+    filler = "<p>" + "lorem ipsum " * 20 + "</p>"
+    while len(page) < size:
+        page += filler
+    return (page + "</body></html>").encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def handle(self) -> None:
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # the client has closed the connection before reading the page
+            pass
+
+    def do_GET(self) -> None:
+        split = urlsplit(self.path)
+        if split.path.startswith("/page/"):
+            # a synthetic page, e.g. /page/3?size=2048&tables=2&latency=0.05
+            query = {key: val[0] for key, val in parse_qs(split.query).items()}
+            latency = float(query.pop("latency", 0))
+            body = synthetic_page(
+                int(split.path.rsplit("/", 1)[-1] or 0),
+                **{key: int(val) for key, val in query.items()
+                   if key in ("size", "tables", "links", "rows")},
+            )
+            if latency:
+                time.sleep(latency)
+        else:
+            body = self.server.body
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)",
+                             self.headers.get("Range", ""))
+        if match is None:
+            self.send_response(200)
+        else:
+            start, end = int(match[1]), min(int(match[2]), len(body) - 1)
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{end}/{len(body)}")
+            body = body[start:end + 1]
+        self.send_header("Content-Type", self.server.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        bandwidth = self.server.bandwidth
+        if bandwidth is None:
+            self.wfile.write(body)
+            return
+        # send chunks of 64 KiB at `bandwidth` bytes per second
+        start = time.perf_counter()
+        for offset in range(0, len(body), 2**16):
+            self.wfile.write(body[offset:offset + 2**16])
+            delay = start + (offset + 2**16) / bandwidth \
+                - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    do_HEAD = do_GET
+
+
+class BenchmarkServer:
+    """Serve a static page on ``127.0.0.1`` in a background thread.
+
+    The paths ``/page/<n>`` serve synthetic pages instead, see
+    `synthetic_page()`, of which the size, the number of tables and links,
+    and the latency of the response in seconds are given in the query,
+    e.g. ``/page/3?size=2048&tables=2&links=50&latency=0.05``.
+    Requests with a Range header of a single range get that part of the
+    page.
+
+    Parameters
+    ----------
+    size : int
+        The size of the page in bytes, by default 10240.
+    body : bytes, optional
+        The page served instead of the default page of `size` bytes.
+    content_type : str
+        The content-type header of the page,
+        by default "text/html; charset=utf-8".
+    bandwidth : float, optional
+        The maximum number of bytes per second sent per response, e.g. to
+        emulate the bandwidth of a single connection over the internet.
+
+    """
+
+    def __init__(
+        self,
+        size: int = 10240,
+        body: bytes = None,
+        content_type: str = "text/html; charset=utf-8",
+        bandwidth: float = None,
+    ) -> None:
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        if body is None:
+            body = b"<html><body><p>" + b"x" * size + b"</p></body></html>"
+        self._httpd.body = body
+        self._httpd.content_type = content_type
+        self._httpd.bandwidth = bandwidth
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, daemon=True)
+
+    def url(self, path: str = "/") -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self) -> "BenchmarkServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
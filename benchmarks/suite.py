@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """The offline benchmark suite of the scrapers.
+
+A local `BenchmarkServer` serves synthetic pages of a given size, latency,
+number of tables and number of links, such that the results do not depend
+on live websites and the network. The suite measures
+
+* "fetch": loading the pages with `Webscraper.iter_get()` for each number
+  of requests in flight,
+* "parse": `Webscraper.parse()` of the loaded pages for each parser,
+* "table": `Parser.table()` for each parser,
+* "href": `Parser.href()` for each parser,
+* "links": `Parser.links()`, which does not depend on the parser,
+
+and writes the results as JSON, which can be compared with the results of
+another version, e.g.::
+
+    python benchmarks/suite.py --output new.json
+    git checkout v0.0.7 && python benchmarks/suite.py --output old.json
+    python benchmarks/suite.py --compare old.json new.json
+
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import xscrapers
+import xscrapers.tools as tools
+import xscrapers.webscraper as ws
+
+from server import BenchmarkServer
+
+BENCHMARKS = ("fetch", "parse", "table", "href", "links")
+
+
+def _commit() -> Optional[str]:
+    """Get the commit of the source tree, None if it is no git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _best(
+    func: Callable[[], Callable[[], None]],
+    repeat: int,
+) -> float:
+    """Get the shortest duration of `repeat` runs in seconds.
+
+    `func` sets up a run (untimed) and returns the function which is timed.
+    """
+    durations = []
+    for _ in range(repeat):
+        run = func()
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def _loaded(
+    cls: type,
+    parser: str,
+    urls: List[str],
+) -> ws.Webscraper:
+    """Get a scraper of which the urls have been loaded."""
+    scraper = cls(parser)
+    scraper.get(urls)
+    return scraper
+
+
+def run_suite(
+    args: argparse.Namespace,
+) -> dict:
+    """Run the benchmarks given by the command line arguments.
+
+    Returns
+    -------
+    dict
+        The metadata ("meta"), the configuration ("config") and a list of
+        results ("results"), each with the benchmark, parser, concurrency,
+        number of pages, best duration in seconds, pages per second and
+        MiB of html per second.
+
+    """
+    query = f"size={args.size}&tables={args.tables}&links={args.links}"
+    results = []
+
+    def record(benchmark, parser, concurrency, seconds):
+        results.append({
+            "benchmark": benchmark,
+            "parser": parser,
+            "concurrency": concurrency,
+            "pages": args.pages,
+            "seconds": seconds,
+            "pages_per_second": args.pages / seconds,
+            "mb_per_second": args.pages * args.size / seconds / 2**20,
+        })
+        print(f"{benchmark:6s} {parser or '-':12s} {concurrency or '-':>4} "
+              f"{args.pages / seconds:10.1f} pages/s", flush=True)
+
+    with BenchmarkServer() as server:
+        urls = [server.url(f"/page/{i}?{query}") for i in range(args.pages)]
+        slow_urls = [f"{url}&latency={args.latency}" for url in urls]
+        if "fetch" in args.benchmarks:
+            for concurrency in args.concurrency:
+                def fetch():
+                    scraper = ws.Webscraper(args.parsers[0])
+                    return lambda: list(scraper.iter_get(
+                        slow_urls, max_in_flight=concurrency))
+                record("fetch", None, concurrency,
+                       _best(fetch, args.repeat))
+        for parser in args.parsers:
+            if "parse" in args.benchmarks:
+                record("parse", parser, None, _best(
+                    lambda: _loaded(ws.Webscraper, parser, urls).parse,
+                    args.repeat))
+            if "table" in args.benchmarks:
+                record("table", parser, None, _best(
+                    lambda: lambda scraper=_loaded(
+                        tools.Parser, parser, urls): scraper.table(None),
+                    args.repeat))
+            if "href" in args.benchmarks:
+                record("href", parser, None, _best(
+                    lambda: lambda scraper=_loaded(
+                        tools.Parser, parser, urls): scraper.href(None),
+                    args.repeat))
+        if "links" in args.benchmarks:
+            record("links", None, None, _best(
+                lambda: _loaded(tools.Parser, args.parsers[0], urls).links,
+                args.repeat))
+    return {
+        "meta": {
+            "version": xscrapers.__version__,
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "config": {
+            key: getattr(args, key) for key in [
+                "pages", "size", "tables", "links", "latency", "repeat",
+                "parsers", "concurrency", "benchmarks",
+            ]
+        },
+        "results": results,
+    }
+
+
+def compare(
+    old: dict,
+    new: dict,
+) -> Dict[tuple, float]:
+    """Compare the results of two runs of the suite.
+
+    Returns
+    -------
+    Dict[tuple, float]
+        The ratio of the pages per second of `new` to those of `old` by
+        benchmark, parser and concurrency, for the results in both.
+
+    """
+    def key(result):
+        return result["benchmark"], result["parser"], result["concurrency"]
+
+    before = {key(result): result for result in old["results"]}
+    ratios = {}
+    for result in new["results"]:
+        if key(result) in before:
+            ratios[key(result)] = result["pages_per_second"] \
+                / before[key(result)]["pages_per_second"]
+    return ratios
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--pages", type=int, default=200,
+                        help="the number of pages, by default 200")
+    parser.add_argument("--size", type=int, default=20 * 1024,
+                        help="the size of each page in bytes")
+    parser.add_argument("--tables", type=int, default=3,
+                        help="the number of tables of each page")
+    parser.add_argument("--links", type=int, default=60,
+                        help="the number of links of each page")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="the latency of the responses of the fetch "
+                             "benchmark in seconds")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="the number of runs, the best is kept")
+    parser.add_argument("--parsers", nargs="+",
+                        default=["html.parser", "lxml"])
+    parser.add_argument("--concurrency", nargs="+", type=int,
+                        default=[1, 8, 32])
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS,
+                        default=list(BENCHMARKS))
+    parser.add_argument("--output", type=Path,
+                        help="the JSON file the results are written to")
+    parser.add_argument("--compare", nargs=2, type=Path,
+                        metavar=("OLD", "NEW"),
+                        help="compare two result files instead of running")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args(sys.argv[1:])
+    if args.compare:
+        old, new = (json.loads(path.read_text()) for path in args.compare)
+        for (benchmark, parser, concurrency), ratio in compare(
+                old, new).items():
+            print(f"{benchmark:6s} {parser or '-':12s} {concurrency or '-':>4}"
+                  f" {ratio:6.2f}x")
+    else:
+        results = run_suite(args)
+        if args.output is not None:
+            args.output.write_text(json.dumps(results, indent=2))
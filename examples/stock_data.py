@@ -22,9 +22,15 @@ and speed, but this requires the user to manually filter for the desired table.
 """
 
 import xscrapers.tools as tools
+from xscrapers.cache import ResponseCache
 
-# define the parser object
-parser = tools.Parser(parser="html.parser", verbose=True)
+# define the parser object, the pages are cached such that running this
+# example again only revalidates the pages
+parser = tools.Parser(
+    parser="html.parser",
+    verbose=True,
+    cache=ResponseCache("./cache"),
+)
 # define the url
 urls = [
     "https://www.finanzen.net/aktien/dax-realtimekurse",
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """A local HTTP server used by the tests instead of live websites.
+"""
+
+import collections
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Page {idx}</title></head>
+<body>
+<h1 class="title">Page {idx}</h1>
+<a href="/page/{next_idx}">next</a>
+<a href="https://example.com/">external</a>
+<table>
+<tr><th>Name</th><th>Value</th></tr>
+<tr><td>a</td><td>{idx}</td></tr>
+<tr><td>b</td><td>{next_idx}</td></tr>
+</table>
+</body>
+</html>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def handle(self) -> None:
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # the client has closed the connection before reading the page
+            pass
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str = "text/html; charset=utf-8",
+        headers: dict = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, val in (headers or {}).items():
+            self.send_header(key, val)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self.server.requests.append(self.path)
+        self.server.agents[self.path] = self.headers.get("User-Agent")
+        split = urlsplit(self.path)
+        parts = split.path.strip("/").split("/")
+        query = parse_qs(split.query)
+        delay = float(query.get("delay", ["0"])[0])
+        if delay:
+            time.sleep(delay)
+        if parts[0] == "page":
+            idx = int(parts[1]) if len(parts) > 1 else 0
+            body = PAGE.format(idx=idx, next_idx=idx + 1).encode("utf-8")
+            self._send(200, body)
+        elif parts[0] == "cached":
+            # a page with a validator which is fresh for `parts[1]` seconds
+            headers = {"ETag": '"v1"', "Cache-Control": f"max-age={parts[1]}"}
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                for key, val in headers.items():
+                    self.send_header(key, val)
+                self.end_headers()
+            else:
+                self._send(200, PAGE.format(idx=0, next_idx=1).encode(
+                    "utf-8"), headers=headers)
+        elif parts[0] == "flaky":
+            # fail with 503 for the first `parts[1]` requests of this path
+            self.server.hits[self.path] += 1
+            if self.server.hits[self.path] <= int(parts[1]):
+                self._send(503, b"", headers={"Retry-After": "0"})
+            else:
+                self._send(200, PAGE.format(idx=0, next_idx=1).encode("utf-8"))
+        elif parts[0] == "large":
+            # a page followed by `parts[1]` KiB of paragraphs
+            head, tail = PAGE.format(idx=0, next_idx=1).encode(
+                "utf-8").split(b"</body>")
+            filler = b"<p>" + b"x" * 1017 + b"</p>\n"
+            size = int(parts[1])
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(
+                len(head) + size * len(filler) + len(tail) + 7))
+            self.end_headers()
+            self.wfile.write(head)
+            for _ in range(size):
+                self.wfile.write(filler)
+            self.wfile.write(b"</body>" + tail)
+        elif parts[0] == "binary":
+            # `parts[1]` KiB of a png, of the content type given
+            body = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4 * int(
+                parts[1])
+            self._send(200, body, content_type=query.get(
+                "type", ["image/png"])[0])
+        elif parts[0] == "ranged":
+            self._ranged(int(parts[1]) * 1024, query)
+        elif parts[0] == "status":
+            self._send(int(parts[1]), b"")
+        else:
+            self._send(404, b"not found")
+
+    do_HEAD = do_GET
+
+    def _ranged(
+        self,
+        size: int,
+        query: dict,
+    ) -> None:
+        """Serve a file of `size` bytes which supports byte ranges. The
+        first request of the range starting at the byte given by "broken"
+        is cut off halfway, the ETag is weak if "etag" is "weak"."""
+        body = (bytes(range(251)) * (size // 251 + 1))[:size]
+        headers = {
+            "Accept-Ranges": "bytes",
+            "ETag": 'W/"r1"' if query.get("etag") == ["weak"] else '"r1"',
+            "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)",
+                             self.headers.get("Range", ""))
+        if match is None or self.command == "HEAD":
+            self._send(200, body, "application/octet-stream", headers)
+            return
+        self.server.ranges.append(self.headers["Range"])
+        self.server.if_ranges.append(self.headers.get("If-Range"))
+        start, end = int(match[1]), min(int(match[2]), size - 1)
+        part = body[start:end + 1]
+        self.send_response(206)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(part)))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        for key, val in headers.items():
+            self.send_header(key, val)
+        self.end_headers()
+        key = (self.path, start)
+        self.server.hits[key] += 1
+        if query.get("broken", [""])[0] == str(start) \
+                and self.server.hits[key] == 1:
+            self.wfile.write(part[:len(part) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(part)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self._send(200, body, content_type="text/plain")
+
+    do_PUT = do_POST
+    do_PATCH = do_POST
+    do_DELETE = do_POST
+    do_OPTIONS = do_POST
+
+
+class LocalServer:
+    """Serve synthetic pages on ``127.0.0.1`` in a background thread.
+
+    Examples
+    --------
+    >>> with LocalServer() as server:
+    ...     url = server.url("/page/1")
+
+    """
+
+    def __init__(self) -> None:
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.requests = []
+        self._httpd.connections = 0
+        self._httpd.hits = collections.Counter()
+        self._httpd.agents = {}
+        self._httpd.ranges = []
+        self._httpd.if_ranges = []
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> list:
+        """The paths requested so far."""
+        return self._httpd.requests
+
+    @property
+    def agents(self) -> dict:
+        """The User-Agent of the last request by path."""
+        return self._httpd.agents
+
+    @property
+    def ranges(self) -> list:
+        """The Range headers of the requests so far."""
+        return self._httpd.ranges
+
+    @property
+    def if_ranges(self) -> list:
+        """The If-Range headers of the requests with a Range header so far,
+        None if not sent."""
+        return self._httpd.if_ranges
+
+    @property
+    def connections(self) -> int:
+        """The number of connections accepted so far."""
+        return self._httpd.connections
+
+    def url(self, path: str = "/") -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self) -> "LocalServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
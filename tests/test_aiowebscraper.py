@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import unittest
+
+import requests
+import xscrapers.aiowebscraper as aws
+from bs4 import BeautifulSoup
+
+from _server import LocalServer
+
+
+class TestAsyncWebScraper(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.urls = [self.server.url(f"/page/{i}") for i in range(20)]
+        self.parser = "html.parser"
+        self.webscraper = aws.AsyncWebscraper(self.parser)
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_single_url(self):
+        res = self.webscraper.get(self.urls[0])
+        assert isinstance(res, requests.Response)
+        assert res.ok
+        assert res.encoding == "utf-8"
+        assert self.webscraper._http_request["GET"]
+        assert isinstance(self.webscraper.url, str)
+
+    def test_multiple_url(self):
+        urls = self.urls + [self.server.url("/status/500")]
+        self.webscraper.get(urls)
+        assert self.webscraper.url == self.urls
+        assert len(self.webscraper.res) == len(self.urls)
+
+    def test_multiple_parse(self):
+        self.webscraper.get(self.urls)
+        self.webscraper.parse(name="h1")
+        assert isinstance(self.webscraper.data, list)
+        assert self.webscraper.data[3].h1.text == "Page 3"
+
+    def test_iter_get(self):
+        # the methods inherited from the Webscraper send the requests
+        # over its threaded session
+        results = dict(self.webscraper.iter_get(self.urls[:5]))
+        assert sorted(results) == sorted(self.urls[:5])
+        assert all(res.ok for res in results.values())
+        self.webscraper.pipeline(self.urls[:3], name="h1")
+        assert [doc.h1.text for doc in self.webscraper.data] \
+            == ["Page 0", "Page 1", "Page 2"]
+
+    def test_error_handling(self):
+        res = self.webscraper.get("http://127.0.0.1:1/")
+        assert isinstance(res, requests.exceptions.RequestException)
+
+    def test_running_loop(self):
+        async def main():
+            await self.webscraper.aget(self.urls)
+            await self.webscraper.aparse()
+
+        asyncio.run(main())
+        assert isinstance(self.webscraper.data[0], BeautifulSoup)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import tempfile
+import time
+import unittest
+
+import xscrapers.tools as tools
+import xscrapers.webscraper as ws
+from xscrapers.cache import DocumentCache, ResponseCache
+
+from _server import LocalServer
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.tmp_dir.name)
+        self.parser = "html.parser"
+        self.webscraper = ws.Webscraper(self.parser, cache=self.cache)
+
+    def tearDown(self):
+        self.webscraper.close()
+        self.tmp_dir.cleanup()
+        self.server.__exit__(None, None, None)
+
+    def test_fresh_hit(self):
+        url = self.server.url("/cached/60")
+        first = self.webscraper.get(url)
+        second = self.webscraper.get(url)
+        assert len(self.server.requests) == 1
+        assert second.from_cache
+        assert second.content == first.content
+        assert self.cache.stats["hits"] == 1
+        assert self.cache.stats["misses"] == 1
+
+    def test_revalidation(self):
+        url = self.server.url("/cached/0")
+        first = self.webscraper.get(url)
+        second = self.webscraper.get(url)
+        assert len(self.server.requests) == 2
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert self.cache.stats["revalidations"] == 1
+
+    def test_not_stored(self):
+        url = self.server.url("/page/1")
+        self.webscraper.get(url)
+        self.webscraper.get(url)
+        # without freshness information nor validators nothing is stored
+        assert len(self.server.requests) == 2
+        assert self.cache.stats["misses"] == 2
+        assert len(self.cache) == 0
+
+    def test_persistence(self):
+        url = self.server.url("/cached/60")
+        self.webscraper.get(url)
+        cache = ResponseCache(self.tmp_dir.name)
+        webscraper = ws.Webscraper(self.parser, cache=cache)
+        res = webscraper.get(url)
+        assert res.from_cache
+        assert len(self.server.requests) == 1
+
+    def test_eviction(self):
+        url = self.server.url("/cached/60")
+        size = len(self.webscraper.get(url).content)
+        cache = ResponseCache(self.tmp_dir.name, max_size=2 * size)
+        webscraper = ws.Webscraper(self.parser, cache=cache)
+        webscraper.get(url + "?a")
+        time.sleep(0.01)
+        webscraper.get(url)
+        webscraper.get(url + "?b")
+        assert len(cache) == 2
+        assert cache.stats["evictions"] == 1
+        # the least recently used response was evicted
+        assert webscraper.get(url).from_cache
+
+    def test_evicted_meanwhile(self):
+        url = self.server.url("/cached/60")
+        first = self.webscraper.get(url)
+        load = self.cache._load
+
+        def load_and_evict(key):
+            # another thread evicts the response after its metadata is read
+            meta = load(key)
+            self.cache._remove(key)
+            return meta
+
+        self.cache._load = load_and_evict
+        second = self.webscraper.get(url)
+        assert not getattr(second, "from_cache", False)
+        assert second.content == first.content
+        assert len(self.server.requests) == 2
+        assert self.cache.stats["misses"] == 2
+
+
+class TestDocumentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.urls = [self.server.url(f"/page/{i}") for i in range(2)]
+        self.parser = tools.Parser("html.parser", doc_cache=DocumentCache())
+        self.parser.get(self.urls)
+
+    def tearDown(self):
+        self.parser.close()
+        self.server.__exit__(None, None, None)
+
+    def test_opt_in(self):
+        with tools.Parser("html.parser") as parser:
+            assert parser._doc_cache is None
+
+    def test_repeated_extraction(self):
+        first = self.parser.table(None)
+        self.parser.data = None
+        second = self.parser.table(None)
+        assert [len(dfs) for dfs in first.values()] == [1, 1]
+        assert first.keys() == second.keys()
+        stats = self.parser._doc_cache.stats
+        assert stats["misses"] == 2
+        assert stats["hits"] == 2
+
+    def test_strainer_key(self):
+        self.parser.parse(name="a")
+        self.parser.parse(name="table")
+        self.parser.parse(name="table")
+        assert len(self.parser._doc_cache) == 4
+        assert self.parser._doc_cache.stats["hits"] == 2
+
+    def test_memory_eviction(self):
+        self.parser.parse()
+        size = self.parser._doc_cache.memory // 2
+        cache = DocumentCache(max_memory=size)
+        for res in self.parser.res:
+            key = cache.key(res.content, "html.parser", None, {})
+            cache.put(key, self.parser.data[0])
+        assert len(cache) == 1
+        assert cache.memory <= size
+        assert cache.stats["evictions"] == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import xscrapers.webscraper as ws
+from xscrapers.concurrency import AIMDController
+
+from _server import LocalServer
+
+
+class TestAIMDController(unittest.TestCase):
+
+    def test_additive_increase(self):
+        controller = AIMDController(initial=2, max_limit=4)
+        for _ in range(2 + 3 + 4 + 4):
+            controller.record(0.1)
+        assert controller.limit == 4
+        assert [adj.limit for adj in controller.history] == [2, 3, 4]
+        assert controller.history[-1].reason == "increase"
+
+    def test_multiplicative_decrease(self):
+        controller = AIMDController(initial=8)
+        controller.record(None, failed=True)
+        # only one decrease per round trip
+        controller.record(None, failed=True)
+        assert controller.limit == 4
+        for _ in range(4):
+            controller.record(None, failed=True)
+        assert controller.limit == 2
+        assert controller.history[-1].reason == "error"
+
+    def test_latency(self):
+        controller = AIMDController(initial=8, min_limit=3)
+        for _ in range(4):
+            controller.record(0.01)
+        for _ in range(20):
+            controller.record(1.0)
+        assert controller.limit == 3
+        assert controller.history[-1].reason == "latency"
+
+    def test_latency_jitter(self):
+        controller = AIMDController(initial=4, max_limit=8)
+        # sub-millisecond latencies with spikes of a multiple of them
+        for i in range(40):
+            controller.record(0.002 if i >= 10 and i % 3 == 0 else 0.0002)
+        assert controller.limit == 8
+        assert all(adj.reason != "latency" for adj in controller.history)
+
+
+class TestAdaptiveScraper(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.parser = "html.parser"
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_default_limit(self):
+        webscraper = ws.Webscraper(self.parser)
+        assert 0 < webscraper.concurrency.limit <= ws.MAX_THREADS
+        assert webscraper._max_threads == ws.MAX_THREADS
+
+    def test_batch_adaption(self):
+        controller = AIMDController(initial=4, max_limit=8)
+        webscraper = ws.Webscraper(self.parser, concurrency=controller)
+        # record a constant latency, such that the adaption does not depend
+        # on the timing of the local server
+        controller.record = lambda latency, failed=False: \
+            AIMDController.record(controller, 0.05, failed)
+        urls = [self.server.url(f"/page/{i}") for i in range(40)]
+        webscraper.get(urls)
+        assert controller.limit > 4
+        webscraper.get([self.server.url("/status/503")] * 10)
+        webscraper.close()
+        assert controller.history[-1].reason == "error"
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import xscrapers.tools as tools
+from xscrapers.tools.frontier import BloomFilter, Frontier, SeenSet
+
+from _server import LocalServer
+
+
+class TestFrontier(unittest.TestCase):
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(i * 7919 << 20)
+        assert all(i * 7919 << 20 in bloom for i in range(1000))
+        false_positives = sum(
+            (i * 7919 << 20) + 1 in bloom for i in range(1000))
+        assert false_positives < 50
+
+    def test_seen_set(self):
+        seen = SeenSet(capacity=1000, buffer_size=64)
+        urls = [f"http://example.com/{i}" for i in range(500)]
+        assert all(seen.add(url) for url in urls)
+        assert not any(seen.add(url) for url in urls)
+        assert all(url in seen for url in urls)
+        assert "http://example.com/500" not in seen
+        assert len(seen) == 500
+
+    def test_priority(self):
+        frontier = Frontier(priority=lambda url, depth: len(url))
+        for url in ["http://a/long", "http://a/", "http://a/x"]:
+            frontier.push(url, 0)
+        urls = [frontier.popleft() for _ in range(len(frontier))]
+        assert urls == ["http://a/", "http://a/x", "http://a/long"]
+
+
+class TestCrawler(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.parser = "html.parser"
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_max_depth(self):
+        crawler = tools.Crawler(self.parser, max_depth=3)
+        urls = [url for url, _ in crawler.crawl([self.server.url("/page/0")])]
+        crawler.close()
+        # external links are not followed
+        assert sorted(urls) == [self.server.url(f"/page/{i}") for i in range(4)]
+
+    def test_max_pages(self):
+        crawler = tools.Crawler(self.parser, max_depth=100, max_pages=5)
+        results = list(crawler.crawl([self.server.url("/page/0")]))
+        crawler.close()
+        assert len(results) == 5
+        assert all(res.ok for _, res in results)
+
+    def test_seen_once(self):
+        crawler = tools.Crawler(self.parser, max_depth=2)
+        seeds = [self.server.url("/page/0"), self.server.url("/page/1#top")]
+        urls = [url for url, _ in crawler.crawl(seeds)]
+        crawler.close()
+        assert len(urls) == len(set(urls)) == 4
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+import xscrapers.webscraper as ws
+from xscrapers.download import guess_extension, segments, url_stem, url_stems
+from xscrapers.retry import RetryPolicy
+
+from _server import LocalServer
+
+
+def _response(url, content_type):
+    res = requests.Response()
+    res.url = url
+    res.headers["content-type"] = content_type
+    return res
+
+
+class TestGuessExtension(unittest.TestCase):
+
+    def test_sources(self):
+        res = _response("http://a.org/x", "image/jpeg")
+        assert guess_extension(res) == ".jpg"
+        res = _response("http://a.org/x.dat", "application/octet-stream")
+        assert guess_extension(res, b"\x89PNG\r\n\x1a\n...") == ".png"
+        assert guess_extension(res, b"RIFF\0\0\0\0WEBPVP8 ") == ".webp"
+        assert guess_extension(res, b"\0\0") == ".dat"
+
+    def test_url_stem(self):
+        assert url_stem("http://a.org/img/photo%201.JPG?x=1") == "photo_1"
+        assert url_stem("http://a.org/") == "download"
+
+    def test_url_stems(self):
+        urls = ["http://a.org/x/a", "http://a.org/y/a", "http://a.org/a-1",
+                "http://a.org/b"]
+        assert url_stems(urls) == ["a-0", "a-2", "a-1", "b"]
+
+
+class TestDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.dir = tempfile.TemporaryDirectory()
+        self.dest = Path(self.dir.name) / "files"
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.dir.cleanup()
+
+    def test_download(self):
+        urls = [
+            self.server.url("/binary/64"),
+            self.server.url("/binary/1?type=application/octet-stream"),
+            self.server.url("/page/1"),
+            self.server.url("/status/404"),
+        ]
+        with ws.Webscraper("html.parser") as webscraper:
+            report = webscraper.download(urls, self.dest, chunk_size=4096)
+        assert sorted(path.name for path in self.dest.iterdir()) \
+            == ["1-1.png", "1-2.html", "64.png"]
+        assert report.paths[urls[0]] == self.dest / "64.png"
+        assert report.paths[urls[0]].stat().st_size == 8 + 64 * 1024
+        assert report.paths[urls[2]].read_bytes().startswith(b"<!DOCTYPE")
+        assert list(report.errors) == [urls[3]]
+        assert report.errors[urls[3]].status_code == 404
+        assert report.size == 16 + 65 * 1024 + report.paths[
+            urls[2]].stat().st_size
+        assert report.mb_per_second > 0
+
+    def test_names(self):
+        urls = [self.server.url("/binary/1"), self.server.url("/page/2")]
+        with ws.Webscraper("html.parser") as webscraper:
+            report = webscraper.download(urls, self.dest, names=["a", "b"])
+            assert [path.name for path in report.paths.values()] \
+                in (["a.png", "b.html"], ["b.html", "a.png"])
+            with self.assertRaises(ValueError):
+                webscraper.download(urls, self.dest, names=["a", "a"])
+
+    def test_failed_download(self):
+        with ws.Webscraper("html.parser") as webscraper:
+            webscraper._timeout = 1
+            report = webscraper.download("http://127.0.0.1:1/x", self.dest)
+        assert isinstance(report.errors["http://127.0.0.1:1/x"],
+                          requests.exceptions.ConnectionError)
+        assert list(self.dest.iterdir()) == []
+
+
+class TestSegmentedDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.dir = tempfile.TemporaryDirectory()
+        self.dest = Path(self.dir.name)
+        size = 100 * 1024
+        self.body = (bytes(range(251)) * (size // 251 + 1))[:size]
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.dir.cleanup()
+
+    def test_segments(self):
+        assert segments(10, 4) == [(0, 3), (4, 7), (8, 9)]
+        assert segments(8, 4) == [(0, 3), (4, 7)]
+
+    def test_segmented(self):
+        url = self.server.url("/ranged/100")
+        with ws.Webscraper("html.parser") as webscraper:
+            report = webscraper.download_segmented(
+                url, self.dest, segment_size=16 * 1024)
+        assert report.paths[url].read_bytes() == self.body
+        assert report.size == len(self.body)
+        assert len(self.server.ranges) == 7
+        assert "bytes=98304-102399" in self.server.ranges
+        assert self.server.if_ranges == ['"r1"'] * 7
+        assert [path.name for path in self.dest.iterdir()] == ["100"]
+        # the probe does not change the url and response of the scraper
+        assert webscraper.url is None and webscraper.res is None
+
+    def test_weak_etag(self):
+        url = self.server.url("/ranged/100?etag=weak")
+        with ws.Webscraper("html.parser") as webscraper:
+            report = webscraper.download_segmented(
+                url, self.dest, segment_size=16 * 1024)
+        assert report.paths[url].read_bytes() == self.body
+        assert self.server.if_ranges \
+            == ["Mon, 01 Jan 2024 00:00:00 GMT"] * 7
+
+    def test_resume(self):
+        url = self.server.url("/ranged/100?broken=32768")
+        with ws.Webscraper("html.parser") as webscraper:
+            report = webscraper.download_segmented(
+                url, self.dest, name="data", segment_size=16 * 1024)
+            assert isinstance(report.errors[url],
+                              requests.exceptions.ChunkedEncodingError)
+            assert not (self.dest / "data").exists()
+            assert report.size == 6 * 16 * 1024 - 12 * 1024
+            del self.server.ranges[:]
+            report = webscraper.download_segmented(
+                url, self.dest, name="data", segment_size=16 * 1024)
+        assert self.server.ranges == ["bytes=32768-49151"]
+        assert report.paths[url].read_bytes() == self.body
+        assert report.size == 16 * 1024
+        assert [path.name for path in self.dest.iterdir()] == ["data"]
+
+    def test_retry(self):
+        url = self.server.url("/ranged/100?broken=0")
+        retry = RetryPolicy(backoff=0, jitter=False)
+        with ws.Webscraper("html.parser", retry=retry) as webscraper:
+            report = webscraper.download_segmented(
+                url, self.dest, segment_size=16 * 1024)
+        assert report.paths[url].read_bytes() == self.body
+        assert self.server.ranges.count("bytes=0-16383") == 2
+
+    def test_fallback(self):
+        url = self.server.url("/binary/1")
+        with ws.Webscraper("html.parser") as webscraper:
+            report = webscraper.download_segmented(
+                url, self.dest, segment_size=1024)
+        assert report.paths[url] == self.dest / "1.png"
+        assert self.server.ranges == []
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import requests
+
+from xscrapers.encoding import EncodingResolver, detect_encoding
+
+
+def _response(url, content, content_type="text/html"):
+    res = requests.Response()
+    res.url = url
+    res.status_code = 200
+    res._content = content
+    res.headers["content-type"] = content_type
+    res.encoding = requests.utils.get_encoding_from_headers(res.headers)
+    return res
+
+
+class TestDetectEncoding(unittest.TestCase):
+
+    def test_declaration(self):
+        page = b'<html><head><meta charset="ISO-8859-1"></head></html>'
+        assert detect_encoding(page) == "iso8859-1"
+        page = b'<meta http-equiv="Content-Type" ' \
+            b'content="text/html; charset=shift_jis">'
+        assert detect_encoding(page) == "shift_jis"
+
+    def test_byte_order_mark(self):
+        assert detect_encoding(b"\xef\xbb\xbf<html></html>") == "utf-8"
+
+    def test_prefix(self):
+        # declarations after the prefix are ignored
+        page = b"<p>" + b"x" * 100 + b'</p><meta charset="koi8-r">'
+        assert detect_encoding(page, prefix=64) == "utf-8"
+        assert detect_encoding(page) == "koi8-r"
+
+    def test_fallback(self):
+        assert detect_encoding("<p>straße</p>".encode("utf-8")) == "utf-8"
+        assert detect_encoding("<p>straße</p>".encode("latin-1")) \
+            == "windows-1252"
+        # a multibyte character cut off at the end of the prefix
+        page = "<p>ßßß</p>".encode("utf-8")
+        assert detect_encoding(page, prefix=4) == "utf-8"
+
+
+class TestEncodingResolver(unittest.TestCase):
+
+    def test_sources(self):
+        resolver = EncodingResolver()
+        page = '<meta charset="latin-1"><p>straße</p>'.encode("latin-1")
+        res = _response("http://a.org/items/1/x.html", page,
+                        "text/html; charset=UTF-8")
+        # a valid charset of the header is trusted
+        assert resolver.resolve(res) == "utf-8"
+        res = _response("http://a.org/items/1/x.html", page)
+        assert resolver.resolve(res) == "iso8859-1"
+        # the same template is taken from the cache
+        res = _response("http://a.org/items/2/y.html", b"<p>ok</p>")
+        assert resolver.resolve(res) == "iso8859-1"
+        res = _response("http://a.org/other/y.html", b"<p>ok</p>")
+        assert resolver.resolve(res) == "utf-8"
+        stats = resolver.stats
+        assert (stats["http"], stats["cached"], stats["detected"]) \
+            == (1, 1, 2)
+        assert stats["time"] > 0
+
+    def test_invalid_charset(self):
+        resolver = EncodingResolver()
+        res = _response("http://a.org/", b"<p>ok</p>",
+                        "text/html; charset=no-such-codec")
+        assert resolver.resolve(res) == "utf-8"
+        assert resolver.stats["detected"] == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
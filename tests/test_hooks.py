@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+import requests
+
+import xscrapers.hooks as hooks
+import xscrapers.webscraper as ws
+from xscrapers.hooks import (Hook, Hooks, MemoryProfiler, SlowRequestSampler,
+                             StageProfiler)
+
+from _server import LocalServer
+
+
+class _Recorder(Hook):
+
+    def __init__(self):
+        self.events = []
+
+    def before_request(self, method, url, kwargs):
+        kwargs["headers"]["X-Test"] = "1"
+        self.events.append(("before_request", method))
+
+    def after_response(self, method, url, res, seconds):
+        self.events.append(("after_response", type(res).__name__))
+
+    def before_parse(self, res):
+        self.events.append(("before_parse",))
+
+    def after_parse(self, res, obj, seconds):
+        self.events.append(("after_parse", obj.title.string))
+
+    def before_extract(self, res, obj):
+        self.events.append(("before_extract",))
+
+    def after_extract(self, res, value, seconds):
+        self.events.append(("after_extract", value))
+
+
+class TestHooks(unittest.TestCase):
+
+    def test_toggle(self):
+        hooks = Hooks()
+        assert not hooks.enabled
+        recorder = _Recorder()
+        hooks.add(recorder)
+        assert hooks.enabled
+        hooks.disable()
+        assert not hooks.enabled and len(hooks) == 1
+        hooks.enable()
+        hooks.emit("before_parse", None)
+        assert recorder.events == [("before_parse",)]
+        hooks.remove(recorder)
+        assert not hooks.enabled
+
+    def test_only_overridden_events(self):
+        hooks = Hooks([SlowRequestSampler()])
+        assert hooks._callbacks["before_request"] == ()
+        assert len(hooks._callbacks["after_response"]) == 1
+
+
+class TestScraperHooks(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_events(self):
+        recorder = _Recorder()
+        url = self.server.url("/page/1")
+        with ws.Webscraper("html.parser", hooks=[recorder]) as webscraper:
+            webscraper.get(url)
+            webscraper.parse(extract=lambda soup: soup.h1.string)
+        assert recorder.events == [
+            ("before_request", "GET"),
+            ("after_response", "Response"),
+            ("before_parse",),
+            ("after_parse", "Page 1"),
+            ("before_extract",),
+            ("after_extract", "Page 1"),
+        ]
+        assert webscraper.data == "Page 1"
+
+    def test_failed_request(self):
+        recorder = _Recorder()
+        with ws.Webscraper("html.parser", hooks=[recorder]) as webscraper:
+            webscraper._timeout = 1
+            res = webscraper.get("http://127.0.0.1:1/")
+        assert isinstance(res, requests.exceptions.ConnectionError)
+        assert recorder.events[-1] == ("after_response", "ConnectionError")
+
+    def test_disabled(self):
+        recorder = _Recorder()
+        with ws.Webscraper("html.parser", hooks=[recorder]) as webscraper:
+            webscraper.hooks.disable()
+            webscraper.get(self.server.url("/page/1"))
+            webscraper.parse()
+        assert recorder.events == []
+
+    def test_pipeline(self):
+        recorder = _Recorder()
+        urls = [self.server.url(f"/page/{i}") for i in range(3)]
+        with ws.Webscraper("html.parser", hooks=[recorder]) as webscraper:
+            webscraper.pipeline(urls)
+        assert sorted(event for event in recorder.events
+                      if event[0] == "after_parse") \
+            == [("after_parse", f"Page {i}") for i in range(3)]
+
+    def test_profilers(self):
+        profiler = StageProfiler()
+        memory = MemoryProfiler()
+        sampler = SlowRequestSampler(threshold=0.05)
+        urls = [self.server.url("/page/1"), self.server.url("/page/2?delay=0.1")]
+        with ws.Webscraper(
+                "html.parser", hooks=[profiler, memory, sampler]) as webscraper:
+            webscraper.get(urls)
+            webscraper.parse(extract=lambda soup: soup.h1.string)
+        assert profiler.counts == {"request": 2, "parse": 2, "extract": 2}
+        assert profiler.stats("parse").total_calls > 0
+        with tempfile.TemporaryDirectory() as directory:
+            paths = profiler.dump(directory)
+            assert sorted(path.name for path in paths) \
+                == ["extract.prof", "parse.prof", "request.prof"]
+        assert [url for url, _ in memory.peaks] == urls
+        assert memory.max_peak[1] > 0
+        assert not tracemalloc.is_tracing()
+        assert [sample["url"] for sample in sampler.samples] == [urls[1]]
+        assert sampler.samples[0]["response"].status_code == 200
+
+    def test_already_tracing(self):
+        # without tracemalloc.reset_peak() as on Python < 3.9
+        no_reset_peak = mock.Mock(wraps=tracemalloc, spec=[
+            name for name in dir(tracemalloc) if name != "reset_peak"])
+        for module in [tracemalloc, no_reset_peak]:
+            memory = MemoryProfiler()
+            tracemalloc.start()
+            try:
+                with mock.patch.object(hooks, "tracemalloc", module), \
+                        ws.Webscraper("html.parser", hooks=[memory]) \
+                        as webscraper:
+                    webscraper.get(self.server.url("/page/1"))
+                    webscraper.parse()
+                # the tracing started elsewhere is not stopped
+                assert tracemalloc.is_tracing()
+            finally:
+                tracemalloc.stop()
+            assert memory.max_peak[1] > 0
+
+    def test_failed_parse(self):
+        profiler = StageProfiler()
+        memory = MemoryProfiler()
+        with ws.Webscraper(
+                "no-such-parser", hooks=[profiler, memory]) as webscraper:
+            webscraper.get(self.server.url("/page/1"))
+            with self.assertRaises(Exception):
+                webscraper.parse()
+        # the profilers have stopped although the parse has failed
+        assert not tracemalloc.is_tracing()
+        assert list(memory.peaks) == []
+        assert profiler.counts == {"request": 1, "parse": 1}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SCRIPT = """
+import json, logging, os, sys
+import xscrapers.tools, xscrapers.webdriver, xscrapers.wait
+heavy = ["pandas", "numpy", "selenium"]
+print(json.dumps({
+    "loaded": [name for name in heavy if name in sys.modules],
+    "files": os.listdir("."),
+    "handlers": len(logging.getLogger().handlers)
+    + len(logging.getLogger("requests.packages.urllib3").handlers),
+}))
+"""
+
+
+class TestImport(unittest.TestCase):
+
+    def _run(self, script):
+        with tempfile.TemporaryDirectory() as cwd:
+            out = subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=cwd,
+                env={"PYTHONPATH": str(ROOT)},
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+        return json.loads(out.stdout)
+
+    def test_side_effects(self):
+        result = self._run(SCRIPT)
+        assert result == {"loaded": [], "files": [], "handlers": 0}
+
+    def test_lazy_dependencies(self):
+        result = self._run(SCRIPT.replace(
+            "print(", "import bs4\n"
+            "xscrapers.tools.table_to_frame(bs4.BeautifulSoup("
+            "'<table><tr><td>1</td></tr></table>', 'html.parser').table)\n"
+            "xscrapers.tools.frontier.SeenSet(capacity=10)\n"
+            "xscrapers.wait.CONDITION_DIC\nprint(", 1))
+        assert result["loaded"] == ["pandas", "numpy", "selenium"]
+
+
+if __name__ == "__main__":
+    unittest.main()
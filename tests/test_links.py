@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from unittest import mock
+
+import xscrapers.tools as tools
+import xscrapers.tools.links as links
+from xscrapers.tools.links import canonicalize_url, extract_links
+
+from _server import LocalServer
+
+PAGE = """
+<html>
+<head><title>Links</title></head>
+<body>
+<a href="/b?y=2&x=1#top">relative</a>
+<a href="c.html">sibling</a>
+<a href="HTTP://Example.COM:80/">absolute</a>
+<a href="/b?x=1&y=2">duplicate</a>
+<a href="mailto:someone@example.com">mail</a>
+<a href="javascript:void(0)">script</a>
+<a name="anchor">no href</a>
+<a href="/q?b=2&amp;a=1">entity</a>
+</body>
+</html>
+""".encode("utf-8")
+
+
+class TestCanonicalizeUrl(unittest.TestCase):
+
+    def test_canonicalize(self):
+        assert canonicalize_url("HTTPS://Example.com:443/a?b=2&a=1#frag") \
+            == "https://example.com/a?a=1&b=2"
+        assert canonicalize_url("http://example.com") == "http://example.com/"
+        assert canonicalize_url("http://example.com:8080/x") \
+            == "http://example.com:8080/x"
+
+    def test_ipv6(self):
+        assert canonicalize_url("http://[::1]:8080/x") == "http://[::1]:8080/x"
+        assert canonicalize_url("HTTP://[FE80::1]:80") == "http://[fe80::1]/"
+
+
+class TestExtractLinks(unittest.TestCase):
+
+    def setUp(self):
+        self.expected = [
+            "http://host.org/b?x=1&y=2",
+            "http://host.org/dir/c.html",
+            "http://example.com/",
+            "http://host.org/q?a=1&b=2",
+        ]
+
+    def test_extract_links(self):
+        assert extract_links(PAGE, "http://host.org/dir/page.html") \
+            == self.expected
+
+    def test_base_href(self):
+        page = b'<head><base href="http://other.org/x/"></head>' \
+            b'<a href="y">y</a>'
+        assert extract_links(page, "http://host.org/") == \
+            ["http://other.org/x/y"]
+
+    def test_malformed_links(self):
+        page = b'<a href="http://h:99999/">port</a>' \
+            b'<a href="http://[::1/">ip</a><a href="/ok">ok</a>'
+        assert extract_links(page, "http://host.org/") \
+            == ["http://host.org/ok"]
+
+    def test_fallback(self):
+        with mock.patch.object(links, "etree", None):
+            assert extract_links(PAGE, "http://host.org/dir/page.html") \
+                == self.expected
+
+
+class TestParserLinks(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.parser = tools.Parser("html.parser")
+
+    def tearDown(self):
+        self.parser.close()
+        self.server.__exit__(None, None, None)
+
+    def test_links(self):
+        urls = [self.server.url(f"/page/{i}") for i in range(3)]
+        self.parser.get(urls)
+        data = self.parser.links()
+        assert list(data) == urls
+        for i, url in enumerate(urls):
+            assert data[url] == [
+                self.server.url(f"/page/{i + 1}"), "https://example.com/"]
+
+    def test_href(self):
+        urls = [self.server.url(f"/page/{i}") for i in range(2)]
+        self.parser.get(urls)
+        data = self.parser.href(None)
+        # relative links are resolved against the url of their own page
+        assert data[urls[1]][0] == self.server.url("/page/2")
+        assert data == self.parser.links()
+
+
+if __name__ == "__main__":
+    unittest.main()
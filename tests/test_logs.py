@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import unittest
+
+import xscrapers.webscraper as ws
+from xscrapers.logs import (REQUESTS_LOG, ScraperLog, flush_logging,
+                            log_dir, setup_logging)
+
+from _server import LocalServer
+
+
+class _Formatted:
+    """An argument which records the thread it is formatted in."""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return "formatted"
+
+
+class TestScraperLog(unittest.TestCase):
+
+    def test_levels(self):
+        with self.assertLogs(REQUESTS_LOG, "DEBUG") as logs:
+            ScraperLog("INFO").debug("dropped")
+            ScraperLog("INFO").info("kept %s", 1)
+            ScraperLog("DEBUG").debug("kept %s", 2)
+        assert [record.getMessage() for record in logs.records] \
+            == ["kept 1", "kept 2"]
+        log = ScraperLog()
+        assert not log.isEnabledFor(20)
+        log.setLevel("INFO")
+        assert log.isEnabledFor(20)
+        with self.assertRaises(ValueError):
+            ScraperLog("NOISY")
+
+    def test_deferred_formatting(self):
+        setup_logging()
+        # the handlers of the test runner on the root logger format the
+        # messages right away
+        REQUESTS_LOG.propagate = False
+        self.addCleanup(setattr, REQUESTS_LOG, "propagate", True)
+        arg = _Formatted()
+        ScraperLog("DEBUG").debug("%s", arg)
+        # the message is formatted by the listener, not the caller
+        flush_logging(timeout=5)
+        assert arg.threads
+        assert threading.current_thread().name not in arg.threads
+        # the argument is not formatted at all below the level
+        arg = _Formatted()
+        ScraperLog("INFO").debug("%s", arg)
+        flush_logging(timeout=5)
+        assert arg.threads == []
+
+
+class TestVerboseLog(unittest.TestCase):
+
+    def test_report(self):
+        with LocalServer() as server:
+            url = server.url("/page/0?verbose")
+            with ws.Webscraper("html.parser", verbose=True) as webscraper:
+                webscraper.get(url)
+                assert webscraper.res.hook_called
+        flush_logging(timeout=5)
+        text = (log_dir() / "webscraper.log").read_text(encoding="utf-8")
+        assert f"URL: {url}" in text
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import socket
+import tempfile
+import unittest
+
+import requests
+
+import xscrapers.webscraper as ws
+from xscrapers.metrics import Histogram, Metrics
+
+from _server import LocalServer
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_buckets(self):
+        hist = Histogram([1, 10])
+        for value in [0.5, 1, 5, 50]:
+            hist.observe(value)
+        assert hist.snapshot() == {
+            "count": 4,
+            "sum": 56.5,
+            "buckets": {1: 2, 10: 3, float("inf"): 4},
+        }
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_prometheus(self):
+        metrics = Metrics(time_buckets=[0.1], size_buckets=[1024])
+        metrics.observe('a"b', "ttfb", 0.05)
+        metrics.observe_bytes("a", "body", 2048)
+        text = metrics.to_prometheus()
+        assert "# TYPE xscrapers_stage_seconds histogram" in text
+        assert 'xscrapers_stage_seconds_bucket{host="a\\"b",stage="ttfb",' \
+            'le="0.1"} 1' in text
+        assert 'xscrapers_stage_seconds_count{host="a\\"b",stage="ttfb"} 1' \
+            in text
+        assert 'xscrapers_response_bytes_bucket{host="a",kind="body",' \
+            'le="1024"} 0' in text
+        assert 'xscrapers_response_bytes_bucket{host="a",kind="body",' \
+            'le="+Inf"} 1' in text
+        metrics.clear()
+        assert metrics.snapshot() == {"seconds": {}, "bytes": {}}
+
+
+class TestScraperMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_stages(self):
+        metrics = Metrics()
+        urls = [self.server.url(f"/page/{i}") for i in range(3)]
+        with ws.Webscraper("html.parser", metrics=metrics) as webscraper:
+            for url in urls:
+                webscraper.get(url)
+                assert webscraper.res.timings["ttfb"] > 0
+                assert webscraper.res.timings["download"] >= 0
+            webscraper.get(urls)
+            webscraper.parse()
+        stages = metrics.snapshot()["seconds"]["127.0.0.1"]
+        # the connections are reused, http has no tls handshake
+        assert 1 <= stages["connect"]["count"] < 6
+        assert stages["dns"]["count"] == stages["connect"]["count"]
+        assert "tls" not in stages
+        for stage in ["ttfb", "download"]:
+            assert stages[stage]["count"] == 6
+        for stage in ["encoding", "parse"]:
+            assert stages[stage]["count"] == 3
+        sizes = metrics.snapshot()["bytes"]["127.0.0.1"]
+        assert sizes["body"]["count"] == sizes["wire"]["count"] == 6
+        assert 'host="127.0.0.1",stage="parse"' in metrics.to_prometheus()
+
+    def test_download(self):
+        metrics = Metrics()
+        with tempfile.TemporaryDirectory() as directory, ws.Webscraper(
+                "html.parser", metrics=metrics) as webscraper:
+            webscraper.download(self.server.url("/binary/64"), directory)
+            webscraper.stream_parse(self.server.url("/page/1"), "h1")
+        stages = metrics.snapshot()["seconds"]["127.0.0.1"]
+        assert stages["download"]["count"] == 2
+        sizes = metrics.snapshot()["bytes"]["127.0.0.1"]
+        assert sizes["body"]["count"] == sizes["wire"]["count"] == 2
+        assert sizes["body"]["sum"] > 8 + 64 * 1024
+        assert sizes["wire"]["sum"] >= sizes["body"]["sum"]
+
+    def test_connection_error(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        metrics = Metrics()
+        with ws.Webscraper("html.parser", metrics=metrics) as webscraper:
+            res = webscraper._fetch_one(f"http://127.0.0.1:{port}/")
+        assert isinstance(res, requests.exceptions.ConnectionError)
+        assert metrics.snapshot()["seconds"] == {}
+
+
+if __name__ == "__main__":
+    unittest.main()
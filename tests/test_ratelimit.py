@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import math
+import time
+import unittest
+
+import xscrapers.webscraper as ws
+from xscrapers.ratelimit import HostLimiter, HostQueue, TokenBucket
+
+from _server import LocalServer
+
+
+class TestHostLimiter(unittest.TestCase):
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=10.0, burst=2)
+        now = time.monotonic()
+        assert bucket.reserve(now) == 0
+        assert bucket.reserve(now) == 0
+        assert math.isclose(bucket.reserve(now), 0.1)
+        assert bucket.reserve(now + 0.1) == 0
+
+    def test_domain_limits(self):
+        limiter = HostLimiter(
+            {"example.com": {"concurrency": 1}, "a.example.com": {}},
+            default={"concurrency": 2},
+        )
+        assert limiter.limit("www.example.com") == {"concurrency": 1}
+        assert limiter.limit("a.example.com") == {}
+        assert limiter.limit("example.org") == {"concurrency": 2}
+        assert limiter.try_acquire("www.example.com") == 0
+        assert limiter.try_acquire("www.example.com") == math.inf
+        limiter.release("www.example.com")
+        assert limiter.try_acquire("www.example.com") == 0
+
+    def test_round_robin(self):
+        queue = HostQueue()
+        for url in ["http://a/1", "http://a/2", "http://b/1"]:
+            queue.add(url)
+        limiter = HostLimiter()
+        urls = [queue.pop(limiter)[0] for _ in range(3)]
+        assert urls == ["http://a/1", "http://b/1", "http://a/2"]
+        assert queue.pop(limiter) == (None, math.inf)
+
+
+class TestScheduling(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.parser = "html.parser"
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_host_concurrency(self):
+        webscraper = ws.Webscraper(
+            self.parser, host_limits={"127.0.0.1": {"concurrency": 1}})
+        limited = [self.server.url(f"/page/{i}?delay=0.2") for i in range(4)]
+        other = [url.replace("127.0.0.1", "localhost") for url in limited]
+        start = time.perf_counter()
+        results = list(webscraper.iter_get(limited + other, max_in_flight=8))
+        dur = time.perf_counter() - start
+        webscraper.close()
+        # the limited host is served one by one, the other host at once
+        assert dur >= 0.8
+        assert all("127.0.0.1" in url for url, _ in results[-3:])
+        assert all(res.ok for _, res in results)
+
+    def test_rate_limit(self):
+        webscraper = ws.Webscraper(
+            self.parser,
+            default_host_limit={"rate": 20.0, "burst": 1},
+        )
+        urls = [self.server.url(f"/page/{i}") for i in range(6)]
+        start = time.perf_counter()
+        webscraper.get(urls)
+        dur = time.perf_counter() - start
+        webscraper.close()
+        assert dur >= 0.25
+        assert webscraper.url == urls
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+
+import requests
+import xscrapers.webscraper as ws
+from xscrapers.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+from _server import LocalServer
+
+
+def _response(status_code, headers=None):
+    res = requests.Response()
+    res.status_code = status_code
+    res.headers.update(headers or {})
+    return res
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff(self):
+        policy = RetryPolicy(max_retries=5, backoff=0.5,
+                             max_backoff=1.5, jitter=False)
+        res = _response(503)
+        delays = [policy.delay(res, attempt) for attempt in range(4)]
+        assert delays == [0.5, 1.0, 1.5, 1.5]
+        assert 0 <= RetryPolicy(backoff=0.5).delay(res, 2) <= 2.0
+
+    def test_retry_after(self):
+        policy = RetryPolicy()
+        assert policy.delay(_response(429, {"Retry-After": "3"}), 0) == 3.0
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=1)
+        assert policy.should_retry(_response(503), 0)
+        assert not policy.should_retry(_response(503), 1)
+        assert not policy.should_retry(_response(404), 0)
+        assert policy.should_retry(requests.exceptions.ConnectionError(), 0)
+        assert not policy.should_retry(CircuitOpenError(), 0)
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record("a", True)
+        assert breaker.allow("a")
+        breaker.record("a", True)
+        assert not breaker.allow("a")
+        assert breaker.allow("b")
+        time.sleep(0.06)
+        # a single trial request is let through
+        assert breaker.allow("a")
+        assert not breaker.allow("a")
+        breaker.record("a", False)
+        assert breaker.allow("a")
+
+
+class TestRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.parser = "html.parser"
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_retry_multiple(self):
+        webscraper = ws.Webscraper(
+            self.parser, retry=RetryPolicy(backoff=0.01))
+        urls = [self.server.url(f"/flaky/{i}") for i in range(3)]
+        urls.append(self.server.url("/flaky/5"))
+        webscraper.get(urls)
+        webscraper.close()
+        assert webscraper.url == urls[:3]
+        assert len(self.server.requests) == 1 + 2 + 3 + 4
+
+    def test_retry_single(self):
+        webscraper = ws.Webscraper(
+            self.parser, retry=RetryPolicy(backoff=0.01))
+        res = webscraper.get(self.server.url("/flaky/2"))
+        webscraper.close()
+        assert res.ok
+
+    def test_circuit_breaker(self):
+        webscraper = ws.Webscraper(
+            self.parser, circuit_breaker=CircuitBreaker(failure_threshold=2))
+        urls = [self.server.url("/status/503")] * 5
+        results = list(webscraper.iter_get(urls, max_in_flight=1))
+        webscraper.close()
+        assert len(self.server.requests) == 2
+        assert sum(isinstance(res, CircuitOpenError)
+                   for _, res in results) == 3
+
+
+if __name__ == '__main__':
+    unittest.main()
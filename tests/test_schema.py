@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from bs4 import BeautifulSoup
+
+import xscrapers.tools as tools
+from xscrapers.tools.schema import Field, Schema
+
+from _server import LocalServer
+
+PAGE = b"""
+<html>
+<head><title>Quote</title></head>
+<body>
+<div id="header"><h1 class="name big">ACME</h1></div>
+<p>Some text</p>
+<div class="price"><span>12.5</span></div>
+<a href="/a">a</a><a href="/b">b</a>
+</body>
+</html>
+"""
+
+FIELDS = {
+    "name": "h1.name",
+    "price": Field("div.price > span", convert=float),
+    "links": Field("a", attr="href", many=True),
+    "class": Field("#header h1", attr="class"),
+    "missing": Field("div.missing", default="-"),
+}
+
+EXPECTED = {
+    "name": "ACME",
+    "price": 12.5,
+    "links": ["/a", "/b"],
+    "class": "name big",
+    "missing": "-",
+}
+
+
+class TestSchema(unittest.TestCase):
+
+    def test_backends(self):
+        for backend in ["lxml", "bs4"]:
+            schema = Schema(FIELDS, backend=backend)
+            assert schema.extract(PAGE) == EXPECTED
+            assert schema.extract(b"") == {
+                "name": None, "price": None, "links": [], "class": None,
+                "missing": "-"}
+
+    def test_xpath(self):
+        schema = Schema({
+            "title": Field("//title/text()", xpath=True),
+            "count": Field("count(//a)", xpath=True, convert=int),
+        })
+        assert schema.extract(PAGE) == {"title": "Quote", "count": 2}
+        with self.assertRaises(ValueError):
+            Schema({"title": Field("//title", xpath=True)}, backend="bs4")
+
+    def test_strainer(self):
+        strainer = Schema(FIELDS).strainer
+        soup = BeautifulSoup(PAGE, "html.parser", parse_only=strainer)
+        assert soup.find("p") is None
+        assert soup.find("title") is None
+        assert len(soup("a")) == 2
+        # sibling combinators need the whole document
+        assert Schema({"text": "h1 + p"}).strainer is None
+
+    def test_columns(self):
+        schema = Schema(FIELDS)
+        columns = schema.extract_many([PAGE, PAGE], columns=True)
+        assert columns["price"] == [12.5, 12.5]
+        assert list(columns) == list(FIELDS)
+
+
+class TestParserExtract(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.parser = tools.Parser("html.parser")
+
+    def tearDown(self):
+        self.parser.close()
+        self.server.__exit__(None, None, None)
+
+    def test_extract(self):
+        urls = [self.server.url(f"/page/{i}") for i in range(3)]
+        self.parser.get(urls)
+        schema = Schema({
+            "title": "h1",
+            "value": Field("table tr:last-child td:last-child", convert=int),
+        })
+        records = self.parser.extract(schema)
+        assert list(records) == urls
+        assert records[urls[2]] == {"title": "Page 2", "value": 3}
+        columns = self.parser.extract(schema, columns=True)
+        assert columns["value"] == [1, 2, 3]
+
+
+if __name__ == "__main__":
+    unittest.main()
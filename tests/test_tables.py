@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+import xscrapers.tools as tools
+from xscrapers.tools.tables import read_tables, table_to_frame
+
+from _server import LocalServer
+
+TABLES = [
+    # header of <th></th> cells without <thead></thead>, thousands separator
+    "<table><tr><th>A</th><th>B</th></tr>"
+    "<tr><td>1</td><td>2,000</td></tr><tr><td>x</td><td>3.5</td></tr></table>",
+    # multi-row header, rowspan and colspan in all sections
+    "<table><thead><tr><th colspan=2>Top</th><th rowspan=2>C</th></tr>"
+    "<tr><th>a</th><th>b</th></tr></thead><tbody><tr><td rowspan=2>1</td>"
+    "<td>2</td><td>3</td></tr><tr><td>4</td><td>5</td></tr></tbody>"
+    "<tfoot><tr><td>f</td><td colspan=2>g</td></tr></tfoot></table>",
+    # rowspan beyond the last row
+    "<table><tr><td>1</td><td rowspan=3>r</td></tr><tr><td>2</td></tr></table>",
+    # ragged rows, whitespace and empty cells
+    "<table><tbody><tr><th>h1</th><th>h2</th></tr>"
+    "<tr><td>  a\n b </td><td></td></tr><tr><td>c</td></tr></tbody></table>",
+    # rowspans carried over rows with holes
+    "<table><tr><td>v00</td><td rowspan=2 colspan=2>v01</td>"
+    "<td rowspan=3>v02</td></tr><tr><td rowspan=3>v10</td>"
+    "<td rowspan=3>v11</td></tr><tr><td rowspan=3>v20</td></tr>"
+    "<tr><td>v30</td><td>v31</td><td rowspan=3>v32</td></tr></table>",
+]
+
+
+class TestTables(unittest.TestCase):
+
+    def test_same_as_read_html(self):
+        for table in TABLES:
+            expected = pd.read_html(table, flavor="bs4")[0]
+            for parser in ["html.parser", "lxml"]:
+                soup = BeautifulSoup(table, parser)
+                pd.testing.assert_frame_equal(
+                    table_to_frame(soup.table), expected)
+            pd.testing.assert_frame_equal(
+                read_tables(table.encode("utf-8"))[0], expected)
+
+    def test_nested_table(self):
+        table = "<table><tr><td>a</td></tr><tr><td>" \
+            "<table><tr><td>b</td><td>c</td></tr></table></td></tr></table>"
+        dfs = read_tables(table.encode("utf-8"))
+        assert [df.shape for df in dfs] == [(2, 1), (1, 2)]
+
+    def test_empty_table(self):
+        assert read_tables(b"<table></table><table><tr><td>1</td></tr>"
+                           b"</table>")[0].iloc[0, 0] == 1
+
+
+class TestParserTable(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.parser = tools.Parser("html.parser")
+
+    def tearDown(self):
+        self.parser.close()
+        self.server.__exit__(None, None, None)
+
+    def test_table(self):
+        urls = [self.server.url(f"/page/{i}") for i in range(2)]
+        self.parser.get(urls)
+        data = self.parser.table(None)
+        for i, url in enumerate(urls):
+            df, = data[url]
+            assert list(df.columns) == ["Name", "Value"]
+            assert df["Value"].tolist() == [i, i + 1]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import xscrapers.webscraper as ws
+from xscrapers.useragents import USER_AGENTS, UserAgentPool
+
+from _server import LocalServer
+
+
+class TestUserAgentPool(unittest.TestCase):
+
+    def test_fixed(self):
+        pool = UserAgentPool(seed=1)
+        agents = {pool.get(f"http://host{i}.org/") for i in range(10)}
+        assert len(agents) == 1
+        assert agents <= set(USER_AGENTS)
+        # the same seed picks the same User-Agent
+        assert UserAgentPool(seed=1).get() == pool.get()
+
+    def test_host(self):
+        pool = UserAgentPool(strategy="host", seed=1)
+        assert pool.get("http://a.org/x") == pool.get("https://A.org/y?z")
+        agents = {pool.get(f"http://host{i}.org/") for i in range(20)}
+        assert len(agents) > 1
+
+    def test_request(self):
+        pool = UserAgentPool(["a", "b", "c"], strategy="request", seed=0)
+        assert [pool.get() for _ in range(4)] == ["a", "b", "c", "a"]
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            UserAgentPool([])
+        with self.assertRaises(ValueError):
+            UserAgentPool(strategy="random")
+
+
+class TestUserAgentHeader(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_rotation(self):
+        urls = [self.server.url(f"/page/{i}") for i in range(6)]
+        pool = UserAgentPool(["a", "b", "c"], strategy="request")
+        with ws.Webscraper("html.parser", user_agent=pool) as webscraper:
+            webscraper.get(urls)
+        assert sorted(self.server.agents.values()) == ["a", "a", "b", "b",
+                                                       "c", "c"]
+
+    def test_fixed(self):
+        with ws.Webscraper("html.parser", user_agent="bot/1.0") as webscraper:
+            webscraper.get(self.server.url("/page/0"))
+        assert self.server.agents == {"/page/0": "bot/1.0"}
+        with ws.Webscraper("html.parser") as webscraper:
+            webscraper.get(self.server.url("/page/1"))
+        assert self.server.agents["/page/1"] in USER_AGENTS
+
+
+if __name__ == "__main__":
+    unittest.main()
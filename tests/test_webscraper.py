@@ -1,10 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import collections
 import time
 import unittest
+from unittest import mock
 
 import xscrapers.webscraper as ws
 from bs4 import BeautifulSoup
+from xscrapers.records import ResponseRecord
+
+from _server import LocalServer
+
+
+def _title(soup):
+    return soup.h1.text
 
 
 class TestWebScraper(unittest.TestCase):
@@ -97,5 +106,207 @@ class TestWebScraper(unittest.TestCase):
             assert self.webscraper._http_request[method]
 
 
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.urls = [self.server.url(f"/page/{i}") for i in range(10)]
+        self.parser = "html.parser"
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_connection_reuse(self):
+        with ws.Webscraper(self.parser) as webscraper:
+            for url in self.urls:
+                webscraper.get(url)
+                webscraper.head(url)
+        assert self.server.connections == 1
+
+    def test_idle_timeout(self):
+        webscraper = ws.Webscraper(self.parser, idle_timeout=0.05)
+        webscraper.get(self.urls[0])
+        time.sleep(0.1)
+        webscraper.get(self.urls[1])
+        webscraper.get(self.urls[2])
+        webscraper.close()
+        assert self.server.connections == 2
+
+    def test_max_connections(self):
+        webscraper = ws.Webscraper(
+            self.parser, pool_maxsize=2, pool_block=True, max_connections=2)
+        webscraper.get(self.urls)
+        webscraper.close()
+        assert len(webscraper.res) == len(self.urls)
+        assert self.server.connections <= 2
+
+
+class TestIterGet(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.parser = "html.parser"
+        self.webscraper = ws.Webscraper(self.parser)
+
+    def tearDown(self):
+        self.webscraper.close()
+        self.server.__exit__(None, None, None)
+
+    def test_as_completed(self):
+        slow = self.server.url("/page/0?delay=0.5")
+        fast = [self.server.url(f"/page/{i}") for i in range(1, 5)]
+        results = list(self.webscraper.iter_get([slow] + fast, max_in_flight=4))
+        assert [url for url, _ in results][-1] == slow
+        assert all(res.ok for _, res in results)
+
+    def test_bounded_in_flight(self):
+        urls = (self.server.url(f"/page/{i}") for i in range(100))
+        results = self.webscraper.iter_get(urls, max_in_flight=2)
+        url, res = next(results)
+        # only the requests of the free slots have been sent
+        assert len(self.server.requests) <= 3
+        results.close()
+
+    def test_deque(self):
+        urls = collections.deque([self.server.url("/page/0")])
+        seen = []
+        for url, res in self.webscraper.iter_get(urls, max_in_flight=2):
+            seen.append(url)
+            if len(seen) < 5:
+                urls.append(self.server.url(f"/page/{len(seen)}"))
+        assert len(seen) == 5
+
+
+class TestParallelParse(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.urls = [self.server.url(f"/page/{i}")
+                     for i in range(ws.MIN_PARALLEL_PARSE)]
+        self.parser = "html.parser"
+        self.webscraper = ws.Webscraper(self.parser, max_processes=2)
+        self.webscraper.get(self.urls)
+
+    def tearDown(self):
+        self.webscraper.close()
+        self.server.__exit__(None, None, None)
+
+    def test_parallel_parse(self):
+        self.webscraper.parse(name="h1", parallel=True)
+        parallel = [soup.h1.text for soup in self.webscraper.data]
+        self.webscraper.parse(name="h1")
+        serial = [soup.h1.text for soup in self.webscraper.data]
+        assert parallel == serial == [f"Page {i}" for i in range(len(self.urls))]
+
+    def test_extract(self):
+        self.webscraper.parse(name="h1", parallel=True, extract=_title)
+        assert self.webscraper.data == [
+            f"Page {i}" for i in range(len(self.urls))]
+
+    def test_pipeline(self):
+        urls = self.urls + [self.server.url("/status/404")]
+        self.webscraper.pipeline(urls, name="h1", extract=_title)
+        assert self.webscraper.url == self.urls
+        assert len(self.webscraper.res) == len(self.urls)
+        assert self.webscraper.data == [
+            f"Page {i}" for i in range(len(self.urls))]
+
+    def test_parallel_pipeline(self):
+        self.webscraper.pipeline(
+            self.urls, name="h1", parallel=True, queue_size=2)
+        assert [soup.h1.text for soup in self.webscraper.data] == [
+            f"Page {i}" for i in range(len(self.urls))]
+
+    def test_serial_fallback(self):
+        self.webscraper.get(self.urls[:2])
+        self.webscraper.parse(parallel=True, extract=_title)
+        assert self.webscraper.data == ["Page 0", "Page 1"]
+
+
+class TestStreamParse(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.webscraper = ws.Webscraper("html.parser")
+        # a page of about 4 MiB with the table near its start
+        self.url = self.server.url("/large/4096")
+
+    def tearDown(self):
+        self.webscraper.close()
+        self.server.__exit__(None, None, None)
+
+    def test_early_termination(self):
+        soup = self.webscraper.stream_parse(self.url, "table")
+        assert soup.find("td").text == "a"
+        assert len(self.webscraper.res.content) < 2**20
+        # the connection is not reused after the download has stopped
+        self.webscraper.get(self.server.url("/page/0"))
+        assert self.webscraper.res.ok
+
+    def test_same_as_parse(self):
+        urls = [self.server.url(f"/page/{i}") for i in range(3)]
+        data = self.webscraper.stream_parse(
+            urls + [self.server.url("/status/404")], "h1", class_="title")
+        assert self.webscraper.url == urls
+        self.webscraper.parse(name="h1", class_="title")
+        assert [str(soup) for soup in data] \
+            == [str(soup) for soup in self.webscraper.data]
+
+    def test_empty_body(self):
+        urls = [self.server.url("/page/1"), self.server.url("/status/200")]
+        data = self.webscraper.stream_parse(urls, "h1")
+        assert [str(soup) for soup in data] \
+            == ['<h1 class="title">Page 1</h1>', ""]
+        self.webscraper.parse(name="h1")
+        assert [str(soup) for soup in data] \
+            == [str(soup) for soup in self.webscraper.data]
+
+    def test_limit(self):
+        soup = self.webscraper.stream_parse(self.url, "a", limit=None)
+        assert len(soup("a")) == 2
+        assert len(self.webscraper.res.content) > 4 * 2**20
+
+    def test_without_lxml(self):
+        with mock.patch.object(ws, "etree", None):
+            soup = self.webscraper.stream_parse(self.url, "a")
+        assert len(soup("a")) == 1
+        assert len(self.webscraper.res.content) > 4 * 2**20
+
+
+class TestLeanMode(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.urls = [self.server.url(f"/page/{i}") for i in range(3)]
+        self.webscraper = ws.Webscraper("html.parser", lean=True)
+
+    def tearDown(self):
+        self.webscraper.close()
+        self.server.__exit__(None, None, None)
+
+    def test_parse(self):
+        self.webscraper.get(self.urls)
+        size = len(self.webscraper.res[0].content)
+        self.webscraper.parse(name="h1", extract=_title)
+        assert self.webscraper.data == ["Page 0", "Page 1", "Page 2"]
+        record = self.webscraper.res[0]
+        assert isinstance(record, ResponseRecord)
+        assert record.ok and record.status_code == 200
+        assert record.size == size
+        assert record.encoding == "utf-8"
+        assert record.url == self.urls[0]
+        with self.assertRaises(AttributeError):
+            record.content = b""
+        # the bodies are gone
+        with self.assertRaises(AssertionError):
+            self.webscraper.parse()
+
+    def test_pipeline(self):
+        self.webscraper.pipeline(self.urls, name="h1", extract=_title)
+        assert self.webscraper.data == ["Page 0", "Page 1", "Page 2"]
+        assert all(isinstance(res, ResponseRecord)
+                   for res in self.webscraper.res)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -7,7 +7,6 @@ from pathlib import Path
 
 __version__ = "0.0.7"
 
-# define the log dir which is created in the same folder this projcet is ran
+# define the log dir in the folder this project is ran, it is created when
+# the first scraper sets up the logging (see `xscrapers.logs`)
 LOG_DIR = Path("./log")
-if not LOG_DIR.exists():
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
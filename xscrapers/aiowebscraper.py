@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the asyncio based webscraper.
+
+Instead of spreading the requests over a pool of threads, the
+`AsyncWebscraper` keeps all requests of a batch in flight on a single
+event loop.
+"""
+
+import asyncio
+import datetime
+import functools
+import time
+from typing import List, Optional, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .useragents import UserAgentPool
+from .webscraper import RESPONSE_OBJECT, Webscraper, callback
+
+
+def _to_response(
+    url: str,
+    resp: "aiohttp.ClientResponse",
+    body: bytes,
+    elapsed: float,
+) -> requests.Response:
+    """Convert an aiohttp response to a `requests.Response`.
+
+    Parameters
+    ----------
+    url : str
+        The url which was requested.
+    resp : aiohttp.ClientResponse
+        The response returned by aiohttp.
+    body : bytes
+        The body which was read from `resp`.
+    elapsed : float
+        The time in seconds until the response headers arrived.
+
+    Returns
+    -------
+    requests.Response
+        A response object which can be parsed like any other response
+        of the `Webscraper`.
+
+    """
+    res = requests.Response()
+    res.status_code = resp.status
+    res.reason = resp.reason
+    res.url = str(resp.url)
+    res.headers = CaseInsensitiveDict(
+        {key: ", ".join(resp.headers.getall(key)) for key in resp.headers})
+    res.encoding = get_encoding_from_headers(res.headers)
+    res.elapsed = datetime.timedelta(seconds=elapsed)
+    res.request = requests.Request(
+        resp.method, url, headers=dict(resp.request_info.headers)).prepare()
+    res._content = body
+    return res
+
+
+class AsyncWebscraper(Webscraper):
+    """The AsyncWebscraper class.
+
+    The class has the same interface as the `Webscraper`, but loads a list
+    of urls concurrently on an asyncio event loop.
+    """
+
+    def __init__(
+        self,
+        parser: str,
+        verbose: bool = False,
+        get_params: Optional[dict] = None,
+        max_connections: int = 1000,
+        limit_per_host: int = 0,
+        user_agent: Union[str, UserAgentPool, None] = None,
+        log_level: Union[int, str, None] = None,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        parser : str
+            The parser to be used, see the documentation of `Webscraper`.
+        verbose : bool
+            Determine whether the output should be written to the log file,
+            by default False.
+        get_params : Optional[dict]
+            A dictionary containing parameters for the GET request,
+            by default None. The parameters are passed to
+            `aiohttp.ClientSession.get`, see [1].
+        max_connections : int
+            The maximum number of simultaneous connections, by default 1000.
+        limit_per_host : int
+            The maximum number of simultaneous connections to the same host,
+            by default 0, i.e. no limit.
+        user_agent : Union[str, UserAgentPool, None]
+            The User-Agent or the pool of User-Agents, see the documentation
+            of `Webscraper`.
+        log_level : Union[int, str, None]
+            The level of the messages which are logged, see the documentation
+            of `Webscraper`.
+
+        Raises
+        ------
+        ImportError
+            If aiohttp is not installed.
+
+        References
+        ----------
+        [1] https://docs.aiohttp.org/en/stable/client_reference.html
+
+        """
+        if aiohttp is None:
+            raise ImportError(
+                f"{self.__class__.__name__} requires aiohttp, install it "
+                f"with `pip install xscrapers[async]`.")
+        super().__init__(
+            parser,
+            verbose=verbose,
+            get_params=get_params,
+            user_agent=user_agent,
+            log_level=log_level,
+        )
+        self._max_connections = max_connections
+        self._limit_per_host = limit_per_host
+
+    @functools.singledispatchmethod
+    def get(
+        self,
+        url: Union[str, List[str]],
+    ) -> None:
+        """Make a GET request to a single or multiple urls.
+
+        Parameters
+        ----------
+        url : Union[str, List[str]]
+            The url or list of urls to be loaded.
+
+        Raises
+        ------
+        NotImplementedError
+            If `url` is neither of type `str` nor of type `list`.
+
+        Notes
+        -----
+        This method starts a new event loop, use `aget()` if an event loop
+        is already running.
+
+        """
+        raise NotImplementedError(
+            f"Parameter url is neither of type {str} nor {list}, it is of type {type(url)}.")
+
+    @get.register
+    def _(self, url: str) -> RESPONSE_OBJECT:
+        return asyncio.run(self.aget(url))
+
+    @get.register
+    def _(self, url: list) -> None:
+        asyncio.run(self.aget(url))
+
+    async def aget(
+        self,
+        url: Union[str, List[str]],
+    ) -> RESPONSE_OBJECT:
+        """Make a GET request to a single or multiple urls.
+
+        Parameters
+        ----------
+        url : Union[str, List[str]]
+            The url or list of urls to be loaded.
+
+        Returns
+        -------
+        RESPONSE_OBJECT
+            The response (or the error thrown) for a single url, None for
+            a list of urls. The successful responses of a list of urls are
+            stored in the `res` attribute.
+
+        Raises
+        ------
+        NotImplementedError
+            If `url` is neither of type `str` nor of type `list`.
+
+        """
+        if not isinstance(url, (str, list)):
+            raise NotImplementedError(
+                f"Parameter url is neither of type {str} nor {list}, it is of type {type(url)}.")
+        self._url = url
+        async with self._session() as sess:
+            if isinstance(url, str):
+                res = await self._fetch(sess, url)
+                self.__setattr__("_res", res)
+                self._http_request["GET"] = True
+                return res
+            responses = await asyncio.gather(
+                *(self._fetch(sess, _url) for _url in url))
+        self._set_responses(url, responses)
+
+    async def aparse(
+        self,
+        name: Optional[str] = None,
+        **kwargs: dict,
+    ) -> None:
+        """Parse the response objects without blocking the event loop.
+
+        See the documentation for `parse()`.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self.parse, name, **kwargs))
+
+    def _session(self) -> "aiohttp.ClientSession":
+        """Create a new client session for a batch of requests.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            The client session.
+
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self._max_connections,
+            limit_per_host=self._limit_per_host,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self._timeout),
+        )
+
+    async def _fetch(
+        self,
+        sess: "aiohttp.ClientSession",
+        url: str,
+    ) -> RESPONSE_OBJECT:
+        """Load a single url with the given session.
+
+        Parameters
+        ----------
+        sess : aiohttp.ClientSession
+            The session used to send the request.
+        url : str
+            The url to be loaded.
+
+        Returns
+        -------
+        RESPONSE_OBJECT
+            The corresponding response object. If the request fails
+            for some reason, the error itself is returned as
+            `requests.exceptions.RequestException`.
+
+        """
+        start = time.perf_counter()
+        try:
+            params = dict(self._get_params)
+            params.setdefault("headers", self._headers(url))
+            async with sess.get(url, **params) as resp:
+                elapsed = time.perf_counter() - start
+                body = await resp.read()
+        except asyncio.TimeoutError as e:
+            res = requests.exceptions.Timeout(e)
+        except aiohttp.ClientError as e:
+            res = requests.exceptions.ConnectionError(e)
+        else:
+            res = _to_response(url, resp, body, elapsed)
+            if not res.ok:  # check if no bad response is returned
+                self._log.warning(
+                    "Response for %s failed!\nResponse status code: %s.",
+                    url, res.status_code)
+            if self._verbose:
+                callback(res, log=self._log)
+            return res
+        self._log.warning(
+            "Sending a GET request to %s has failed!\n"
+            "The exception thrown is %s", url, res)
+        return res
@@ -0,0 +1,560 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the caches of the webscraper.
+"""
+
+import calendar
+import collections
+import datetime
+import email.utils
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional, Tuple, Union
+
+import requests
+from bs4 import BeautifulSoup, NavigableString
+from requests.structures import CaseInsensitiveDict
+
+# status codes of responses which are stored in the cache
+CACHEABLE_STATUS_CODES = {200, 203}
+# approximate memory in bytes used by a single node of a BeautifulSoup tree
+NODE_SIZE = 600
+# headers which do not describe the stored (decoded) body
+UNSTORED_HEADERS = {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "keep-alive",
+    "transfer-encoding",
+}
+
+
+def _stored_headers(
+    headers: CaseInsensitiveDict,
+) -> Dict[str, str]:
+    """Get the headers of a response which are stored in the cache."""
+    return {
+        name.lower(): val for name, val in headers.items()
+        if name.lower() not in UNSTORED_HEADERS
+    }
+
+
+def _parse_cache_control(
+    value: str,
+) -> Dict[str, Optional[str]]:
+    """Parse the directives of a Cache-Control header.
+
+    Parameters
+    ----------
+    value : str
+        The value of the header.
+
+    Returns
+    -------
+    Dict[str, Optional[str]]
+        The directives in lower case mapped to their argument,
+        or None if the directive has no argument.
+
+    """
+    directives = {}
+    for directive in value.split(","):
+        key, _, arg = directive.strip().partition("=")
+        if key:
+            directives[key.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _parse_date(
+    value: Optional[str],
+) -> Optional[float]:
+    """Parse a http date to a timestamp.
+
+    Parameters
+    ----------
+    value : Optional[str]
+        The http date.
+
+    Returns
+    -------
+    Optional[float]
+        The timestamp, None if `value` is not a valid date.
+
+    """
+    if not value:
+        return None
+    parsed = email.utils.parsedate(value)
+    if parsed is None:
+        return None
+    return float(calendar.timegm(parsed))
+
+
+def _expires(
+    headers: CaseInsensitiveDict,
+    now: float,
+) -> Optional[float]:
+    """Determine until when a response is fresh.
+
+    Parameters
+    ----------
+    headers : CaseInsensitiveDict
+        The headers of the response.
+    now : float
+        The time at which the response was received.
+
+    Returns
+    -------
+    Optional[float]
+        The timestamp until which the response can be served without
+        revalidation, None if the response must not be stored at all.
+
+    """
+    directives = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in directives or headers.get("vary", "").strip() == "*":
+        return None
+    if "no-cache" in directives:
+        return now
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            age = float(headers.get("age", 0))
+            return now + float(max_age) - age
+        except ValueError:
+            return now
+    expires = _parse_date(headers.get("expires"))
+    if expires is not None:
+        date = _parse_date(headers.get("date")) or now
+        return now + expires - date
+    # without explicit freshness the response has to be revalidated
+    return now
+
+
+class ResponseCache:
+    """A persistent cache for the responses of GET requests.
+
+    The bodies and headers of the responses are stored on disk. Fresh
+    responses are served without sending a request, stale responses are
+    revalidated with a conditional request, a 304 response is then served
+    from the cache.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        max_size: int = 256 * 2**20,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        path : Union[str, PathLike]
+            The directory in which the responses are stored.
+        max_size : int
+            The maximum size of all stored bodies in bytes,
+            by default 256 MiB. If exceeded, the least recently used
+            responses are removed.
+
+        """
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+        self._lock = threading.RLock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "evictions": 0,
+        }
+        # load the stored responses, the least recently used first
+        self._index = collections.OrderedDict()
+        entries = []
+        for meta in self._path.glob("*/*.json"):
+            body = meta.with_suffix(".body")
+            if body.exists():
+                entries.append(
+                    (meta.stat().st_mtime, meta.stem, body.stat().st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+        self._size = sum(self._index.values())
+
+    @property
+    def size(self) -> int:
+        """The size of all stored bodies in bytes."""
+        return self._size
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """The counters of the cache.
+
+        Returns
+        -------
+        Dict[str, int]
+            The number of hits (including revalidations), misses,
+            revalidations (304 responses) and evictions.
+
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def fetch(
+        self,
+        url: str,
+        send: Callable[[dict], requests.Response],
+    ) -> requests.Response:
+        """Get the response for a url from the cache or via `send`.
+
+        Parameters
+        ----------
+        url : str
+            The url of the GET request.
+        send : Callable[[dict], requests.Response]
+            A function which sends the GET request with the given additional
+            (conditional) headers.
+
+        Returns
+        -------
+        requests.Response
+            The response. Responses served from the cache have the attribute
+            `from_cache` set to True.
+
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        meta = self._load(key)
+        if meta is not None and meta["expires"] > time.time():
+            res = self._response(key, meta)
+            if res is not None:
+                self._count("hits")
+                return res
+            # the response has been evicted meanwhile
+            meta = None
+        headers = {}
+        if meta is not None:
+            if meta["headers"].get("etag"):
+                headers["If-None-Match"] = meta["headers"]["etag"]
+            if meta["headers"].get("last-modified"):
+                headers["If-Modified-Since"] = meta["headers"]["last-modified"]
+        res = send(headers)
+        if res.status_code == 304 and meta is not None:
+            # update the stored headers with the headers of the 304 response
+            meta["headers"].update(_stored_headers(res.headers))
+            expires = _expires(CaseInsensitiveDict(
+                meta["headers"]), time.time())
+            meta["expires"] = expires if expires is not None else 0.0
+            with self._lock:
+                cached = self._response(key, meta)
+                if cached is not None:
+                    self._write_meta(key, meta)
+            if cached is not None:
+                self._count("hits")
+                self._count("revalidations")
+                return cached
+            # the response has been evicted meanwhile, get it again
+            res = send({})
+        self._count("misses")
+        self._store(key, res)
+        return res
+
+    def clear(self) -> None:
+        """Remove all stored responses."""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+
+    def _count(
+        self,
+        name: str,
+    ) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _files(
+        self,
+        key: str,
+    ) -> tuple:
+        folder = self._path / key[:2]
+        return folder / f"{key}.json", folder / f"{key}.body"
+
+    def _load(
+        self,
+        key: str,
+    ) -> Optional[dict]:
+        """Load the metadata of a stored response and mark it as used."""
+        with self._lock:
+            if key not in self._index:
+                return None
+            meta_file, _ = self._files(key)
+            try:
+                meta = json.loads(meta_file.read_text(encoding="utf-8"))
+                os.utime(meta_file)
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            self._index.move_to_end(key)
+        return meta
+
+    def _response(
+        self,
+        key: str,
+        meta: dict,
+    ) -> Optional[requests.Response]:
+        """Create a response object from a stored response, None if it has
+        been removed."""
+        _, body_file = self._files(key)
+        # read the body under the lock, such that it is not evicted meanwhile
+        with self._lock:
+            if key not in self._index:
+                return None
+            try:
+                body = body_file.read_bytes()
+            except OSError:
+                self._remove(key)
+                return None
+        res = requests.Response()
+        res.status_code = meta["status_code"]
+        res.reason = meta["reason"]
+        res.url = meta["url"]
+        res.headers = CaseInsensitiveDict(meta["headers"])
+        res.encoding = meta["encoding"]
+        res.elapsed = datetime.timedelta(0)
+        res._content = body
+        res.from_cache = True
+        return res
+
+    def _store(
+        self,
+        key: str,
+        res: requests.Response,
+    ) -> None:
+        """Store a response if it is cacheable."""
+        if res.status_code not in CACHEABLE_STATUS_CODES:
+            return
+        now = time.time()
+        expires = _expires(res.headers, now)
+        if expires is None or len(res.content) > self._max_size:
+            return
+        # a stale response without validators can never be served
+        if expires <= now and "etag" not in res.headers \
+                and "last-modified" not in res.headers:
+            return
+        meta = {
+            "url": res.url,
+            "status_code": res.status_code,
+            "reason": res.reason,
+            "encoding": res.encoding,
+            "headers": _stored_headers(res.headers),
+            "expires": expires,
+        }
+        meta_file, body_file = self._files(key)
+        with self._lock:
+            if key in self._index:
+                self._size -= self._index.pop(key)
+            meta_file.parent.mkdir(exist_ok=True)
+            body_file.write_bytes(res.content)
+            self._write_meta(key, meta)
+            self._index[key] = len(res.content)
+            self._size += len(res.content)
+            # evict the least recently used responses
+            while self._size > self._max_size:
+                self._remove(next(iter(self._index)))
+                self._stats["evictions"] += 1
+
+    def _write_meta(
+        self,
+        key: str,
+        meta: dict,
+    ) -> None:
+        meta_file, _ = self._files(key)
+        tmp_file = meta_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_file, meta_file)
+
+    def _remove(
+        self,
+        key: str,
+    ) -> None:
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+            for file in self._files(key):
+                try:
+                    file.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def _document_size(
+    soup: BeautifulSoup,
+) -> int:
+    """Estimate the memory used by a parsed document.
+
+    Parameters
+    ----------
+    soup : BeautifulSoup
+        The parsed document.
+
+    Returns
+    -------
+    int
+        The estimated size of the document in bytes.
+
+    """
+    size = NODE_SIZE
+    for node in soup.descendants:
+        size += NODE_SIZE
+        if isinstance(node, NavigableString):
+            size += len(node)
+    return size
+
+
+class DocumentCache:
+    """An in-memory cache for parsed documents.
+
+    The documents are identified by the hash of the raw content, the parser
+    and the arguments of the `SoupStrainer`, such that the same content is
+    only parsed once for the same part of the document.
+
+    Notes
+    -----
+    The cached documents are shared, changing a returned document changes
+    the document returned for the next lookup of the same key as well.
+    """
+
+    def __init__(
+        self,
+        max_memory: int = 256 * 2**20,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        max_memory : int
+            The maximum estimated memory of all cached documents in bytes,
+            by default 256 MiB. If exceeded, the least recently used
+            documents are removed.
+
+        """
+        self._max_memory = max_memory
+        self._lock = threading.Lock()
+        self._docs = collections.OrderedDict()
+        self._memory = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def memory(self) -> int:
+        """The estimated memory of all cached documents in bytes."""
+        return self._memory
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """The counters of the cache.
+
+        Returns
+        -------
+        Dict[str, int]
+            The number of hits, misses and evictions.
+
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def key(
+        content: bytes,
+        parser: str,
+        name: Optional[str],
+        kwargs: dict,
+    ) -> Tuple[Hashable, ...]:
+        """Create the key of a parsed document.
+
+        Parameters
+        ----------
+        content : bytes
+            The raw content which is parsed.
+        parser : str
+            The parser used.
+        name : Optional[str]
+            The name passed into the `SoupStrainer` object.
+        kwargs : dict
+            The parameters passed into the `SoupStrainer` object.
+
+        Returns
+        -------
+        Tuple[Hashable, ...]
+            The key.
+
+        """
+        digest = hashlib.sha1(content).digest()
+        return digest, parser, repr(name), repr(sorted(kwargs.items()))
+
+    def get(
+        self,
+        key: Tuple[Hashable, ...],
+    ) -> Optional[BeautifulSoup]:
+        """Get a parsed document.
+
+        Parameters
+        ----------
+        key : Tuple[Hashable, ...]
+            The key of the document, see `key()`.
+
+        Returns
+        -------
+        Optional[BeautifulSoup]
+            The parsed document, None if it is not cached.
+
+        """
+        with self._lock:
+            entry = self._docs.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._docs.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(
+        self,
+        key: Tuple[Hashable, ...],
+        soup: BeautifulSoup,
+    ) -> None:
+        """Cache a parsed document.
+
+        Parameters
+        ----------
+        key : Tuple[Hashable, ...]
+            The key of the document, see `key()`.
+        soup : BeautifulSoup
+            The parsed document.
+
+        """
+        size = _document_size(soup)
+        if size > self._max_memory:
+            return
+        with self._lock:
+            if key in self._docs:
+                self._memory -= self._docs.pop(key)[1]
+            self._docs[key] = (soup, size)
+            self._memory += size
+            # evict the least recently used documents
+            while self._memory > self._max_memory:
+                _, (_, _size) = self._docs.popitem(last=False)
+                self._memory -= _size
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove all cached documents."""
+        with self._lock:
+            self._docs.clear()
+            self._memory = 0
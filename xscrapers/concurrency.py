@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the adaptive concurrency of the webscraper.
+"""
+
+import collections
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+
+class Adjustment(NamedTuple):
+    """An adjustment of the concurrency limit."""
+    time: float
+    limit: int
+    reason: str
+
+
+class AIMDController:
+    """Adapt the number of requests in flight with additive increase and
+    multiplicative decrease (AIMD).
+
+    Whenever `limit` requests in a row have completed without sign of
+    overload, the limit is increased by one. If a request fails transiently
+    or the smoothed latency exceeds both `latency_tolerance` times the
+    baseline latency and the baseline by `min_latency_increase`, the limit is
+    multiplied by `backoff_ratio`, at most once per `limit` completed
+    requests.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_latency_increase: float = 0.005,
+        smoothing: float = 0.2,
+        max_history: int = 1000,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        initial : int
+            The initial limit, by default 8.
+        min_limit : int
+            The minimum limit, by default 1.
+        max_limit : int
+            The maximum limit, by default 64.
+        backoff_ratio : float
+            The factor by which the limit is decreased on overload,
+            by default 0.5.
+        latency_tolerance : float
+            The ratio of the smoothed latency to the baseline latency which
+            is regarded as overload, by default 2.
+        min_latency_increase : float
+            The increase of the smoothed latency over the baseline latency in
+            seconds below which it is not regarded as overload, by default
+            0.005, such that the jitter of very low latencies, e.g. of a
+            local server, does not decrease the limit.
+        smoothing : float
+            The weight of a new latency in the exponentially weighted moving
+            average of the latency, by default 0.2.
+        max_history : int
+            The number of adjustments kept in the history, by default 1000.
+
+        """
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._limit = min(max(initial, min_limit), max_limit)
+        self._backoff_ratio = backoff_ratio
+        self._latency_tolerance = latency_tolerance
+        self._min_latency_increase = min_latency_increase
+        self._smoothing = smoothing
+        self._lock = threading.Lock()
+        self._latency = None
+        self._baseline = None
+        self._successes = 0
+        self._completed = 0
+        self._last_decrease = -self._limit
+        self._history = collections.deque(maxlen=max_history)
+        self._adjust(self._limit, "initial")
+
+    @property
+    def limit(self) -> int:
+        """The current number of requests allowed in flight."""
+        return self._limit
+
+    @property
+    def max_limit(self) -> int:
+        """The maximum number of requests allowed in flight."""
+        return self._max_limit
+
+    @property
+    def history(self) -> List[Adjustment]:
+        """The adjustments of the limit, the oldest first."""
+        with self._lock:
+            return list(self._history)
+
+    def record(
+        self,
+        latency: Optional[float],
+        failed: bool = False,
+    ) -> None:
+        """Record a completed request and adjust the limit.
+
+        Parameters
+        ----------
+        latency : Optional[float]
+            The latency of the request in seconds, None if unknown.
+        failed : bool
+            Determine whether the request failed transiently,
+            by default False.
+
+        """
+        with self._lock:
+            self._completed += 1
+            reason = "error" if failed else None
+            if latency is not None and not failed:
+                if self._latency is None:
+                    self._latency = self._baseline = latency
+                else:
+                    self._latency += self._smoothing * \
+                        (latency - self._latency)
+                if self._latency < self._baseline:
+                    self._baseline = self._latency
+                else:
+                    # follow lasting changes of the latency slowly
+                    self._baseline += 0.01 * (self._latency - self._baseline)
+                if self._latency > self._latency_tolerance * self._baseline \
+                        and self._latency - self._baseline \
+                        > self._min_latency_increase:
+                    reason = "latency"
+            if reason is not None:
+                self._successes = 0
+                # decrease at most once per round trip of all requests
+                if self._completed - self._last_decrease >= self._limit:
+                    self._last_decrease = self._completed
+                    self._adjust(
+                        max(self._min_limit,
+                            int(self._limit * self._backoff_ratio)),
+                        reason,
+                    )
+            else:
+                self._successes += 1
+                if self._successes >= self._limit:
+                    self._successes = 0
+                    self._adjust(
+                        min(self._max_limit, self._limit + 1), "increase")
+
+    def _adjust(
+        self,
+        limit: int,
+        reason: str,
+    ) -> None:
+        if limit != self._limit or not self._history:
+            self._limit = limit
+            self._history.append(Adjustment(time.time(), limit, reason))
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the download of responses to files, see
+`Webscraper.download()` and `Webscraper.download_segmented()`.
+
+The body of each response is streamed to a temporary file next to its
+destination in large chunks, which is renamed once the download is
+complete, such that no partial files are left behind.
+"""
+
+import collections
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+import requests
+
+# the number of bytes read and written at once
+DOWNLOAD_CHUNK_SIZE = 2**20
+# the size of the byte ranges of a segmented download
+SEGMENT_SIZE = 16 * 2**20
+# the extensions detected from the first bytes of a body
+MAGIC_NUMBERS = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"%PDF-", ".pdf"),
+    (b"PK\x03\x04", ".zip"),
+    (b"\x1f\x8b", ".gz"),
+    (b"BM", ".bmp"),
+)
+# the content types which do not tell the type of the file
+_GENERIC_TYPES = {"", "application/octet-stream", "binary/octet-stream"}
+
+_RE_UNSAFE = re.compile(r"[^\w.-]+")
+_RE_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class SegmentError(requests.exceptions.RequestException):
+    """Raised if a byte range of a segmented download has not been served
+    as requested."""
+
+
+def guess_extension(
+    res: requests.Response,
+    head: bytes = b"",
+) -> str:
+    """Guess the file extension of a response.
+
+    Parameters
+    ----------
+    res : requests.Response
+        The response.
+    head : bytes
+        The first bytes of the body, by default none.
+
+    Returns
+    -------
+    str
+        The extension including the dot, e.g. ".png", taken from the
+        content-type header, else from the first bytes of the body (see
+        `MAGIC_NUMBERS`), else from the path of the url, else "".
+
+    """
+    content_type = res.headers.get("content-type", "").split(";")[0]
+    content_type = content_type.strip().lower()
+    if content_type not in _GENERIC_TYPES:
+        extension = mimetypes.guess_extension(content_type)
+        if extension is not None:
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    for magic, extension in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return extension
+    if head.lstrip()[:4].lower() == b"<svg":
+        return ".svg"
+    return posixpath.splitext(urlsplit(res.url).path)[1].lower()
+
+
+def url_stem(
+    url: str,
+) -> str:
+    """Get a file name without extension for a url, i.e. the last segment
+    of its path without extension and characters unsafe in file names, or
+    "download" if that is empty."""
+    name = posixpath.basename(unquote(urlsplit(url).path))
+    stem = _RE_UNSAFE.sub("_", posixpath.splitext(name)[0]).strip("._")
+    return stem or "download"
+
+
+def url_stems(
+    urls: List[str],
+) -> List[str]:
+    """Get unique file names without extension for urls.
+
+    Parameters
+    ----------
+    urls : List[str]
+        The urls.
+
+    Returns
+    -------
+    List[str]
+        The name of each url (see `url_stem()`), which is numbered by the
+        index of the url if it is not unique, e.g. "photo-3". If a numbered
+        name is taken, the number is incremented until the name is free.
+
+    """
+    stems = [url_stem(url) for url in urls]
+    counts = collections.Counter(stems)
+    taken = {stem for stem, count in counts.items() if count == 1}
+    names = []
+    for idx, stem in enumerate(stems):
+        if counts[stem] > 1:
+            while f"{stem}-{idx}" in taken:
+                idx += 1
+            stem = f"{stem}-{idx}"
+            taken.add(stem)
+        names.append(stem)
+    return names
+
+
+class DownloadReport:
+    """The result of a download of multiple urls."""
+
+    __slots__ = ("paths", "errors", "size", "seconds")
+
+    def __init__(
+        self,
+        paths: Dict[str, Path],
+        errors: Dict[str, Union[requests.Response, Exception]],
+        size: int,
+        seconds: float,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        paths : Dict[str, Path]
+            The file written per url.
+        errors : Dict[str, Union[requests.Response, Exception]]
+            The bad response or the error thrown per url which has not been
+            downloaded.
+        size : int
+            The number of bytes written.
+        seconds : float
+            The duration of the download in seconds.
+
+        """
+        self.paths = paths
+        self.errors = errors
+        self.size = size
+        self.seconds = seconds
+
+    @property
+    def mb_per_second(self) -> float:
+        """The throughput in megabytes (10**6 bytes) per second."""
+        return self.size / 1e6 / self.seconds if self.seconds else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{type(self).__name__} {len(self.paths)} files, "
+            f"{len(self.errors)} errors, {self.size / 1e6:.1f} MB "
+            f"in {self.seconds:.2f}s ({self.mb_per_second:.1f} MB/s)>"
+        )
+
+
+def save_response(
+    res: requests.Response,
+    dest: Path,
+    stem: str,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+) -> Optional[Path]:
+    """Stream the body of a response to a file.
+
+    Parameters
+    ----------
+    res : requests.Response
+        A response of a request sent with ``stream=True``.
+    dest : Path
+        The directory of the file.
+    stem : str
+        The name of the file without extension, which is guessed from the
+        response (see `guess_extension()`).
+    chunk_size : int
+        The number of bytes read and written at once,
+        by default `DOWNLOAD_CHUNK_SIZE`.
+
+    Returns
+    -------
+    Optional[Path]
+        The file written, None if the response is bad, in which case its
+        body is read (such that the connection is reused) but not written.
+
+    Notes
+    -----
+    The body is written to a hidden temporary file in `dest`, which
+    replaces the file atomically once the whole body has been written. If
+    the download fails, the temporary file is removed and the error is
+    raised.
+
+    """
+    try:
+        if not res.ok:
+            res.content
+            return None
+        chunks = res.iter_content(chunk_size)
+        head = next(chunks, b"")
+        path = dest / (stem + guess_extension(res, head))
+        fd, tmp = tempfile.mkstemp(
+            dir=dest, prefix=f".{path.name}.", suffix=".part")
+        try:
+            with open(fd, "wb", buffering=chunk_size) as file:
+                file.write(head)
+                for chunk in chunks:
+                    file.write(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    finally:
+        res.close()
+    return path
+
+
+def segments(
+    size: int,
+    segment_size: int = SEGMENT_SIZE,
+) -> List[Tuple[int, int]]:
+    """Split a file into byte ranges.
+
+    Parameters
+    ----------
+    size : int
+        The size of the file in bytes.
+    segment_size : int
+        The size of the ranges in bytes, by default `SEGMENT_SIZE`.
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        The first and the last byte of each range, as in the Range header.
+
+    """
+    return [
+        (start, min(start + segment_size, size) - 1)
+        for start in range(0, size, segment_size)
+    ]
+
+
+def check_range(
+    res: requests.Response,
+    start: int,
+    end: int,
+    size: int,
+) -> None:
+    """Check that a response serves the requested range of a file.
+
+    Parameters
+    ----------
+    res : requests.Response
+        The response of a request with a Range header.
+    start : int
+        The first byte requested.
+    end : int
+        The last byte requested.
+    size : int
+        The size of the file in bytes.
+
+    Raises
+    ------
+    SegmentError
+        If the response is no partial content (status code 206) of the
+        range and the size requested, e.g. if the file has changed.
+
+    """
+    match = _RE_CONTENT_RANGE.fullmatch(
+        res.headers.get("content-range", "").strip())
+    if res.status_code != 206 or match is None or (
+            int(match[1]), int(match[2])) != (start, end) \
+            or match[3] not in ("*", str(size)):
+        raise SegmentError(
+            f"Expected bytes {start}-{end}/{size} of {res.url}, got status "
+            f"{res.status_code} with content-range "
+            f"{res.headers.get('content-range')!r}.",
+            response=res,
+        )
+
+
+class SegmentedFile:
+    """A file which is written in byte ranges, which are recorded in a
+    state file such that an interrupted download can be resumed.
+
+    The ranges are written into a preallocated hidden file
+    ``.<name>.part`` next to the destination, the ranges which are
+    complete into ``.<name>.part.json``. Both are replaced by the
+    destination once all ranges are complete.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        segment_size: int = SEGMENT_SIZE,
+        validator: Optional[str] = None,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        path : Path
+            The destination of the file.
+        size : int
+            The size of the file in bytes.
+        segment_size : int
+            The size of the ranges in bytes, by default `SEGMENT_SIZE`.
+        validator : Optional[str]
+            The ETag or the Last-Modified header of the file, by default
+            None. The ranges of a previous download are only resumed if
+            it is the same.
+
+        Notes
+        -----
+        The ranges completed by a previous download of the same size,
+        segment size and validator are taken from the state file, the
+        other ranges are to be downloaded.
+
+        """
+        self.path = path
+        self.size = size
+        self.segments = segments(size, segment_size)
+        self._part = path.with_name(f".{path.name}.part")
+        self._state = path.with_name(f".{path.name}.part.json")
+        self._meta = {
+            "size": size,
+            "segment_size": segment_size,
+            "validator": validator,
+        }
+        self._lock = threading.Lock()
+        self.done = set()
+        if self._part.exists() and self._state.exists():
+            try:
+                state = json.loads(self._state.read_text())
+            except ValueError:
+                state = {}
+            if state.get("meta") == self._meta:
+                self.done = set(state["done"]) & set(
+                    range(len(self.segments)))
+        if not self.done:
+            self._allocate()
+
+    @property
+    def pending(self) -> List[int]:
+        """The indices of the ranges which are not complete."""
+        with self._lock:
+            return [idx for idx in range(len(self.segments))
+                    if idx not in self.done]
+
+    def _allocate(self) -> None:
+        """Create the part file with its final size and an empty state."""
+        with open(self._part, "wb") as file:
+            try:
+                os.posix_fallocate(file.fileno(), 0, self.size)
+            except (AttributeError, OSError):
+                # not available on this platform or file system
+                file.truncate(self.size)
+        self._save()
+
+    def _save(self) -> None:
+        """Write the state file atomically."""
+        tmp = self._state.with_name(self._state.name + ".tmp")
+        tmp.write_text(json.dumps(
+            {"meta": self._meta, "done": sorted(self.done)}))
+        os.replace(tmp, self._state)
+
+    def write(
+        self,
+        idx: int,
+        res: requests.Response,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> None:
+        """Write a range from a streamed response.
+
+        Parameters
+        ----------
+        idx : int
+            The index of the range in `segments`.
+        res : requests.Response
+            The response of the range, see `check_range()`.
+        chunk_size : int
+            The number of bytes read and written at once,
+            by default `DOWNLOAD_CHUNK_SIZE`.
+
+        Raises
+        ------
+        SegmentError
+            If the response does not serve the range, in which case the
+            range remains pending.
+        requests.exceptions.ChunkedEncodingError
+            If the body is incomplete, e.g. because the connection broke,
+            in which case the range remains pending.
+
+        """
+        start, end = self.segments[idx]
+        try:
+            check_range(res, start, end, self.size)
+            written = 0
+            with open(self._part, "r+b", buffering=chunk_size) as file:
+                file.seek(start)
+                for chunk in res.iter_content(chunk_size):
+                    file.write(chunk[:end + 1 - start - written])
+                    written += len(chunk)
+        finally:
+            res.close()
+        if written != end + 1 - start:
+            # urllib3 < 2 does not raise on a body shorter than its
+            # content-length, report it as the broken connection it is
+            raise requests.exceptions.ChunkedEncodingError(
+                f"Expected {end + 1 - start} bytes of {res.url}, "
+                f"got {written}.", response=res)
+        with self._lock:
+            self.done.add(idx)
+            self._save()
+
+    def finish(self) -> Path:
+        """Move the file to its destination once all ranges are complete.
+
+        Returns
+        -------
+        Path
+            The destination of the file.
+
+        """
+        os.replace(self._part, self.path)
+        self._state.unlink()
+        return self.path
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the resolution of the encoding of html
+responses.
+"""
+
+import codecs
+import collections
+import posixpath
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from bs4.dammit import EncodingDetector
+
+# the number of bytes at the start of a body searched for a declaration
+ENCODING_PREFIX = 4096
+# the encoding of html pages without any declaration
+DEFAULT_ENCODING = "windows-1252"
+
+_RE_DIGITS = re.compile(r"\d+")
+
+
+def _valid(
+    encoding: Optional[str],
+) -> Optional[str]:
+    """Get the normalized name of an encoding, None if it is unknown."""
+    if not encoding:
+        return None
+    try:
+        return codecs.lookup(encoding.strip().strip("'\"")).name
+    except LookupError:
+        return None
+
+
+def _template(
+    url: str,
+) -> str:
+    """Get the template of a url, i.e. its host and the directory of its
+    path with numbers replaced, e.g. "example.com/items/0/" for
+    "https://example.com/items/42/detail.html"."""
+    split = urlsplit(url)
+    directory = posixpath.dirname(split.path)
+    return (split.hostname or "") + _RE_DIGITS.sub("0", directory)
+
+
+def detect_encoding(
+    content: bytes,
+    prefix: int = ENCODING_PREFIX,
+) -> str:
+    """Detect the encoding of a html page from the start of its body.
+
+    Parameters
+    ----------
+    content : bytes
+        The body of the page.
+    prefix : int
+        The number of bytes at the start of the body which are searched,
+        by default `ENCODING_PREFIX`.
+
+    Returns
+    -------
+    str
+        The encoding given by a byte order mark or a declaration (e.g.
+        ``<meta charset="...">``), otherwise "utf-8" if the start of the
+        body is valid UTF-8, else `DEFAULT_ENCODING`.
+
+    """
+    head = content[:prefix]
+    _, encoding = EncodingDetector.strip_byte_order_mark(head)
+    if encoding is not None:
+        return encoding
+    encoding = _valid(EncodingDetector.find_declared_encoding(
+        head, is_html=True, search_entire_document=True))
+    if encoding is not None:
+        return encoding
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # a multibyte character may be cut off at the end of the prefix
+        if e.start < len(head) - 3 or len(content) <= prefix:
+            return DEFAULT_ENCODING
+    return "utf-8"
+
+
+class EncodingResolver:
+    """Resolve the encoding of html responses and cache it per template.
+
+    The encoding given by a byte order mark or a valid charset of the
+    content-type header is used right away. Otherwise, the encoding
+    detected for a previous page of the same host and template (see
+    `_template()`) is used, and only if there is none, the start of the
+    body is searched (see `detect_encoding()`).
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        prefix: int = ENCODING_PREFIX,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        max_size : int
+            The maximum number of templates of which the encoding is
+            cached, by default 1024.
+        prefix : int
+            The number of bytes at the start of a body which are searched,
+            by default `ENCODING_PREFIX`.
+
+        """
+        self._max_size = max_size
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._cache = collections.OrderedDict()
+        self._stats = collections.Counter()
+        self._time = 0.0
+
+    @property
+    def stats(self) -> dict:
+        """The number of encodings taken from the header ("http"), from the
+        cache ("cached") and detected from the body ("detected"), and the
+        total time spent in seconds ("time")."""
+        with self._lock:
+            return {
+                "http": self._stats["http"],
+                "cached": self._stats["cached"],
+                "detected": self._stats["detected"],
+                "time": self._time,
+            }
+
+    def clear(self) -> None:
+        """Remove all cached encodings and reset the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._stats.clear()
+            self._time = 0.0
+
+    def resolve(
+        self,
+        res: requests.Response,
+    ) -> str:
+        """Get the encoding of a response.
+
+        Parameters
+        ----------
+        res : requests.Response
+            The response, of which the body has been read.
+
+        Returns
+        -------
+        str
+            The encoding of the body.
+
+        """
+        start = time.perf_counter()
+        content = res.content or b""
+        _, encoding = EncodingDetector.strip_byte_order_mark(content[:4])
+        source = "detected"
+        if encoding is None and "charset" in res.headers.get(
+                "content-type", "").lower():
+            encoding = _valid(res.encoding)
+            source = "http"
+        if encoding is None:
+            key = _template(res.url)
+            with self._lock:
+                encoding = self._cache.get(key)
+                if encoding is not None:
+                    self._cache.move_to_end(key)
+            source = "cached"
+            if encoding is None:
+                encoding = detect_encoding(content, self._prefix)
+                source = "detected"
+                with self._lock:
+                    self._cache[key] = encoding
+                    if len(self._cache) > self._max_size:
+                        self._cache.popitem(last=False)
+        with self._lock:
+            self._stats[source] += 1
+            self._time += time.perf_counter() - start
+        return encoding
@@ -0,0 +1,555 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the hooks of the webscraper, which are
+called before and after sending a request, parsing a response and extracting
+values from the parsed document, and the profilers built on them.
+
+A hook is an object which implements some of the methods of `Hook`. The
+hooks of a scraper are kept in its `Hooks`, which can be enabled and
+disabled at runtime. While no hook is registered or the hooks are disabled,
+the scraper checks a single attribute per stage.
+"""
+
+import collections
+import cProfile
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import requests
+
+from .records import ResponseRecord
+
+# the events at which the hooks are called, in the order of a request
+EVENTS = (
+    "before_request",
+    "after_response",
+    "before_parse",
+    "after_parse",
+    "before_extract",
+    "after_extract",
+)
+# the stages which are profiled, each between its before and after event
+PROFILE_STAGES = ("request", "parse", "extract")
+
+
+class Hook:
+    """The base class of the hooks, of which all methods do nothing.
+
+    Subclasses override the methods of the events they handle. The request
+    hooks are called by the thread which sends the request, the parse and
+    extract hooks by the thread which parses the response, so hooks of a
+    scraper which loads multiple urls have to be thread safe. The parse and
+    extract hooks are not called for responses parsed in worker processes,
+    i.e. by `parse(parallel=True)` and `pipeline(parallel=True)`, nor by
+    `Parser.links()` and `Parser.extract()`, which read the raw content of
+    the responses without parsing them into a document. If a
+    parse or an extraction fails, its after hook is called with the error in
+    place of the result, such that hooks can clean up.
+    """
+
+    def before_request(
+        self,
+        method: str,
+        url: str,
+        kwargs: dict,
+    ) -> None:
+        """Called before a request is sent.
+
+        Parameters
+        ----------
+        method : str
+            The http method of the request.
+        url : str
+            The url of the request.
+        kwargs : dict
+            The parameters passed into `requests.Session.request`, which
+            may be changed, e.g. to add headers.
+
+        """
+
+    def after_response(
+        self,
+        method: str,
+        url: str,
+        res: Union[requests.Response, Exception],
+        seconds: float,
+    ) -> None:
+        """Called after a response has been received.
+
+        Parameters
+        ----------
+        method : str
+            The http method of the request.
+        url : str
+            The url of the request.
+        res : Union[requests.Response, Exception]
+            The response, or the error raised by the request.
+        seconds : float
+            The duration of the request in seconds.
+
+        """
+
+    def before_parse(
+        self,
+        res: requests.Response,
+    ) -> None:
+        """Called before a response is parsed.
+
+        Parameters
+        ----------
+        res : requests.Response
+            The response.
+
+        """
+
+    def after_parse(
+        self,
+        res: requests.Response,
+        obj: Any,
+        seconds: float,
+    ) -> None:
+        """Called after a response has been parsed, or the parse has
+        failed.
+
+        Parameters
+        ----------
+        res : requests.Response
+            The response.
+        obj : Any
+            The parsed document, or the error raised by the parse.
+        seconds : float
+            The duration of the parse in seconds.
+
+        """
+
+    def before_extract(
+        self,
+        res: requests.Response,
+        obj: Any,
+    ) -> None:
+        """Called before values are extracted from a parsed document.
+
+        Parameters
+        ----------
+        res : requests.Response
+            The response.
+        obj : Any
+            The parsed document.
+
+        """
+
+    def after_extract(
+        self,
+        res: requests.Response,
+        value: Any,
+        seconds: float,
+    ) -> None:
+        """Called after values have been extracted from a parsed document,
+        or the extraction has failed.
+
+        Parameters
+        ----------
+        res : requests.Response
+            The response.
+        value : Any
+            The value returned by the extract function, or the error raised
+            by it.
+        seconds : float
+            The duration of the extraction in seconds.
+
+        """
+
+
+def _handles(
+    hook: Any,
+    event: str,
+) -> bool:
+    """Determine whether a hook overrides the method of an event."""
+    func = getattr(type(hook), event, None)
+    return func is not None and func is not getattr(Hook, event)
+
+
+class Hooks:
+    """The hooks of a scraper.
+
+    The attribute `enabled` is True if the hooks are switched on and at
+    least one hook is registered, the scraper only calls `emit()` then.
+
+    Examples
+    --------
+    >>> profiler = StageProfiler()
+    >>> webscraper = Webscraper("lxml", hooks=[profiler])
+    >>> webscraper.get(urls)
+    >>> webscraper.hooks.disable()
+    >>> profiler.stats("request").sort_stats("cumulative").print_stats(10)
+
+    """
+
+    def __init__(
+        self,
+        hooks: Iterable[Hook] = (),
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        hooks : Iterable[Hook]
+            The hooks, called in the order given, by default none.
+
+        """
+        self._lock = threading.Lock()
+        self._hooks = []
+        self._on = True
+        self._callbacks = {event: () for event in EVENTS}
+        self.enabled = False
+        for hook in hooks:
+            self.add(hook)
+
+    def __iter__(self):
+        return iter(list(self._hooks))
+
+    def __len__(self) -> int:
+        return len(self._hooks)
+
+    def _update(self) -> None:
+        # replace the callbacks at once, such that threads which emit an
+        # event meanwhile see either the old or the new callbacks
+        self._callbacks = {
+            event: tuple(getattr(hook, event) for hook in self._hooks
+                         if _handles(hook, event))
+            for event in EVENTS
+        }
+        self.enabled = self._on and bool(self._hooks)
+
+    def add(
+        self,
+        hook: Hook,
+    ) -> None:
+        """Register a hook, which is called after the hooks registered
+        before.
+
+        Parameters
+        ----------
+        hook : Hook
+            The hook.
+
+        """
+        with self._lock:
+            self._hooks.append(hook)
+            self._update()
+
+    def remove(
+        self,
+        hook: Hook,
+    ) -> None:
+        """Unregister a hook.
+
+        Parameters
+        ----------
+        hook : Hook
+            The hook.
+
+        Raises
+        ------
+        ValueError
+            If the hook is not registered.
+
+        """
+        with self._lock:
+            self._hooks.remove(hook)
+            self._update()
+
+    def enable(self) -> None:
+        """Switch the hooks on."""
+        with self._lock:
+            self._on = True
+            self._update()
+
+    def disable(self) -> None:
+        """Switch the hooks off, they are kept registered."""
+        with self._lock:
+            self._on = False
+            self._update()
+
+    def emit(
+        self,
+        event: str,
+        *args,
+    ) -> None:
+        """Call the hooks of an event.
+
+        Parameters
+        ----------
+        event : str
+            The event, one of `EVENTS`.
+
+        Other Parameters
+        ----------------
+        The arguments of the event, see the methods of `Hook`.
+
+        """
+        for func in self._callbacks[event]:
+            func(*args)
+
+
+class StageProfiler(Hook):
+    """Profile the stages of the requests and parses with cProfile.
+
+    Each request, parse and extraction is profiled separately in the thread
+    which runs it, the profiles are added up per stage.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[str] = PROFILE_STAGES,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        stages : Sequence[str]
+            The stages which are profiled, by default `PROFILE_STAGES`.
+
+        """
+        unknown = set(stages) - set(PROFILE_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages {sorted(unknown)}.")
+        self._stages = frozenset(stages)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {}
+        self._counts = collections.Counter()
+
+    def _start(
+        self,
+        stage: str,
+    ) -> None:
+        if stage not in self._stages \
+                or getattr(self._local, "profile", None) is not None:
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is active in this thread
+            return
+        self._local.profile = profile
+
+    def _stop(
+        self,
+        stage: str,
+    ) -> None:
+        profile = getattr(self._local, "profile", None)
+        if stage not in self._stages or profile is None:
+            return
+        profile.disable()
+        self._local.profile = None
+        with self._lock:
+            if stage in self._stats:
+                self._stats[stage].add(profile)
+            else:
+                self._stats[stage] = pstats.Stats(profile)
+            self._counts[stage] += 1
+
+    def before_request(self, method, url, kwargs) -> None:
+        self._start("request")
+
+    def after_response(self, method, url, res, seconds) -> None:
+        self._stop("request")
+
+    def before_parse(self, res) -> None:
+        self._start("parse")
+
+    def after_parse(self, res, obj, seconds) -> None:
+        self._stop("parse")
+
+    def before_extract(self, res, obj) -> None:
+        self._start("extract")
+
+    def after_extract(self, res, value, seconds) -> None:
+        self._stop("extract")
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """The number of profiles per stage."""
+        with self._lock:
+            return dict(self._counts)
+
+    def stats(
+        self,
+        stage: str,
+    ) -> Optional[pstats.Stats]:
+        """Get the profile of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            The stage, one of `PROFILE_STAGES`.
+
+        Returns
+        -------
+        Optional[pstats.Stats]
+            The sum of the profiles of the stage, None if it has not been
+            profiled yet.
+
+        """
+        with self._lock:
+            return self._stats.get(stage)
+
+    def dump(
+        self,
+        directory: Union[str, Path],
+    ) -> List[Path]:
+        """Write the profiles to ``<stage>.prof`` files, which can be read
+        with `pstats` or tools like snakeviz.
+
+        Parameters
+        ----------
+        directory : Union[str, Path]
+            The directory, which is created if it does not exist.
+
+        Returns
+        -------
+        List[Path]
+            The files written.
+
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        with self._lock:
+            for stage, stats in self._stats.items():
+                path = directory / f"{stage}.prof"
+                stats.dump_stats(path)
+                paths.append(path)
+        return paths
+
+    def clear(self) -> None:
+        """Remove all profiles."""
+        with self._lock:
+            self._stats.clear()
+            self._counts.clear()
+
+
+class MemoryProfiler(Hook):
+    """Measure the peak memory allocated by each parse with tracemalloc.
+
+    Memory is only traced while a response is parsed, unless tracemalloc
+    has been started elsewhere, in which case the traces are cleared before
+    each parse on Python < 3.9. Since the allocations of all threads are
+    traced, the parses should not run at the same time as other work which
+    allocates much memory, e.g. `pipeline()`.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        max_size : int
+            The maximum number of parses kept, by default 1000, the oldest
+            are dropped first.
+
+        """
+        self._local = threading.local()
+        self.peaks = collections.deque(maxlen=max_size)
+
+    def before_parse(self, res) -> None:
+        if tracemalloc.is_tracing():
+            self._local.started = False
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+                self._local.base = tracemalloc.get_traced_memory()[0]
+            else:  # Python < 3.9
+                # clearing the traces also resets the peak
+                tracemalloc.clear_traces()
+                self._local.base = 0
+        else:
+            self._local.started = True
+            self._local.base = 0
+            tracemalloc.start()
+
+    def after_parse(self, res, obj, seconds) -> None:
+        peak = tracemalloc.get_traced_memory()[1]
+        if self._local.started:
+            tracemalloc.stop()
+        if not isinstance(obj, Exception):
+            self.peaks.append((res.url, peak - self._local.base))
+
+    @property
+    def max_peak(self) -> Optional[Tuple[str, int]]:
+        """The url and the peak memory in bytes of the parse with the
+        largest peak kept, None if no response has been parsed."""
+        return max(self.peaks, key=lambda item: item[1], default=None)
+
+
+class SlowRequestSampler(Hook):
+    """Capture a sample of the requests which took longer than a
+    threshold."""
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        sample_rate: float = 1.0,
+        max_size: int = 100,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        threshold : float
+            The duration in seconds from which on a request is slow,
+            by default 1.0.
+        sample_rate : float
+            The share of the slow requests which are captured,
+            by default 1.0, i.e. all.
+        max_size : int
+            The maximum number of requests kept, by default 100, the oldest
+            are dropped first.
+        seed : Optional[int]
+            The seed of the sampling, by default None.
+
+        """
+        self._threshold = threshold
+        self._sample_rate = sample_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.samples = collections.deque(maxlen=max_size)
+
+    def after_response(self, method, url, res, seconds) -> None:
+        if seconds < self._threshold:
+            return
+        with self._lock:
+            if self._random.random() >= self._sample_rate:
+                return
+        sample = {
+            "time": time.time(),
+            "method": method,
+            "url": url,
+            "seconds": seconds,
+        }
+        if isinstance(res, requests.Response):
+            if res._content_consumed:
+                sample["response"] = ResponseRecord.from_response(res)
+            else:
+                # do not read the body of a streamed response
+                sample["response"] = ResponseRecord(
+                    res.url,
+                    res.status_code,
+                    res.elapsed.total_seconds(),
+                    int(res.headers.get("content-length") or 0),
+                    res.encoding,
+                )
+            sample["timings"] = getattr(res, "timings", None)
+        else:
+            sample["error"] = repr(res)
+        self.samples.append(sample)
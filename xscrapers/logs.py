@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the logging configuration of the
+scrapers.
+
+Importing the package neither creates the log dir nor touches the logging
+configuration, this is done by `setup_logging()` when the first scraper is
+created. The records are put on a queue by the threads which log them and
+formatted and written by a background thread, such that logging does not
+block the requests.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+from . import LOG_DIR
+
+REQUESTS_LOG = logging.getLogger("requests.packages.urllib3")
+
+FILEFORMAT = logging.Formatter(
+    "%(asctime)s:[%(threadName)-12.12s]:%(levelname)s:%(name)s:%(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+STREAMFORMAT = logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
+
+_LOCK = threading.Lock()
+_HANDLERS = []
+_LISTENER = None
+
+
+def _check_level(
+    level: Union[int, str],
+) -> int:
+    """Get the number of a level given by number or name."""
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown level {level}.")
+    return level
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Put the records on the queue as they are.
+
+    The queue is only read in this process, so unlike the base class, the
+    message is not formatted in the thread which logs it but by the
+    listener.
+    """
+
+    def prepare(
+        self,
+        record: logging.LogRecord,
+    ) -> logging.LogRecord:
+        return record
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """Write the records of the queue and set the events of the markers
+    put by `flush_logging()`."""
+
+    def handle(
+        self,
+        record: logging.LogRecord,
+    ) -> None:
+        done = getattr(record, "flushed", None)
+        if done is not None:
+            done.set()
+        else:
+            super().handle(record)
+
+
+class ScraperLog(logging.LoggerAdapter):
+    """The log of a scraper, which has its own level.
+
+    Messages below the level of the scraper are dropped right away, i.e.
+    before a record is created, such that the log calls of a scraper which
+    is not verbose cost about as much as a comparison.
+    """
+
+    def __init__(
+        self,
+        level: Union[int, str] = logging.WARNING,
+        logger: logging.Logger = REQUESTS_LOG,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        level : Union[int, str]
+            The level of the scraper, by default `logging.WARNING`.
+        logger : logging.Logger
+            The logger the records are passed to, by default `REQUESTS_LOG`.
+
+        """
+        super().__init__(logger, {})
+        self.level = _check_level(level)
+
+    def setLevel(
+        self,
+        level: Union[int, str],
+    ) -> None:
+        """Set the level of the scraper."""
+        self.level = _check_level(level)
+
+    def isEnabledFor(
+        self,
+        level: int,
+    ) -> bool:
+        return level >= self.level and self.logger.isEnabledFor(level)
+
+    def log(
+        self,
+        level: int,
+        msg: str,
+        *args,
+        **kwargs,
+    ) -> None:
+        """Log a message with %-style arguments, which are only formatted
+        when the message is written."""
+        if not self.isEnabledFor(level):
+            return
+        if kwargs:
+            # exc_info, stack_info, extra
+            self.logger.log(level, msg, *args, **kwargs)
+            return
+        # the format of the log has no file names and line numbers, so the
+        # frame of the caller is not looked up
+        self.logger.handle(self.logger.makeRecord(
+            self.logger.name, level, "", 0, msg, args, None))
+
+
+def log_dir() -> Path:
+    """Get the log dir, which is created if it does not exist.
+
+    Returns
+    -------
+    Path
+        The log dir.
+
+    """
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    return LOG_DIR
+
+
+def setup_logging() -> None:
+    """Set up the logging of the scrapers, unless this has been done.
+
+    The log messages are written to ``webscraper.log`` in the log dir, which
+    is truncated the first time, and warnings are also written to stderr.
+    The levels of the messages are set per scraper (see `ScraperLog`),
+    `REQUESTS_LOG` passes all messages on.
+    """
+    global _LISTENER
+    with _LOCK:
+        if _HANDLERS:
+            return
+        file_handler = logging.FileHandler(
+            log_dir() / "webscraper.log", mode="w", encoding="utf-8")
+        file_handler.setFormatter(FILEFORMAT)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setLevel(logging.WARNING)
+        stream_handler.setFormatter(STREAMFORMAT)
+        records = queue.SimpleQueue()
+        _LISTENER = _QueueListener(
+            records, file_handler, stream_handler,
+            respect_handler_level=True)
+        _LISTENER.start()
+        atexit.register(shutdown_logging)
+        queue_handler = _QueueHandler(records)
+        REQUESTS_LOG.setLevel(logging.DEBUG)
+        REQUESTS_LOG.addHandler(queue_handler)
+        _HANDLERS.extend([queue_handler, file_handler, stream_handler])
+
+
+def shutdown_logging() -> None:
+    """Write the pending log messages and remove the handlers set up by
+    `setup_logging()`, which is called at exit.
+    """
+    global _LISTENER
+    with _LOCK:
+        if _LISTENER is not None:
+            _LISTENER.stop()
+            _LISTENER = None
+        for handler in _HANDLERS:
+            REQUESTS_LOG.removeHandler(handler)
+            handler.close()
+        _HANDLERS.clear()
+
+
+def flush_logging(
+    timeout: Optional[float] = None,
+) -> None:
+    """Wait until the log messages logged so far have been written.
+
+    Parameters
+    ----------
+    timeout : Optional[float]
+        The maximum time to wait in seconds, by default None, i.e. without
+        limit.
+
+    """
+    with _LOCK:
+        listener = _LISTENER
+    if listener is None:
+        return
+    # the listener handles the records in order, so the marker is handled
+    # after all records logged before
+    flushed = threading.Event()
+    listener.queue.put_nowait(logging.makeLogRecord({"flushed": flushed}))
+    flushed.wait(timeout)
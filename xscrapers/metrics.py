@@ -0,0 +1,477 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the timing of the stages of requests and
+parses and their aggregation into histograms per host.
+
+The connection classes time the DNS lookup, the TCP connect, the TLS
+handshake and the time to the first byte of each request, the webscraper
+adds the download of the body, the resolution of the encoding and the parse.
+"""
+
+import bisect
+import socket
+import threading
+import time
+from socket import timeout as SocketTimeout
+from typing import Any, Dict, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util import connection
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:  # urllib3 < 2
+    NameResolutionError = None
+
+from .ratelimit import host_of
+
+# the stages of a request and its parse
+STAGES = ("dns", "connect", "tls", "ttfb", "download", "encoding", "parse")
+# the upper bounds of the buckets of the histograms of durations in seconds
+TIME_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# the upper bounds of the buckets of the histograms of sizes in bytes
+SIZE_BUCKETS = tuple(2**i for i in range(10, 26, 2))
+
+
+class _TimedConnection:
+    """Time the stages of the requests sent over a connection.
+
+    The timings of the connect are stored until the response of the first
+    request over the connection arrives, the timings are then attached to
+    the response as `_timings` along with the time its headers arrived as
+    `_headers_received`. With urllib3 < 2, this is the `http.client`
+    response wrapped by the urllib3 response as `_original_response`.
+    """
+
+    _connect_timings = None
+    _sent = None
+
+    def _new_conn(self) -> socket.socket:
+        # resolve the host and connect to its addresses one by one, as
+        # `urllib3.util.connection.create_connection()` does, but timed
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(
+                self._dns_host.strip("[]"),
+                self.port,
+                connection.allowed_gai_family(),
+                socket.SOCK_STREAM,
+            )
+        except socket.gaierror as e:
+            if NameResolutionError is None:
+                raise NewConnectionError(
+                    self, f"Failed to establish a new connection: {e}") from e
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+        err = None
+        for info in infos:
+            try:
+                sock = connection.create_connection(
+                    (info[4][0], self.port),
+                    self.timeout,
+                    source_address=self.source_address,
+                    socket_options=self.socket_options,
+                )
+            except SocketTimeout as e:
+                err = ConnectTimeoutError(
+                    self,
+                    f"Connection to {self.host} timed out. "
+                    f"(connect timeout={self.timeout})",
+                )
+                err.__cause__ = e
+            except OSError as e:
+                err = NewConnectionError(
+                    self, f"Failed to establish a new connection: {e}")
+                err.__cause__ = e
+            else:
+                self._connect_timings = {
+                    "dns": resolved - start,
+                    "connect": time.perf_counter() - resolved,
+                }
+                return sock
+        if err is None:
+            err = NewConnectionError(
+                self, f"Failed to resolve any address of {self.host}.")
+        raise err
+
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()
+        timings = self._connect_timings
+        if timings is not None and isinstance(self, HTTPSConnection):
+            timings["tls"] = time.perf_counter() - start \
+                - timings["dns"] - timings["connect"]
+
+    def request(self, *args, **kwargs) -> None:
+        super().request(*args, **kwargs)
+        self._sent = time.perf_counter()
+
+    def getresponse(self):
+        response = super().getresponse()
+        received = time.perf_counter()
+        timings = self._connect_timings or {}
+        self._connect_timings = None
+        if self._sent is not None:
+            timings["ttfb"] = received - self._sent
+        response._timings = timings
+        response._headers_received = received
+        return response
+
+
+class TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    """A http connection which times the stages of its requests."""
+
+
+class TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    """A https connection which times the stages of its requests."""
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """A `HTTPAdapter` whose connections time the stages of the requests.
+
+    Requests sent over a proxy are not timed.
+    """
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+class Histogram:
+    """A histogram with fixed buckets, as used by Prometheus."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(
+        self,
+        bounds: Sequence[float],
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        bounds : Sequence[float]
+            The sorted upper bounds of the buckets, a bucket for larger
+            values is added.
+
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(
+        self,
+        value: float,
+    ) -> None:
+        """Add a value.
+
+        Parameters
+        ----------
+        value : float
+            The value.
+
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        """Get the state of the histogram.
+
+        Returns
+        -------
+        dict
+            The number ("count") and the sum ("sum") of the values, and the
+            cumulative number of values per upper bound ("buckets").
+
+        """
+        buckets = {}
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets[bound] = total
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+def _timed(
+    raw: Any,
+) -> Any:
+    """Get the response of a connection which carries the timings of a
+    raw response, None if it has not been timed."""
+    if hasattr(raw, "_timings"):
+        return raw
+    # urllib3 < 2 wraps the response returned by the connection
+    return getattr(raw, "_original_response", None)
+
+
+def _label(
+    value: str,
+) -> str:
+    """Escape the value of a label of the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace(
+        "\n", "\\n")
+
+
+def _bound(
+    value: float,
+) -> str:
+    return "+Inf" if value == float("inf") else repr(value)
+
+
+class Metrics:
+    """The timings and sizes of the requests and parses of a webscraper,
+    aggregated into histograms per host.
+
+    Examples
+    --------
+    >>> metrics = Metrics()
+    >>> webscraper = Webscraper("lxml", metrics=metrics)
+    >>> webscraper.get(urls)
+    >>> webscraper.parse()
+    >>> metrics.snapshot()["seconds"]["example.com"]["ttfb"]["sum"]
+    >>> print(metrics.to_prometheus())
+
+    """
+
+    def __init__(
+        self,
+        time_buckets: Sequence[float] = TIME_BUCKETS,
+        size_buckets: Sequence[int] = SIZE_BUCKETS,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        time_buckets : Sequence[float]
+            The upper bounds of the buckets of durations in seconds,
+            by default `TIME_BUCKETS`.
+        size_buckets : Sequence[int]
+            The upper bounds of the buckets of sizes in bytes,
+            by default `SIZE_BUCKETS`.
+
+        """
+        self._time_buckets = tuple(time_buckets)
+        self._size_buckets = tuple(size_buckets)
+        self._lock = threading.Lock()
+        self._seconds = {}
+        self._bytes = {}
+
+    def observe(
+        self,
+        host: str,
+        stage: str,
+        seconds: float,
+    ) -> None:
+        """Add the duration of a stage.
+
+        Parameters
+        ----------
+        host : str
+            The host of the request.
+        stage : str
+            The stage, one of `STAGES`.
+        seconds : float
+            The duration in seconds.
+
+        """
+        with self._lock:
+            hist = self._seconds.setdefault(host, {}).get(stage)
+            if hist is None:
+                hist = self._seconds[host][stage] = Histogram(
+                    self._time_buckets)
+            hist.observe(seconds)
+
+    def observe_bytes(
+        self,
+        host: str,
+        kind: str,
+        size: int,
+    ) -> None:
+        """Add the size of a response.
+
+        Parameters
+        ----------
+        host : str
+            The host of the request.
+        kind : str
+            The kind of size, "body" for the decoded body and "wire" for
+            the bytes received.
+        size : int
+            The size in bytes.
+
+        """
+        with self._lock:
+            hist = self._bytes.setdefault(host, {}).get(kind)
+            if hist is None:
+                hist = self._bytes[host][kind] = Histogram(
+                    self._size_buckets)
+            hist.observe(size)
+
+    def record_response(
+        self,
+        res: requests.Response,
+        downloaded: bool = True,
+    ) -> Dict[str, float]:
+        """Add the timings and sizes of a response.
+
+        Parameters
+        ----------
+        res : requests.Response
+            The response, sent over a `TimedHTTPAdapter`.
+        downloaded : bool
+            Determine whether the body has been read, by default True.
+            Otherwise, the download and the sizes are not recorded, see
+            `record_download()`.
+
+        Returns
+        -------
+        Dict[str, float]
+            The durations of the stages of the request in seconds, which
+            are also set as `timings` attribute of the response. The
+            connect stages are only timed for new connections.
+
+        """
+        now = time.perf_counter()
+        timed = _timed(res.raw)
+        timings = dict(getattr(timed, "_timings", None) or {})
+        received = getattr(timed, "_headers_received", None)
+        if downloaded and received is not None:
+            timings["download"] = now - received
+        host = host_of(res.url)
+        for stage, seconds in timings.items():
+            self.observe(host, stage, seconds)
+        if downloaded:
+            self._observe_sizes(host, res, len(res.content or b""))
+        res.timings = timings
+        return timings
+
+    def record_download(
+        self,
+        res: requests.Response,
+        size: Optional[int] = None,
+    ) -> None:
+        """Add the download and the sizes of a streamed response once its
+        body has been read.
+
+        Parameters
+        ----------
+        res : requests.Response
+            The response of a request sent with ``stream=True``, which has
+            been recorded by `record_response()` with ``downloaded=False``.
+        size : Optional[int]
+            The number of bytes of the decoded body read, by default None,
+            i.e. unknown, in which case only the bytes received are
+            recorded.
+
+        """
+        received = getattr(_timed(res.raw), "_headers_received", None)
+        host = host_of(res.url)
+        if received is not None:
+            seconds = time.perf_counter() - received
+            self.observe(host, "download", seconds)
+            if getattr(res, "timings", None) is not None:
+                res.timings["download"] = seconds
+        self._observe_sizes(host, res, size)
+
+    def _observe_sizes(
+        self,
+        host: str,
+        res: requests.Response,
+        size: Optional[int],
+    ) -> None:
+        """Add the size of the body and the bytes received of a response."""
+        if size is not None:
+            self.observe_bytes(host, "body", size)
+        if res.raw is not None and hasattr(res.raw, "tell"):
+            self.observe_bytes(host, "wire", res.raw.tell())
+
+    def clear(self) -> None:
+        """Remove all observations."""
+        with self._lock:
+            self._seconds.clear()
+            self._bytes.clear()
+
+    def snapshot(self) -> dict:
+        """Get the state of all histograms.
+
+        Returns
+        -------
+        dict
+            The histograms of the durations by host and stage ("seconds"),
+            and of the sizes by host and kind ("bytes"), see
+            `Histogram.snapshot()`.
+
+        """
+        with self._lock:
+            return {
+                "seconds": {
+                    host: {stage: hist.snapshot()
+                           for stage, hist in stages.items()}
+                    for host, stages in self._seconds.items()
+                },
+                "bytes": {
+                    host: {kind: hist.snapshot()
+                           for kind, hist in kinds.items()}
+                    for host, kinds in self._bytes.items()
+                },
+            }
+
+    def to_prometheus(
+        self,
+        prefix: str = "xscrapers",
+    ) -> str:
+        """Export the histograms in the Prometheus text format.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix of the metric names, by default "xscrapers".
+
+        Returns
+        -------
+        str
+            The histograms ``<prefix>_stage_seconds`` with the labels host
+            and stage, and ``<prefix>_response_bytes`` with the labels host
+            and kind.
+
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, key, label, doc in [
+            ("stage_seconds", "seconds", "stage",
+             "The duration of the stages of the requests and parses."),
+            ("response_bytes", "bytes", "kind",
+             "The size of the responses."),
+        ]:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {doc}")
+            lines.append(f"# TYPE {metric} histogram")
+            for host, hists in sorted(snapshot[key].items()):
+                for value, hist in sorted(hists.items()):
+                    labels = f'host="{_label(host)}",{label}="{_label(value)}"'
+                    for bound, count in hist["buckets"].items():
+                        lines.append(
+                            f'{metric}_bucket{{{labels},le="{_bound(bound)}"}}'
+                            f" {count}")
+                    lines.append(f"{metric}_sum{{{labels}}} {hist['sum']!r}")
+                    lines.append(f"{metric}_count{{{labels}}} {hist['count']}")
+        return "\n".join(lines) + "\n"
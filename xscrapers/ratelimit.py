@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the per host limits of the webscraper.
+"""
+
+import collections
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+def host_of(
+    url: str,
+) -> str:
+    """Get the host of a url in lower case.
+
+    Parameters
+    ----------
+    url : str
+        The url.
+
+    Returns
+    -------
+    str
+        The host, an empty string if the url has none.
+
+    """
+    return urlsplit(url).hostname or ""
+
+
+class TokenBucket:
+    """A token bucket which allows `rate` requests per second on average
+    and bursts of up to `burst` requests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        rate : float
+            The number of tokens added per second.
+        burst : Optional[float]
+            The maximum number of tokens in the bucket, by default None,
+            i.e. the maximum of `rate` and 1.
+
+        """
+        self._rate = rate
+        self._burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self._burst
+        self._last = time.monotonic()
+
+    def reserve(
+        self,
+        now: Optional[float] = None,
+    ) -> float:
+        """Take a token from the bucket if one is available.
+
+        Parameters
+        ----------
+        now : Optional[float]
+            The current time of `time.monotonic()`, by default None.
+
+        Returns
+        -------
+        float
+            0 if a token was taken, otherwise the number of seconds until
+            the next token is available.
+
+        """
+        now = time.monotonic() if now is None else now
+        if now > self._last:
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+        # tolerate rounding errors of the refill
+        if self._tokens >= 1 - 1e-9:
+            self._tokens = max(self._tokens - 1, 0.0)
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+
+class HostLimiter:
+    """Limit the number of requests in flight and the request rate per host.
+
+    The limits are configured per domain with a dictionary, e.g.::
+
+        {
+            "finanzen.net": {"concurrency": 2, "rate": 1.0},
+            "example.com": {"rate": 10.0, "burst": 20},
+        }
+
+    where ``concurrency`` is the maximum number of requests in flight,
+    ``rate`` the maximum number of requests per second and ``burst`` the
+    maximum number of requests sent at once. A domain applies to the host
+    itself and all its subdomains, the longest matching domain is used.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, dict]] = None,
+        default: Optional[dict] = None,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        limits : Optional[Dict[str, dict]]
+            The limits per domain, by default None.
+        default : Optional[dict]
+            The limits of hosts without a configured domain, by default None,
+            i.e. no limits.
+
+        """
+        self._limits = {
+            domain.lower().strip("."): limit
+            for domain, limit in (limits or {}).items()
+        }
+        self._default = default or {}
+        self._lock = threading.Lock()
+        self._in_flight = collections.Counter()
+        self._buckets = {}
+
+    def limit(
+        self,
+        host: str,
+    ) -> dict:
+        """Get the limits of a host.
+
+        Parameters
+        ----------
+        host : str
+            The host in lower case.
+
+        Returns
+        -------
+        dict
+            The limits of the host.
+
+        """
+        parts = host.split(".")
+        for i in range(len(parts)):
+            limit = self._limits.get(".".join(parts[i:]))
+            if limit is not None:
+                return limit
+        return self._default
+
+    def in_flight(
+        self,
+        host: str,
+    ) -> int:
+        """The number of requests in flight to a host."""
+        return self._in_flight[host]
+
+    def try_acquire(
+        self,
+        host: str,
+        now: Optional[float] = None,
+    ) -> float:
+        """Try to acquire a request slot for a host.
+
+        Parameters
+        ----------
+        host : str
+            The host in lower case.
+        now : Optional[float]
+            The current time of `time.monotonic()`, by default None.
+
+        Returns
+        -------
+        float
+            0 if the slot was acquired, otherwise the number of seconds
+            until the rate limit allows the next request, or `math.inf` if
+            the host has too many requests in flight.
+
+        """
+        limit = self.limit(host)
+        with self._lock:
+            concurrency = limit.get("concurrency")
+            if concurrency is not None \
+                    and self._in_flight[host] >= concurrency:
+                return math.inf
+            if limit.get("rate"):
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    bucket = TokenBucket(limit["rate"], limit.get("burst"))
+                    self._buckets[host] = bucket
+                delay = bucket.reserve(now)
+                if delay:
+                    return delay
+            self._in_flight[host] += 1
+            return 0.0
+
+    def release(
+        self,
+        host: str,
+    ) -> None:
+        """Release a request slot acquired with `try_acquire()`."""
+        with self._lock:
+            self._in_flight[host] -= 1
+            if not self._in_flight[host]:
+                del self._in_flight[host]
+
+
+class HostQueue:
+    """A queue of urls which are handed out round-robin over the hosts,
+    skipping hosts which have reached their limits.
+    """
+
+    def __init__(self) -> None:
+        self._queues = collections.OrderedDict()
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(
+        self,
+        url: str,
+    ) -> None:
+        """Add a url to the queue of its host."""
+        host = host_of(url)
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = self._queues[host] = collections.deque()
+        queue.append(url)
+        self._len += 1
+
+    def pop(
+        self,
+        limiter: HostLimiter,
+        now: Optional[float] = None,
+    ) -> Tuple[Optional[str], float]:
+        """Get the next url of which the host has a free request slot.
+
+        Parameters
+        ----------
+        limiter : HostLimiter
+            The limiter from which the request slot is acquired.
+        now : Optional[float]
+            The current time of `time.monotonic()`, by default None.
+
+        Returns
+        -------
+        Tuple[Optional[str], float]
+            The url and 0, or None and the number of seconds until the next
+            request slot might be free (`math.inf` if no slot becomes free
+            before a request finishes).
+
+        """
+        now = time.monotonic() if now is None else now
+        delay = math.inf
+        for host in list(self._queues):
+            wait = limiter.try_acquire(host, now)
+            if wait:
+                delay = min(delay, wait)
+                continue
+            queue = self._queues.pop(host)
+            url = queue.popleft()
+            self._len -= 1
+            if queue:
+                # move the host to the end to hand out the urls round-robin
+                self._queues[host] = queue
+            return url, 0.0
+        return None, delay
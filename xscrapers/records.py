@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the compact records which replace the
+responses of the webscraper in lean mode.
+"""
+
+from typing import Optional
+
+import requests
+
+
+class ResponseRecord:
+    """The metadata of a response without its headers and body.
+
+    A record takes about 100 bytes (plus the url), while a response keeps
+    its whole body, headers and request.
+    """
+
+    __slots__ = ("url", "status_code", "elapsed", "size", "encoding")
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        elapsed: float,
+        size: int,
+        encoding: Optional[str],
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        url : str
+            The url of the response, after redirects.
+        status_code : int
+            The status code of the response.
+        elapsed : float
+            The time between sending the request and receiving the headers
+            of the response in seconds.
+        size : int
+            The size of the body in bytes.
+        encoding : Optional[str]
+            The encoding of the body.
+
+        """
+        self.url = url
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.size = size
+        self.encoding = encoding
+
+    @classmethod
+    def from_response(
+        cls,
+        res: requests.Response,
+    ) -> "ResponseRecord":
+        """Create the record of a response.
+
+        Parameters
+        ----------
+        res : requests.Response
+            The response, of which the body has been read.
+
+        Returns
+        -------
+        ResponseRecord
+            The record of the response.
+
+        """
+        return cls(
+            res.url,
+            res.status_code,
+            res.elapsed.total_seconds(),
+            len(res.content or b""),
+            res.encoding,
+        )
+
+    @property
+    def ok(self) -> bool:
+        """True if the status code is less than 400."""
+        return self.status_code < 400
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} [{self.status_code}] {self.url}>"
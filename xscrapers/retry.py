@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the retry policy and the circuit breaker
+of the webscraper.
+"""
+
+import random
+import threading
+import time
+from typing import Iterable, Optional, Union
+
+import requests
+
+from .cache import _parse_date
+
+# status codes which indicate a transient failure of the host
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+RESULT = Union[requests.Response, requests.exceptions.RequestException]
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised if no request is sent since the circuit of the host is open.
+    """
+
+
+def is_transient(
+    res: RESULT,
+    status_codes: Iterable[int] = RETRY_STATUS_CODES,
+) -> bool:
+    """Determine whether a request failed due to a transient failure.
+
+    Parameters
+    ----------
+    res : RESULT
+        The response or the exception thrown.
+    status_codes : Iterable[int]
+        The status codes of transient failures,
+        by default `RETRY_STATUS_CODES`.
+
+    Returns
+    -------
+    bool
+        True for connection errors, timeouts, broken connections and
+        responses with one of the `status_codes`.
+
+    """
+    if isinstance(res, requests.exceptions.RequestException):
+        if isinstance(res, (CircuitOpenError, requests.exceptions.SSLError)):
+            return False
+        return isinstance(res, (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ))
+    return res.status_code in status_codes
+
+
+class RetryPolicy:
+    """Retry transiently failed GET requests with exponential backoff.
+
+    The delay before the ``n``-th retry (starting at 0) is drawn uniformly
+    from ``[0, min(max_backoff, backoff * 2**n)]`` ("full jitter"), such
+    that retries of many failed requests are spread out. If the response
+    has a `Retry-After` header, the delay given by the host is used instead.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 60.0,
+        jitter: bool = True,
+        status_codes: Iterable[int] = RETRY_STATUS_CODES,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        max_retries : int
+            The maximum number of retries per url, by default 3.
+        backoff : float
+            The delay before the first retry in seconds, by default 0.5.
+        max_backoff : float
+            The maximum delay in seconds, by default 60. This also caps the
+            delay given by a `Retry-After` header.
+        jitter : bool
+            Determine whether the delay is randomized, by default True.
+        status_codes : Iterable[int]
+            The status codes which are retried,
+            by default `RETRY_STATUS_CODES`.
+
+        """
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._status_codes = frozenset(status_codes)
+
+    def should_retry(
+        self,
+        res: RESULT,
+        attempt: int,
+    ) -> bool:
+        """Determine whether a request should be retried.
+
+        Parameters
+        ----------
+        res : RESULT
+            The response or the exception thrown.
+        attempt : int
+            The number of retries made so far.
+
+        Returns
+        -------
+        bool
+            True if the failure is transient and retries are left.
+
+        """
+        return attempt < self._max_retries \
+            and is_transient(res, self._status_codes)
+
+    def delay(
+        self,
+        res: RESULT,
+        attempt: int,
+    ) -> float:
+        """Determine the delay before the next retry.
+
+        Parameters
+        ----------
+        res : RESULT
+            The response or the exception thrown.
+        attempt : int
+            The number of retries made so far.
+
+        Returns
+        -------
+        float
+            The delay in seconds.
+
+        """
+        retry_after = _retry_after(res)
+        if retry_after is not None:
+            return min(retry_after, self._max_backoff)
+        delay = min(self._max_backoff, self._backoff * 2**attempt)
+        if self._jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+
+def _retry_after(
+    res: RESULT,
+) -> Optional[float]:
+    """Get the delay in seconds of the `Retry-After` header of a response.
+    """
+    if not isinstance(res, requests.Response):
+        return None
+    value = res.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        date = _parse_date(value)
+        if date is None:
+            return None
+        return max(date - time.time(), 0.0)
+
+
+class CircuitBreaker:
+    """Stop sending requests to hosts which keep failing.
+
+    After `failure_threshold` consecutive transient failures of a host, the
+    circuit of the host opens and requests to it fail immediately with a
+    `CircuitOpenError`. After `reset_timeout` seconds a single trial request
+    is let through; if it succeeds, the circuit closes again, otherwise it
+    stays open for another `reset_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        failure_threshold : int
+            The number of consecutive failures after which the circuit of a
+            host opens, by default 5.
+        reset_timeout : float
+            The number of seconds after which a trial request is sent to a
+            host with an open circuit, by default 30.
+
+        """
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened = {}
+        self._trials = set()
+
+    def is_open(
+        self,
+        host: str,
+    ) -> bool:
+        """Determine whether requests to a host are rejected right now.
+
+        Parameters
+        ----------
+        host : str
+            The host in lower case.
+
+        Returns
+        -------
+        bool
+            True if the circuit of the host is open and no trial request
+            can be sent.
+
+        """
+        opened = self._opened.get(host)
+        if opened is None:
+            return False
+        return host in self._trials \
+            or time.monotonic() - opened < self._reset_timeout
+
+    def allow(
+        self,
+        host: str,
+    ) -> bool:
+        """Determine whether a request to a host may be sent.
+
+        Parameters
+        ----------
+        host : str
+            The host in lower case.
+
+        Returns
+        -------
+        bool
+            True if the circuit is closed or the request is the trial
+            request of an open circuit.
+
+        """
+        with self._lock:
+            if host not in self._opened:
+                return True
+            if self.is_open(host):
+                return False
+            self._trials.add(host)
+            return True
+
+    def record(
+        self,
+        host: str,
+        failed: bool,
+    ) -> None:
+        """Record the result of a request to a host.
+
+        Parameters
+        ----------
+        host : str
+            The host in lower case.
+        failed : bool
+            Determine whether the request failed transiently.
+
+        """
+        with self._lock:
+            trial = host in self._trials
+            self._trials.discard(host)
+            if not failed:
+                self._failures.pop(host, None)
+                self._opened.pop(host, None)
+                return
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if trial or self._failures[host] >= self._failure_threshold:
+                self._opened[host] = time.monotonic()
@@ -6,6 +6,14 @@ given scraper package.
 
 __all__ = []
 
+from .crawler import Crawler
+from .links import canonicalize_url, extract_links
 from .parser import Parser
+from .schema import Field, Schema
+from .tables import read_tables, table_to_frame
 
+__all__.extend(crawler.__all__)
+__all__.extend(links.__all__)
 __all__.extend(parser.__all__)
+__all__.extend(schema.__all__)
+__all__.extend(tables.__all__)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the crawler.
+"""
+
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from ..ratelimit import host_of
+from ..webscraper import RESPONSE_OBJECT, Webscraper
+from .frontier import Frontier, SeenSet
+from .links import canonicalize_url, extract_links
+
+__all__ = [
+    "Crawler",
+]
+
+
+class Crawler(Webscraper):
+    """The Crawler class.
+
+    Starting from seed urls, the crawler loads the pages and follows the
+    links found on them.
+    """
+
+    def __init__(
+        self,
+        parser: str,
+        verbose: bool = False,
+        max_depth: int = 2,
+        allowed_domains: Optional[List[str]] = None,
+        max_pages: Optional[int] = None,
+        priority: Optional[Callable[[str, int], float]] = None,
+        capacity: int = 10_000_000,
+        **kwargs: dict,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        parser : str
+            The parser of the ``Webscraper``, the links are extracted with
+            `extract_links()`.
+        verbose : bool
+            Determine whether the output should be written to the log file,
+            by default False.
+        max_depth : int
+            The maximum number of links followed from a seed url,
+            by default 2.
+        allowed_domains : Optional[List[str]]
+            The domains of which links are followed (including subdomains),
+            by default None, i.e. the hosts of the seed urls.
+        max_pages : Optional[int]
+            The maximum number of pages loaded per crawl,
+            by default None, i.e. no limit.
+        priority : Optional[Callable[[str, int], float]]
+            A function of the url and its depth, urls with a lower value are
+            loaded first, by default None, i.e. breadth-first.
+        capacity : int
+            The expected number of urls seen per crawl, used to size the
+            `SeenSet`, by default 10 million.
+
+        Other Parameters
+        ----------------
+        Additional keyword arguments are passed to ``Webscraper``.
+
+        """
+        super().__init__(parser, verbose=verbose, **kwargs)
+        self._max_depth = max_depth
+        self._allowed_domains = allowed_domains
+        self._max_pages = max_pages
+        self._priority = priority
+        self._capacity = capacity
+
+    def crawl(
+        self,
+        seeds: Iterable[str],
+    ) -> Iterator[Tuple[str, RESPONSE_OBJECT]]:
+        """Crawl the pages reachable from the seed urls.
+
+        Parameters
+        ----------
+        seeds : Iterable[str]
+            The urls from which the crawl starts.
+
+        Yields
+        ------
+        Tuple[str, RESPONSE_OBJECT]
+            The url and its response object, or the error thrown,
+            in the order in which the requests complete.
+
+        Notes
+        -----
+        The links of a page are added to the frontier as soon as its
+        response arrives, while the other requests are in flight. Thus,
+        the request slots stay filled instead of crawling in waves of one
+        depth after another. Each url is loaded at most once, urls are
+        compared in their canonical form (see `canonicalize_url()`).
+
+        """
+        seeds = [canonicalize_url(seed) for seed in seeds]
+        domains = self._allowed_domains or [host_of(seed) for seed in seeds]
+        self._domains = {domain.lower().strip(".") for domain in domains}
+        frontier = Frontier(self._priority)
+        seen = SeenSet(self._capacity)
+        queued = 0
+        for seed in seeds:
+            if seen.add(seed):
+                frontier.push(seed, 0)
+                queued += 1
+        for url, res in self.iter_get(frontier):
+            depth = frontier.depth(url)
+            if depth < self._max_depth and _is_html(res):
+                for link in self._links(res):
+                    if self._max_pages is not None \
+                            and queued >= self._max_pages:
+                        break
+                    if self._allowed(link) and seen.add(link):
+                        frontier.push(link, depth + 1)
+                        queued += 1
+            yield url, res
+
+    def _allowed(
+        self,
+        url: str,
+    ) -> bool:
+        """Determine whether a link should be followed."""
+        if not url.startswith(("http://", "https://")):
+            return False
+        host = host_of(url)
+        return any(host == domain or host.endswith("." + domain)
+                   for domain in self._domains)
+
+    def _links(
+        self,
+        res: requests.Response,
+    ) -> List[str]:
+        """Get the canonical absolute urls of all links of a page."""
+        return extract_links(
+            res.content, res.url, self._resolve_encoding(res))
+
+
+def _is_html(
+    res: RESPONSE_OBJECT,
+) -> bool:
+    """Determine whether a response is a html page."""
+    return isinstance(res, requests.Response) and res.ok \
+        and "html" in res.headers.get("content-type", "html")
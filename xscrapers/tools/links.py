@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the extraction of links from raw html
+without building a document tree.
+"""
+
+import functools
+from html.parser import HTMLParser
+from typing import List, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover
+    etree = None
+
+__all__ = [
+    "canonicalize_url",
+    "extract_links",
+]
+
+DEFAULT_PORTS = {
+    "http": 80,
+    "https": 443,
+}
+
+
+@functools.lru_cache(maxsize=2**16)
+def canonicalize_url(
+    url: str,
+) -> str:
+    """Bring a url into a canonical form.
+
+    Parameters
+    ----------
+    url : str
+        An absolute url.
+
+    Returns
+    -------
+    str
+        The url with lower case scheme and host, without default port and
+        fragment, with the path "/" if empty, and with sorted query
+        parameters.
+
+    Raises
+    ------
+    ValueError
+        If the url is malformed, e.g. has an invalid port or an unclosed
+        IPv6 address.
+
+    Notes
+    -----
+    The query parameters are sorted as they are, i.e. without decoding and
+    encoding them again. The results are cached, since the same links
+    (e.g. of the navigation) appear on many pages of a site.
+
+    """
+    split = urlsplit(url.strip())
+    scheme = split.scheme.lower()
+    host = split.hostname or ""
+    if ":" in host:
+        # an IPv6 address
+        host = f"[{host}]"
+    if split.port is not None and split.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{split.port}"
+    if split.username is not None:
+        userinfo = split.username
+        if split.password is not None:
+            userinfo += f":{split.password}"
+        host = f"{userinfo}@{host}"
+    query = split.query
+    if "&" in query:
+        query = "&".join(sorted(param for param in query.split("&") if param))
+    return urlunsplit((scheme, host, split.path or "/", query, ""))
+
+
+class _LinkTarget:
+    """A parser target collecting the href of <a> and <base> elements."""
+
+    def __init__(self) -> None:
+        self.base = None
+        self.hrefs = []
+
+    def start(self, tag: str, attrib: dict) -> None:
+        if tag == "a":
+            href = attrib.get("href")
+            if href:
+                self.hrefs.append(href)
+        elif tag == "base" and self.base is None:
+            self.base = attrib.get("href")
+
+    def close(self) -> "_LinkTarget":
+        return self
+
+
+class _LinkLexer(HTMLParser):
+    """The fallback of `_LinkTarget` if lxml is not installed."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.target = _LinkTarget()
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in ("a", "base"):
+            self.target.start(tag, dict(attrs))
+
+
+def extract_links(
+    content: bytes,
+    base_url: str,
+    encoding: Optional[str] = None,
+) -> List[str]:
+    """Extract the links of all <a></a> elements of a html page.
+
+    Parameters
+    ----------
+    content : bytes
+        The raw content of the page.
+    base_url : str
+        The url of the page, against which relative links are resolved.
+    encoding : Optional[str]
+        The encoding of the page, by default None, i.e. it is detected
+        by the parser.
+
+    Returns
+    -------
+    List[str]
+        The canonical (see `canonicalize_url()`) absolute http(s) urls
+        in the order of their first appearance on the page.
+
+    Notes
+    -----
+    The page is scanned by the event based parser of lxml (or the html
+    lexer of the standard library if lxml is not installed), only the start
+    tags of <a> and <base> elements are looked at and no document tree is
+    built. A <base href="..."> element of the page takes precedence over
+    `base_url`. Malformed links (see `canonicalize_url()`) are skipped.
+
+    """
+    if etree is not None:
+        parser = etree.HTMLParser(target=_LinkTarget(), encoding=encoding)
+        parser.feed(content)
+        target = parser.close()
+    else:
+        lexer = _LinkLexer()
+        lexer.feed(content.decode(encoding or "utf-8", errors="replace"))
+        lexer.close()
+        target = lexer.target
+    if target.base:
+        try:
+            base_url = urljoin(base_url, target.base)
+        except ValueError:
+            pass
+    split = urlsplit(base_url)
+    origin = f"{split.scheme}://{split.netloc}"
+    links = {}
+    # join every distinct href only once
+    for href in dict.fromkeys(target.hrefs):
+        href = href.strip()
+        try:
+            if href.startswith("/") and not href.startswith("//") \
+                    and "/." not in href:
+                # skip `urljoin()` for the common absolute paths
+                url = origin + href
+            else:
+                url = urljoin(base_url, href)
+            if url.startswith(("http://", "https://")):
+                links.setdefault(canonicalize_url(url))
+        except ValueError:
+            # a single malformed link must not fail the whole page
+            continue
+    return list(links)
@@ -3,12 +3,19 @@
 __doc__ = """
 """
 
-from typing import Callable, Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, List, Union
+from urllib.parse import urljoin
 
-import pandas as pd
+import requests
 from bs4 import BeautifulSoup, Tag
 
 from ..webscraper import DATA_OBJECT, Webscraper
+from .links import extract_links
+from .schema import Schema
+from .tables import table_to_frame
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
 
 __all__ = [
     "Parser",
@@ -17,7 +24,7 @@ __all__ = [
 
 def _get_tables(
     tables: list,
-) -> List[pd.DataFrame]:
+) -> "List[pd.DataFrame]":
     """Get <table></table> elements as dataframe.
 
     Parameters
@@ -30,14 +37,19 @@ def _get_tables(
     List[pd.DataFrame]
         A list of pandas DataFrames containing the tables.
 
+    Notes
+    -----
+    The DataFrames are built directly from the parsed elements, see the
+    documentation for `table_to_frame()`.
+
     """
     df = []
     for table in tables:
-        _df = pd.read_html(
-            table.prettify(),
-            flavor="bs4",
-        )[0]
-        df.append(_df)
+        try:
+            df.append(table_to_frame(table))
+        except ValueError:
+            # skip tables without rows
+            continue
     return df
 
 
@@ -61,18 +73,13 @@ def _get_href(
 
     Notes
     -----
-    If the href element is not a valid url, then the href element is
-    appended to the given url.
+    Relative href elements are resolved against the given url.
 
     """
     href = []
     for _a in a:
         # if no href attribute is given in the tag, the initial url is returned
-        _href = _a.get("href", url)
-        if "https" in _href:
-            href.append(_href)
-        else:
-            href.append(url + _href)
+        href.append(urljoin(url, _a.get("href", url)))
     return href
 
 
@@ -81,9 +88,23 @@ class Parser(Webscraper):
     def __init__(
         self,
         parser: str,
-        verbose: bool = False
+        verbose: bool = False,
+        **kwargs: dict,
     ) -> None:
-        super().__init__(parser, verbose=verbose)
+        """Init the class.
+
+        See the documentation for ``Webscraper`` for the parameters,
+        additional keyword arguments are passed to ``Webscraper``.
+
+        Notes
+        -----
+        Pass a ``DocumentCache`` as ``doc_cache`` to keep the parsed
+        documents, such that extracting elements multiple times from the
+        same responses parses them only once. The cache holds up to its
+        ``max_memory`` of parsed documents, which stay alive as long as the
+        parser.
+        """
+        super().__init__(parser, verbose=verbose, **kwargs)
 
     def _scrape(
         self,
@@ -91,6 +112,7 @@ class Parser(Webscraper):
         element: DATA_OBJECT,
         fun: Callable,
         *args,
+        with_url: bool = False,
     ) -> Dict[str, list]:
         """Get all html elements defined by `tag`.
 
@@ -109,6 +131,9 @@ class Parser(Webscraper):
             The function which loads the element to a specific data type.
         args : tuple
             Additional arguments passed to ``fun``.
+        with_url : bool
+            Determine whether the url of each element is passed to ``fun``
+            as last argument, by default False.
 
         Returns
         -------
@@ -131,19 +156,18 @@ class Parser(Webscraper):
         if not element:
             self.parse(name=tag)
             element = self._data
+        urls = self._url if isinstance(self._url, list) else [self._url]
         if isinstance(element, list):
-            if len(element) == 1:
-                html_ele = element[0](tag)
-                data[self._url] = fun(html_ele, *args)
-            else:
-                for idx, ele in enumerate(element):
-                    # catch if there is a bs4 Tag or ResultSet returned
-                    html_ele = ele(tag) if isinstance(
-                        ele, Tag) else ele[0](tag)
-                    data[self._url[idx]] = fun(html_ele, *args)
+            for idx, ele in enumerate(element):
+                # catch if there is a bs4 Tag or ResultSet returned
+                html_ele = ele(tag) if isinstance(
+                    ele, Tag) else ele[0](tag)
+                _args = args + (urls[idx],) if with_url else args
+                data[urls[idx]] = fun(html_ele, *_args)
         elif isinstance(element, BeautifulSoup):
             html_ele = element(tag)
-            data[self._url] = fun(html_ele, *args)
+            _args = args + (urls[0],) if with_url else args
+            data[urls[0]] = fun(html_ele, *_args)
         else:
             raise AssertionError(
                 f"Parameter element is not of type {list} nor of type {BeautifulSoup}, it is of type {type(element)}!")
@@ -159,13 +183,101 @@ class Parser(Webscraper):
         additional parameters.
         """
         tag = "a"
-        data = self._scrape(tag, element, _get_href, self._url)
+        data = self._scrape(tag, element, _get_href, with_url=True)
         return data
 
+    def links(self) -> Dict[str, List[str]]:
+        """Get the links of all <a></a> elements of the loaded url(s).
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            Return a dictionary containing the url as key and the
+            canonical absolute http(s) urls found on its page, without
+            duplicates.
+
+        Raises
+        ------
+        AssertionError
+            If `self.get` has not been called before calling this method.
+
+        Notes
+        -----
+        Unlike `href()`, the links are extracted from the raw content of the
+        responses (see `extract_links()`) without building a BeautifulSoup
+        document, which is much faster for large numbers of pages.
+
+        """
+        if not self._http_request["GET"]:
+            raise AssertionError(
+                f"Expected {self.get} to be called before calling {self.links}.")
+        self._check_released(self.links)
+        urls = self._url if isinstance(self._url, list) else [self._url]
+        responses = self._res if isinstance(self._res, list) else [self._res]
+        data = {}
+        for url, res in zip(urls, responses):
+            if isinstance(res, requests.Response):
+                # resolve the links against the url after redirects
+                data[url] = extract_links(
+                    res.content, res.url, self._resolve_encoding(res))
+        self._release()
+        return data
+
+    def extract(
+        self,
+        schema: Schema,
+        columns: bool = False,
+    ) -> Union[Dict[str, dict], Dict[str, list]]:
+        """Extract the fields of a schema from the loaded url(s).
+
+        Parameters
+        ----------
+        schema : Schema
+            The schema of the fields to be extracted.
+        columns : bool
+            Determine whether the values are returned column by column,
+            by default False.
+
+        Returns
+        -------
+        Union[Dict[str, dict], Dict[str, list]]
+            Return a dictionary containing the url as key and the values by
+            field name, or if `columns` is True, the field names as keys
+            and the values of all urls in the order of the `url` attribute.
+
+        Raises
+        ------
+        AssertionError
+            If `self.get` has not been called before calling this method.
+
+        Notes
+        -----
+        The fields are extracted from the raw content of the responses
+        (see `Schema.extract()`), the `data` attribute is neither used nor
+        set.
+
+        """
+        if not self._http_request["GET"]:
+            raise AssertionError(
+                f"Expected {self.get} to be called before calling {self.extract}.")
+        self._check_released(self.extract)
+        urls = self._url if isinstance(self._url, list) else [self._url]
+        responses = self._res if isinstance(self._res, list) else [self._res]
+        # skip the error of a failed single url request
+        loaded = [(url, res) for url, res in zip(urls, responses)
+                  if isinstance(res, requests.Response)]
+        urls = [url for url, _ in loaded]
+        values = schema.extract_many(
+            [res for _, res in loaded], columns=columns)
+        self._release()
+        if columns:
+            return values
+        return dict(zip(urls, values))
+
     def table(
         self,
         element: DATA_OBJECT,
-    ) -> Dict[str, List[pd.DataFrame]]:
+    ) -> "Dict[str, List[pd.DataFrame]]":
         """Get all <table></table> elements of the given url(s) as
         DataFrame(s).
 
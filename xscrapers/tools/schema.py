@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements declarative extraction schemas, which
+extract the same fields from many html pages.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from ..webscraper import _http_encoding
+
+try:
+    from lxml import etree, html
+except ImportError:  # pragma: no cover
+    etree = html = None
+
+try:
+    from cssselect import HTMLTranslator
+except ImportError:  # pragma: no cover
+    HTMLTranslator = None
+
+__all__ = [
+    "Field",
+    "Schema",
+]
+
+BACKENDS = ("lxml", "bs4")
+
+# the leftmost compound selector made of a tag name, ids and classes
+_RE_COMPOUND = re.compile(r"\s*([a-zA-Z][\w-]*|\*)?((?:[#.][\w-]+)*)")
+
+
+class Field:
+    """A field of a `Schema`.
+
+    A field selects elements of a page by a CSS selector or an XPath
+    expression and extracts their text or an attribute.
+    """
+
+    def __init__(
+        self,
+        selector: str,
+        attr: Optional[str] = None,
+        many: bool = False,
+        xpath: bool = False,
+        convert: Optional[Callable[[str], Any]] = None,
+        default: Any = None,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        selector : str
+            The CSS selector, or the XPath expression if `xpath` is True.
+        attr : Optional[str]
+            The attribute which is extracted, by default None, i.e. the
+            stripped text of the element.
+        many : bool
+            Determine whether the values of all selected elements are
+            extracted as list, by default False, i.e. only the value of the
+            first element.
+        xpath : bool
+            Determine whether `selector` is an XPath expression,
+            by default False.
+        convert : Optional[Callable[[str], Any]]
+            A function applied on each value, by default None.
+        default : Any
+            The value if no element is selected, by default None. Not used
+            if `many` is True.
+
+        """
+        self.selector = selector
+        self.attr = attr
+        self.many = many
+        self.xpath = xpath
+        self.convert = convert
+        self.default = default
+
+    def __repr__(self) -> str:
+        kind = "xpath" if self.xpath else "css"
+        return f"{type(self).__name__}({kind}={self.selector!r}, " \
+            f"attr={self.attr!r}, many={self.many})"
+
+    def _values(
+        self,
+        elements: list,
+        text: Callable[[Any], str],
+    ) -> Any:
+        """Extract the value(s) of the selected elements."""
+        if not self.many:
+            elements = elements[:1]
+        values = []
+        for ele in elements:
+            if isinstance(ele, (str, float, bool)):
+                # the result of an XPath expression which is no element
+                value = ele
+            elif self.attr is None:
+                value = text(ele).strip()
+            else:
+                value = ele.get(self.attr)
+                if isinstance(value, list):
+                    # bs4 splits multi-valued attributes like class
+                    value = " ".join(value)
+            if self.convert is not None and value is not None:
+                value = self.convert(value)
+            values.append(value)
+        if self.many:
+            return values
+        return values[0] if values else self.default
+
+
+class Schema:
+    """A set of named fields which are extracted from html pages.
+
+    The selectors are compiled once when the schema is created, e.g.::
+
+        schema = Schema({
+            "name": "h1.name",
+            "price": Field("span.price", convert=float),
+            "links": Field("a", attr="href", many=True),
+            "title": Field("//title/text()", xpath=True),
+        })
+        records = schema.extract_many(responses)
+
+    where a string is short for ``Field(string)``.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Union[str, Field]],
+        backend: Optional[str] = None,
+        parser: str = "html.parser",
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        fields : Dict[str, Union[str, Field]]
+            The fields by name, a string is used as CSS selector of a field.
+        backend : Optional[str]
+            The backend which parses the pages and selects the elements,
+            either "lxml" or "bs4", by default None, i.e. "lxml" if lxml and
+            cssselect are installed, otherwise "bs4".
+        parser : str
+            The parser of BeautifulSoup used by the "bs4" backend,
+            by default "html.parser".
+
+        Raises
+        ------
+        ValueError
+            If the backend is unknown, or the "bs4" backend is used with an
+            XPath field.
+        ImportError
+            If the "lxml" backend is used but lxml (or cssselect for CSS
+            selectors) is not installed.
+
+        """
+        self._fields = {
+            name: field if isinstance(field, Field) else Field(field)
+            for name, field in fields.items()
+        }
+        if backend is None:
+            backend = "lxml" if etree is not None \
+                and HTMLTranslator is not None else "bs4"
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Expected backend to be one of {BACKENDS}, got {backend}.")
+        self._backend = backend
+        self._parser = parser
+        if backend == "lxml":
+            self._compiled = {
+                name: self._compile(field)
+                for name, field in self._fields.items()
+            }
+        else:
+            xpath = [name for name, field in self._fields.items()
+                     if field.xpath]
+            if xpath:
+                raise ValueError(
+                    f"The bs4 backend does not support the XPath fields {xpath}.")
+            self._compiled = None
+        self._strainer = self._derive_strainer()
+
+    @property
+    def backend(self) -> str:
+        """The backend which parses the pages."""
+        return self._backend
+
+    @property
+    def fields(self) -> Dict[str, Field]:
+        """The fields by name."""
+        return dict(self._fields)
+
+    @property
+    def strainer(self) -> Optional[SoupStrainer]:
+        """A `SoupStrainer` which keeps only the parts of a page needed by
+        the fields, None if the whole page is needed."""
+        return self._strainer
+
+    @staticmethod
+    def _compile(
+        field: Field,
+    ) -> "etree.XPath":
+        """Compile the selector of a field to an XPath object of lxml."""
+        if etree is None:
+            raise ImportError("The lxml backend requires lxml.")
+        if field.xpath:
+            return etree.XPath(field.selector)
+        if HTMLTranslator is None:
+            raise ImportError(
+                "CSS selectors of the lxml backend require cssselect.")
+        return etree.XPath(HTMLTranslator().css_to_xpath(field.selector))
+
+    def _derive_strainer(self) -> Optional[SoupStrainer]:
+        """Derive a `SoupStrainer` from the CSS selectors of the fields.
+
+        Each selector only selects elements within the elements matched by
+        its leftmost compound selector (e.g. ``div.price`` of
+        ``div.price > span``), so only these elements and their
+        descendants have to be parsed. If a selector is not of this form
+        (sibling combinators, pseudo classes, XPath), the whole page is
+        needed.
+        """
+        compounds = []
+        for field in self._fields.values():
+            selector = field.selector
+            if field.xpath or any(char in selector for char in "+~:,"):
+                return None
+            match = _RE_COMPOUND.match(selector)
+            tag, rest = match.group(1), match.group(2)
+            tag = None if tag in (None, "*") else tag.lower()
+            ids = {part[1:] for part in re.findall(r"#[\w-]+", rest)}
+            classes = {part[1:] for part in re.findall(r"\.[\w-]+", rest)}
+            if tag is None and not ids and not classes:
+                return None
+            compounds.append((tag, ids, classes))
+
+        def match(name: str, attrs: dict) -> bool:
+            for tag, ids, classes in compounds:
+                if tag is not None and name != tag:
+                    continue
+                if ids and attrs.get("id") not in ids:
+                    continue
+                if classes:
+                    value = attrs.get("class") or ""
+                    if isinstance(value, str):
+                        value = value.split()
+                    if not classes.issubset(value):
+                        continue
+                return True
+            return False
+
+        return SoupStrainer(match)
+
+    def extract(
+        self,
+        content: Union[bytes, requests.Response],
+        encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Extract the fields of a page.
+
+        Parameters
+        ----------
+        content : Union[bytes, requests.Response]
+            The raw content of the page, or its response.
+        encoding : Optional[str]
+            The encoding of the page, by default None, i.e. the encoding of
+            the content-type header of the response, otherwise it is
+            detected by the parser.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The values by field name.
+
+        """
+        if isinstance(content, requests.Response):
+            encoding = encoding or _http_encoding(content)
+            content = content.content
+        if self._backend == "lxml":
+            return self._extract_lxml(content, encoding)
+        return self._extract_bs4(content, encoding)
+
+    def _extract_lxml(
+        self,
+        content: bytes,
+        encoding: Optional[str],
+    ) -> Dict[str, Any]:
+        try:
+            root = html.document_fromstring(
+                content, parser=html.HTMLParser(encoding=encoding))
+        except etree.ParserError:
+            # the document is empty
+            root = None
+        values = {}
+        for name, field in self._fields.items():
+            elements = [] if root is None else self._compiled[name](root)
+            if not isinstance(elements, list):
+                # an XPath expression evaluating to a number or boolean
+                elements = [elements]
+            values[name] = field._values(
+                elements, html.HtmlElement.text_content)
+        return values
+
+    def _extract_bs4(
+        self,
+        content: bytes,
+        encoding: Optional[str],
+    ) -> Dict[str, Any]:
+        soup = BeautifulSoup(
+            content,
+            self._parser,
+            from_encoding=encoding,
+            parse_only=self._strainer,
+        )
+        return {
+            name: field._values(
+                soup.select(field.selector, limit=0 if field.many else 1),
+                Tag.get_text,
+            )
+            for name, field in self._fields.items()
+        }
+
+    def extract_many(
+        self,
+        contents: Iterable[Union[bytes, requests.Response]],
+        columns: bool = False,
+    ) -> Union[List[Dict[str, Any]], Dict[str, list]]:
+        """Extract the fields of many pages.
+
+        Parameters
+        ----------
+        contents : Iterable[Union[bytes, requests.Response]]
+            The raw contents of the pages, or their responses.
+        columns : bool
+            Determine whether the values are returned column by column,
+            by default False, i.e. record by record.
+
+        Returns
+        -------
+        Union[List[Dict[str, Any]], Dict[str, list]]
+            A record (the values by field name) per page, or if `columns`
+            is True, the list of values of all pages by field name.
+
+        """
+        records = [self.extract(content) for content in contents]
+        if not columns:
+            return records
+        return {
+            name: [record[name] for record in records]
+            for name in self._fields
+        }
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the conversion of html tables to
+DataFrames directly from the parsed table elements.
+"""
+
+import re
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from bs4 import Tag
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+try:
+    from lxml import etree, html
+except ImportError:  # pragma: no cover
+    etree = html = None
+
+__all__ = [
+    "read_tables",
+    "table_to_frame",
+]
+
+# a cell as its text, rowspan, colspan and whether it is a <th></th> element
+CELL = Tuple[str, int, int, bool]
+
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def _text(
+    text: str,
+) -> str:
+    """Collapse line breaks and repeated whitespace of a cell text."""
+    return _RE_WHITESPACE.sub(" ", text).strip()
+
+
+def _span(
+    value: Optional[str],
+) -> int:
+    """Get the value of a rowspan or colspan attribute."""
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _bs4_sections(
+    table: Tag,
+) -> Tuple[list, list, list]:
+    """Get the rows of the head, body and foot of a bs4 table."""
+    sections = {"thead": [], "tbody": [], "tfoot": []}
+    for child in table.find_all(("tr", *sections), recursive=False):
+        rows = [child] if child.name == "tr" \
+            else child.find_all("tr", recursive=False)
+        section = "tbody" if child.name == "tr" else child.name
+        sections[section].extend(
+            [(_text(td.get_text()), _span(td.get("rowspan")),
+              _span(td.get("colspan")), td.name == "th")
+             for td in tr.find_all(("th", "td"), recursive=False)]
+            for tr in rows
+        )
+    return sections["thead"], sections["tbody"], sections["tfoot"]
+
+
+def _lxml_sections(
+    table: "etree._Element",
+) -> Tuple[list, list, list]:
+    """Get the rows of the head, body and foot of a lxml table."""
+    sections = {"thead": [], "tbody": [], "tfoot": []}
+    for child in table.iterchildren("tr", *sections):
+        rows = [child] if child.tag == "tr" else child.iterchildren("tr")
+        section = "tbody" if child.tag == "tr" else child.tag
+        sections[section].extend(
+            [(_text(td.text_content()), _span(td.get("rowspan")),
+              _span(td.get("colspan")), td.tag == "th")
+             for td in tr.iterchildren("th", "td")]
+            for tr in rows
+        )
+    return sections["thead"], sections["tbody"], sections["tfoot"]
+
+
+def _is_header_row(
+    row: List[CELL],
+) -> bool:
+    """Determine whether all cells of a row are <th></th> elements."""
+    return bool(row) and all(cell[3] for cell in row)
+
+
+def _expand_spans(
+    rows: List[List[CELL]],
+) -> List[List[str]]:
+    """Expand the cells with a rowspan or colspan to a rectangular grid.
+
+    Parameters
+    ----------
+    rows : List[List[CELL]]
+        The rows of cells.
+
+    Returns
+    -------
+    List[List[str]]
+        The rows of texts, where the text of a cell spanning multiple rows
+        or columns is repeated in each of them.
+
+    """
+    grid = []
+    # the cells spanning into the next row as (column, text, rows left)
+    remainder = []
+    for row in rows:
+        texts = []
+        next_remainder = []
+        col = 0
+        pos = 0
+        for text, rowspan, colspan, _ in row:
+            # fill in the cells of the rows above which come before this one
+            while pos < len(remainder) and remainder[pos][0] <= col:
+                prev_col, prev_text, left = remainder[pos]
+                texts.append(prev_text)
+                if left > 1:
+                    next_remainder.append((prev_col, prev_text, left - 1))
+                pos += 1
+                col += 1
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((col, text, rowspan - 1))
+                col += 1
+        for prev_col, prev_text, left in remainder[pos:]:
+            texts.append(prev_text)
+            if left > 1:
+                next_remainder.append((prev_col, prev_text, left - 1))
+            col += 1
+        grid.append(texts)
+        remainder = next_remainder
+    # add the rows which only exist due to a rowspan
+    while remainder:
+        grid.append([text for _, text, _ in remainder])
+        remainder = [(col, text, left - 1)
+                     for col, text, left in remainder if left > 1]
+    return grid
+
+
+def _to_frame(
+    head: List[List[CELL]],
+    body: List[List[CELL]],
+    foot: List[List[CELL]],
+    **kwargs: dict,
+) -> "pd.DataFrame":
+    """Build a DataFrame from the rows of a table.
+
+    The header rows become the columns (a MultiIndex if there is more than
+    one), the values are converted to numbers where possible as in
+    `pd.read_html()`.
+    """
+    head = _expand_spans(head)
+    body = _expand_spans(body) + _expand_spans(foot)
+    header = None
+    if head:
+        if len(head) == 1:
+            header = 0
+        else:
+            # ignore the header rows without any text
+            header = [i for i, row in enumerate(head) if any(row)]
+        body = head + body
+    if not body:
+        raise ValueError("The table has no rows.")
+    # pad ragged rows with empty cells
+    width = max(len(row) for row in body)
+    for row in body:
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+    kwargs.setdefault("thousands", ",")
+    # pandas is imported on the first table, not with the package
+    from pandas.io.parsers import TextParser
+    with TextParser(body, header=header, **kwargs) as parser:
+        return parser.read()
+
+
+def table_to_frame(
+    table: object,
+    **kwargs: dict,
+) -> "pd.DataFrame":
+    """Convert a parsed <table></table> element to a DataFrame.
+
+    Parameters
+    ----------
+    table : object
+        The table element, a bs4 ``Tag`` or a lxml element.
+
+    Other Parameters
+    ----------------
+    Additional keyword arguments are passed to ``TextParser``, e.g.
+    ``thousands``, ``decimal`` or ``na_values``.
+
+    Returns
+    -------
+    pd.DataFrame
+        The table as DataFrame.
+
+    Raises
+    ------
+    ValueError
+        If the table has no rows.
+
+    Notes
+    -----
+    The rows in <thead></thead> are used as header. If the table has no
+    <thead></thead>, its leading rows consisting only of <th></th> cells
+    are used as header. Cells with a rowspan or colspan are repeated in all
+    rows and columns they span. Rows of nested tables are not part of the
+    table. Otherwise, the result is the same as of ``pd.read_html()`` on
+    the table, but the table is not serialized and parsed again.
+
+    """
+    if isinstance(table, Tag):
+        head, body, foot = _bs4_sections(table)
+    else:
+        head, body, foot = _lxml_sections(table)
+    if not head:
+        # use the leading rows of <th></th> cells of the body as header
+        while body and _is_header_row(body[0]):
+            head.append(body.pop(0))
+    return _to_frame(head, body, foot, **kwargs)
+
+
+def read_tables(
+    content: bytes,
+    encoding: Optional[str] = None,
+    **kwargs: dict,
+) -> "List[pd.DataFrame]":
+    """Get all <table></table> elements of a html page as DataFrames.
+
+    Parameters
+    ----------
+    content : bytes
+        The raw content of the page.
+    encoding : Optional[str]
+        The encoding of the page, by default None, i.e. it is detected
+        by the parser.
+
+    Other Parameters
+    ----------------
+    Additional keyword arguments are passed to `table_to_frame()`.
+
+    Returns
+    -------
+    List[pd.DataFrame]
+        The tables with at least one row in document order.
+
+    Notes
+    -----
+    The page is parsed once with lxml, which is required.
+
+    """
+    if html is None:
+        raise ImportError("Reading tables from raw content requires lxml.")
+    parser = html.HTMLParser(encoding=encoding)
+    root = html.document_fromstring(content, parser=parser)
+    dfs = []
+    for table in root.iter("table"):
+        try:
+            dfs.append(table_to_frame(table, **kwargs))
+        except ValueError:
+            continue
+    return dfs
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+__doc__ = """This module implements the pool of User-Agent headers of the
+webscrapers.
+
+The User-Agents of common desktop browsers are bundled with the package, such
+that creating a scraper needs neither the network nor a data file.
+"""
+
+import itertools
+import random
+import zlib
+from typing import Optional, Sequence
+
+from .ratelimit import host_of
+
+# the User-Agents of recent desktop browsers on Windows, macOS and Linux
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 Edg/135.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36 Edg/134.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:137.0) Gecko/20100101 "
+    "Firefox/137.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:136.0) Gecko/20100101 "
+    "Firefox/136.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 "
+    "Firefox/128.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 Edg/135.0.0.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/18.4 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/18.3.1 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/18.3 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:137.0) Gecko/20100101 "
+    "Firefox/137.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:136.0) Gecko/20100101 "
+    "Firefox/136.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:137.0) Gecko/20100101 Firefox/137.0",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:136.0) Gecko/20100101 Firefox/136.0",
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:137.0) Gecko/20100101 "
+    "Firefox/137.0",
+    "Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+)
+
+STRATEGIES = ("fixed", "host", "request")
+
+
+class UserAgentPool:
+    """A pool of User-Agents which are rotated by a strategy.
+
+    The strategies are:
+
+    * "fixed": The same User-Agent is used for all requests.
+    * "host": Each host gets its own User-Agent, which is the same for all
+      requests to the host, such that a site sees a consistent browser.
+    * "request": The User-Agents are rotated with each request.
+    """
+
+    def __init__(
+        self,
+        agents: Sequence[str] = USER_AGENTS,
+        strategy: str = "fixed",
+        seed: Optional[int] = None,
+    ) -> None:
+        """Init the class.
+
+        Parameters
+        ----------
+        agents : Sequence[str]
+            The User-Agents of the pool, by default `USER_AGENTS`.
+        strategy : str
+            The rotation strategy, one of `STRATEGIES`, by default "fixed".
+        seed : Optional[int]
+            The seed which determines the User-Agents picked, by default
+            None, i.e. a random seed.
+
+        Raises
+        ------
+        ValueError
+            If the pool is empty or the strategy is unknown.
+
+        """
+        if not agents:
+            raise ValueError("Expected at least one User-Agent.")
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Expected strategy to be one of {STRATEGIES}, got {strategy}.")
+        self._agents = tuple(agents)
+        self._strategy = strategy
+        self._seed = seed if seed is not None \
+            else random.getrandbits(32)
+        # the counter is thread-safe, unlike a shared random generator
+        self._counter = itertools.count(self._seed)
+
+    @property
+    def strategy(self) -> str:
+        """The rotation strategy."""
+        return self._strategy
+
+    @property
+    def agents(self) -> tuple:
+        """The User-Agents of the pool."""
+        return self._agents
+
+    def get(
+        self,
+        url: Optional[str] = None,
+    ) -> str:
+        """Get the User-Agent of a request.
+
+        Parameters
+        ----------
+        url : Optional[str]
+            The url of the request, by default None. Only used by the
+            "host" strategy.
+
+        Returns
+        -------
+        str
+            The User-Agent.
+
+        """
+        if self._strategy == "request":
+            idx = next(self._counter)
+        elif self._strategy == "host" and url is not None:
+            idx = zlib.crc32(
+                host_of(url).encode("utf-8"), self._seed & 0xFFFFFFFF)
+        else:
+            idx = self._seed
+        return self._agents[idx % len(self._agents)]
@@ -3,22 +3,34 @@
 __doc__ = """This module implements the wait.
 """
 
-from typing import List
+import functools
+from typing import TYPE_CHECKING, List
 
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+if TYPE_CHECKING:  # pragma: no cover
+    from selenium import webdriver
 
-CONDITION_DIC = {
-    "presence": EC.presence_of_element_located,
-    "clickable": EC.element_to_be_clickable,
-    "selected": EC.element_to_be_selected,
-    "presence_all": EC.presence_of_all_elements_located,
-    "visibility": EC.visibility_of_element_located,
-    "visibility_all": EC.visibility_of_all_elements_located,
-    "alert_presence": EC.alert_is_present,
-}
+
+@functools.lru_cache(maxsize=None)
+def _conditions() -> dict:
+    """Get the expected conditions of selenium by condition type."""
+    from selenium.webdriver.support import expected_conditions as EC
+    return {
+        "presence": EC.presence_of_element_located,
+        "clickable": EC.element_to_be_clickable,
+        "selected": EC.element_to_be_selected,
+        "presence_all": EC.presence_of_all_elements_located,
+        "visibility": EC.visibility_of_element_located,
+        "visibility_all": EC.visibility_of_all_elements_located,
+        "alert_presence": EC.alert_is_present,
+    }
+
+
+def __getattr__(name: str):
+    # selenium is imported when the conditions are first used, not with
+    # the package
+    if name == "CONDITION_DIC":
+        return _conditions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def element_wait(
@@ -27,7 +39,7 @@ def element_wait(
         by_strat: str,
         val: str,
         condition_type: str
-) -> List[webdriver.firefox.webelement.FirefoxWebElement]:
+) -> "List[webdriver.firefox.webelement.FirefoxWebElement]":
     """Tell a selenium webelement to wait for `time` seconds
     until the val in element is located.
 
@@ -69,8 +81,10 @@ def element_wait(
         then a TimeoutException is raised.
 
     """
-    condition = CONDITION_DIC.get(
-        condition_type, EC.presence_of_element_located)
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+    conditions = _conditions()
+    condition = conditions.get(condition_type, conditions["presence"])
     try:
         element = WebDriverWait(element, time).until(
             condition((by_strat, val)))
@@ -7,19 +7,15 @@ webpages.
 """
 
 import os
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
-from selenium import webdriver
-from selenium.common.exceptions import (ElementClickInterceptedException,
-                                        ElementNotInteractableException)
-# from selenium.webdriver.common import desired_capabilities
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options
-
-from . import LOG_DIR
 from ._base import Scraper
+from .logs import log_dir
 from .wait import element_wait
 
+if TYPE_CHECKING:  # pragma: no cover
+    from selenium import webdriver
+
 
 class Webdriver(Scraper):
     """The `Webdriver` class.
@@ -46,6 +42,11 @@ class Webdriver(Scraper):
 
         """
         super().__init__()
+        # selenium is imported with the first driver, not with the package
+        from selenium import webdriver
+        # from selenium.webdriver.common import desired_capabilities
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.firefox.options import Options
         # define the path to the driver
         self._path = exe_path if exe_path is not None else "geckodriver"
         # set some options using the built-in Options class
@@ -55,7 +56,7 @@ class Webdriver(Scraper):
         self._engine = webdriver.Firefox(
             options=options,
             executable_path=self._path,
-            service_log_path=LOG_DIR / "geckodriver.log",
+            service_log_path=log_dir() / "geckodriver.log",
             # desired_capabilities=options.default_capabilites,
         )
         self._url = url
@@ -90,7 +91,7 @@ class Webdriver(Scraper):
         self._engine.quit()
 
     @property
-    def engine(self) -> webdriver.Firefox:
+    def engine(self) -> "webdriver.Firefox":
         """Get the current engine.
 
         Returns
@@ -126,6 +127,8 @@ class Webdriver(Scraper):
         [1] https://sqa.stackexchange.com/questions/13792/how-to-proceed-after-clicking-a-link-to-new-page-in-selenium-in-python
 
         """
+        from selenium.common.exceptions import (
+            ElementClickInterceptedException, ElementNotInteractableException)
         try:
             hyperlink.click()
         except ElementClickInterceptedException:
@@ -203,7 +206,8 @@ class Webdriver(Scraper):
         [1] https://selenium-python.readthedocs.io/locating-elements.html
 
         """
-        by_strat = self._strategy_dic.get(by_strat, By.CSS_SELECTOR)
+        by_strat = self._strategy_dic.get(
+            by_strat, self._strategy_dic["css_selector"])
         element = kwargs.get("element", self._engine)
         val = kwargs.get("val", "html")
         condition_type = kwargs.get("condition_type", "presence_all")
@@ -3,46 +3,45 @@
 __doc__ = """This module implements the webscraper.
 """
 
+import collections
+import contextlib
 import functools
-import http.client
+import heapq
+import itertools
 import logging
+import math
 import os
-from concurrent.futures import ThreadPoolExecutor  # ,ProcessPoolExecutor
-from typing import List, Optional, Union
+import threading
+import time
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from pathlib import Path
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, Union)
 
 import requests
 from bs4 import BeautifulSoup, SoupStrainer
-from bs4.dammit import EncodingDetector
-from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
 
-from . import LOG_DIR
 from ._base import DATA_OBJECT, Scraper
-
-# set up the logging configuration
-http.client.HTTPConnection.debuglevel = 0
-LOG_FILE = LOG_DIR / f"{__name__.split('.')[-1]}.log"
-
-REQUESTS_LOG = logging.getLogger("requests.packages.urllib3")
-REQUESTS_LOG.setLevel(logging.DEBUG)
-REQUESTS_LOG.propagate = True
-
-FILE_HANDLER = logging.FileHandler(LOG_FILE, mode="w", encoding="utf-8")
-FILEFORMAT = logging.Formatter(
-    "%(asctime)s:[%(threadName)-12.12s]:%(levelname)s:%(name)s:%(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
-FILE_HANDLER.setFormatter(FILEFORMAT)
-
-STREAM_HANDLER = logging.StreamHandler()
-STREAM_HANDLER.setLevel(logging.WARNING)
-STREAMFORMAT = logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
-STREAM_HANDLER.setFormatter(STREAMFORMAT)
-
-REQUESTS_LOG.addHandler(FILE_HANDLER)
-REQUESTS_LOG.addHandler(STREAM_HANDLER)
-
-logging.basicConfig(handlers=[FILE_HANDLER, STREAM_HANDLER])
-logging.getLogger().setLevel(logging.WARNING)
+from .cache import DocumentCache, ResponseCache
+from .concurrency import AIMDController
+from .download import (DOWNLOAD_CHUNK_SIZE, SEGMENT_SIZE, DownloadReport,
+                       SegmentedFile, guess_extension, save_response,
+                       url_stem, url_stems)
+from .encoding import EncodingResolver
+from .hooks import Hook, Hooks
+from .logs import REQUESTS_LOG, ScraperLog, setup_logging
+from .metrics import Metrics, TimedHTTPAdapter
+from .ratelimit import HostLimiter, HostQueue, host_of
+from .records import ResponseRecord
+from .retry import CircuitBreaker, CircuitOpenError, RetryPolicy, is_transient
+from .useragents import UserAgentPool
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover
+    etree = None
 
 STATUS_CODES = {
     100: "Informational Responses",
@@ -55,10 +54,29 @@ STATUS_CODES = {
 RESPONSE_OBJECT = Union[None, requests.Response,
                         List[requests.Response], requests.exceptions.RequestException]
 
+# batches with less responses are parsed serially, even in parallel mode
+MIN_PARALLEL_PARSE = 16
+# the default maximum number of requests in flight when loading multiple urls
+MAX_THREADS = 32
+# the number of bytes read at once in streaming mode
+STREAM_CHUNK_SIZE = 2**14
+
+
+# the report of a response logged in verbose mode
+REPORT = "\n----- REPORT START -----\n" \
+    "URL: %s\n" \
+    "Time: %.3fs\n" \
+    "Encoding: %s\n" \
+    "Reason: %s\n" \
+    "Status Code: %s\n" \
+    "Certificate: %s\n" \
+    "----- REPORT END -----\n"
+
 
 def callback(
     res: requests.Response,
     *args,
+    log: Union[logging.Logger, ScraperLog, None] = None,
     **kwargs
 ) -> requests.Response:
     """Callback function.
@@ -67,29 +85,246 @@ def callback(
     ----------
     res : requests.Response
         A response object.
+    log : Union[logging.Logger, ScraperLog, None]
+        The log the report of the response is written to, by default None,
+        i.e. `REQUESTS_LOG`.
 
     Returns
     -------
     requests.Response
         A request.Response object.
 
+    Notes
+    -----
+    The report is only formatted if it is written, and then by the thread
+    which writes the log (see `xscrapers.logs`).
+
     """
     # indicate that the callback funtion was called
     res.hook_called = True
     if args:
         raise AssertionError(f"Have a look at what is in {args}")
-    msg = f"\n----- REPORT START -----\n" \
-          f"URL: {res.url}\n" \
-          f"Time: {res.elapsed.total_seconds():.3f}s\n" \
-          f"Encoding: {res.encoding}\n" \
-          f"Reason: {res.reason}\n" \
-          f"Status Code: {res.status_code}\n" \
-          f"Certificate: {kwargs.get('cert', None)}\n" \
-          f"----- REPORT END -----\n"
-    REQUESTS_LOG.debug(msg)
+    log = log if log is not None else REQUESTS_LOG
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            REPORT,
+            res.url,
+            res.elapsed.total_seconds(),
+            res.encoding,
+            res.reason,
+            res.status_code,
+            kwargs.get("cert", None),
+        )
     return res
 
 
+def _http_encoding(
+    res: requests.Response,
+) -> Optional[str]:
+    """Get the encoding given in the content-type header of a response.
+
+    Parameters
+    ----------
+    res : requests.Response
+        A response object.
+
+    Returns
+    -------
+    Optional[str]
+        The encoding, None if no charset is given in the header.
+
+    """
+    return res.encoding if "charset" in res.headers.get(
+        "content-type", "").lower() else None
+
+
+def _latency(
+    res: RESPONSE_OBJECT,
+) -> Optional[float]:
+    """Get the latency of a response in seconds.
+
+    Parameters
+    ----------
+    res : RESPONSE_OBJECT
+        The response object or the error thrown.
+
+    Returns
+    -------
+    Optional[float]
+        The time until the response headers arrived, None for errors and
+        responses served from a cache.
+
+    """
+    if not isinstance(res, requests.Response) \
+            or getattr(res, "from_cache", False):
+        return None
+    return res.elapsed.total_seconds()
+
+
+def _parse_content(
+    content: bytes,
+    encoding: Optional[str],
+    parser: str,
+    name: Optional[str],
+    kwargs: dict,
+    extract: Optional[Callable[[BeautifulSoup], Any]] = None,
+) -> Any:
+    """Parse the raw content of a response.
+
+    Parameters
+    ----------
+    content : bytes
+        The body of the response.
+    encoding : Optional[str]
+        The encoding of the body (see `EncodingResolver`), None if it is
+        unknown, in which case it is detected by BeautifulSoup.
+    parser : str
+        The parser to be used.
+    name : Optional[str]
+        Parse only a part of the document specified by a `name`.
+    kwargs : dict
+        Parameters passed into the `SoupStrainer` object.
+    extract : Optional[Callable[[BeautifulSoup], Any]]
+        A function which is applied on the parsed document, by default None.
+
+    Returns
+    -------
+    Any
+        The response as BeautifulSoup object, or the value returned by
+        `extract`.
+
+    Notes
+    -----
+    This function is defined on module level such that it can be sent to
+    worker processes.
+
+    """
+    # parse the document
+    parse_only = SoupStrainer(name, **kwargs)
+    obj = BeautifulSoup(
+        content,
+        parser,
+        from_encoding=encoding,
+        parse_only=parse_only,
+    )
+    if extract is not None:
+        return extract(obj)
+    return obj
+
+
+def _parse_timed(
+    *args,
+) -> Tuple[Any, float]:
+    """Parse the raw content of a response and time the parse.
+
+    See the documentation for `_parse_content()`, the duration of the parse
+    in seconds is returned along with the result.
+    """
+    start = time.perf_counter()
+    obj = _parse_content(*args)
+    return obj, time.perf_counter() - start
+
+
+def _strainer_matches(
+    strainer: SoupStrainer,
+    ele: "etree._Element",
+) -> bool:
+    """Determine whether a lxml element matches a `SoupStrainer`."""
+    attrs = {
+        key: val.split() if key == "class" else val
+        for key, val in ele.attrib.items()
+    }
+    return bool(strainer.search_tag(ele.tag, attrs))
+
+
+def _stream_parse(
+    res: requests.Response,
+    parser: str,
+    name: str,
+    kwargs: dict,
+    limit: Optional[int] = 1,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> BeautifulSoup:
+    """Parse a streamed response until the requested elements are complete.
+
+    Parameters
+    ----------
+    res : requests.Response
+        A response of a request sent with ``stream=True``.
+    parser : str
+        The parser to be used.
+    name : str
+        The name of the elements to be parsed.
+    kwargs : dict
+        Parameters passed into the `SoupStrainer` object.
+    limit : Optional[int]
+        The number of elements after which the download stops,
+        by default 1. If None, the whole body is downloaded.
+    chunk_size : int
+        The number of bytes read at once, by default `STREAM_CHUNK_SIZE`.
+
+    Returns
+    -------
+    BeautifulSoup
+        The elements found, as the document returned by `_parse_content()`
+        for the same `name` and `kwargs`.
+
+    Notes
+    -----
+    The chunks are fed into the incremental html parser of lxml. As soon as
+    `limit` elements (which are not part of another element found) have
+    been closed, the connection is closed without downloading the rest of
+    the body. The `content` of the response is set to the part of the body
+    which has been downloaded.
+
+    If lxml is not installed, the whole body is downloaded and parsed.
+
+    """
+    strainer = SoupStrainer(name, **kwargs)
+    chunks = []
+    matches = []
+    try:
+        if etree is None:
+            chunks.extend(res.iter_content(chunk_size))
+        else:
+            pull = etree.HTMLPullParser(
+                events=("end",), tag=name, encoding=_http_encoding(res))
+            for chunk in itertools.chain(res.iter_content(chunk_size), [None]):
+                if chunk is not None:
+                    chunks.append(chunk)
+                    pull.feed(chunk)
+                try:
+                    if chunk is None:
+                        pull.close()
+                    events = list(pull.read_events())
+                except etree.XMLSyntaxError:
+                    # e.g. an empty body, which has no elements
+                    break
+                for _, ele in events:
+                    # keep only the outermost of nested elements found
+                    if _strainer_matches(strainer, ele) and not any(
+                            _strainer_matches(strainer, anc)
+                            for anc in ele.iterancestors(name)):
+                        matches.append(ele)
+                if limit is not None and len(matches) >= limit:
+                    break
+    finally:
+        res.close()
+    res._content = b"".join(chunks)
+    if etree is None:
+        obj = _parse_content(
+            res._content, _http_encoding(res), parser, name, kwargs)
+        if limit is not None:
+            for ele in obj.find_all(recursive=False)[limit:]:
+                ele.decompose()
+        return obj
+    html = "".join(
+        etree.tostring(ele, method="html", encoding="unicode", with_tail=False)
+        for ele in matches[:limit]
+    )
+    return BeautifulSoup(html, parser, parse_only=strainer)
+
+
 class Webscraper(Scraper):
     """The Webscraper class.
     """
@@ -99,6 +334,24 @@ class Webscraper(Scraper):
         parser: str,
         verbose: bool = False,
         get_params: Optional[dict] = None,
+        pool_connections: int = 10,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        max_connections: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        max_processes: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        doc_cache: Optional[DocumentCache] = None,
+        host_limits: Optional[Dict[str, dict]] = None,
+        default_host_limit: Optional[dict] = None,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        concurrency: Optional[AIMDController] = None,
+        lean: bool = False,
+        user_agent: Union[str, UserAgentPool, None] = None,
+        log_level: Union[int, str, None] = None,
+        metrics: Optional[Metrics] = None,
+        hooks: Optional[Iterable[Hook]] = None,
     ) -> None:
         """Init the class.
 
@@ -116,28 +369,130 @@ class Webscraper(Scraper):
         get_params : Optional[dict]
             A dictionary containing parameters for the GET request,
             by default None. See [1].
+        pool_connections : int
+            The number of hosts for which a connection pool is kept,
+            by default 10.
+        pool_maxsize : Optional[int]
+            The maximum number of connections kept alive per host,
+            by default None, i.e. at least as many as threads are used.
+        pool_block : bool
+            Determine whether a request waits for a free connection when the
+            pool of its host is exhausted instead of opening a new connection
+            which is discarded afterwards, by default False.
+        max_connections : Optional[int]
+            The maximum number of requests in flight over all hosts,
+            by default None, i.e. no limit.
+        idle_timeout : Optional[float]
+            The number of seconds after which idle connections are closed,
+            by default None, i.e. connections are kept until `close()`
+            is called.
+        max_processes : Optional[int]
+            The number of worker processes used by `parse(parallel=True)`,
+            by default None, i.e. two less than the number of CPUs.
+        cache : Optional[ResponseCache]
+            A cache in which the responses of GET requests are stored,
+            by default None, i.e. no responses are cached.
+        doc_cache : Optional[DocumentCache]
+            A cache in which the parsed documents are kept, by default None,
+            i.e. every call of `parse()` parses the responses again.
+        host_limits : Optional[Dict[str, dict]]
+            The limits of the requests in flight (``"concurrency"``) and of
+            the requests per second (``"rate"`` and ``"burst"``) per domain
+            for loading multiple urls, by default None. See the documentation
+            of `HostLimiter`.
+        default_host_limit : Optional[dict]
+            The limits of hosts not given in `host_limits`, by default None,
+            i.e. no limits.
+        retry : Optional[RetryPolicy]
+            The policy to retry GET requests which failed transiently,
+            by default None, i.e. no request is retried.
+        circuit_breaker : Optional[CircuitBreaker]
+            The circuit breaker which stops sending GET requests to hosts
+            which keep failing, by default None.
+        concurrency : Optional[AIMDController]
+            The controller which adapts the number of requests in flight
+            when loading multiple urls, by default None, i.e. a controller
+            with a maximum of `MAX_THREADS` requests is used.
+        lean : bool
+            Determine whether the responses are replaced by compact
+            `ResponseRecord` objects once they have been parsed, such that
+            their bodies are released, by default False.
+        user_agent : Union[str, UserAgentPool, None]
+            The User-Agent header sent with all requests, or the pool of
+            User-Agents which are rotated, by default None, i.e. a random
+            User-Agent of the bundled pool is sent with all requests.
+        log_level : Union[int, str, None]
+            The level of the messages of the scraper which are logged,
+            by default None, i.e. "DEBUG" if `verbose` is True, otherwise
+            "WARNING".
+        metrics : Optional[Metrics]
+            The metrics to which the durations of the stages (DNS lookup,
+            connect, TLS handshake, time to the first byte, download,
+            encoding resolution and parse) and the sizes of the responses
+            are added per host, by default None, i.e. nothing is timed.
+        hooks : Optional[Iterable[Hook]]
+            The hooks which are called before and after each request, parse
+            and extraction, by default None. Hooks can be added, removed
+            and switched off later on, see the `hooks` property.
 
         References
         ----------
         [1] https://2.python-requests.org/en/master/
 
+        Notes
+        -----
+        The session and its connection pools are kept alive for the lifetime
+        of the scraper, such that keep-alive connections and TLS sessions are
+        reused by all requests. Use the scraper as a context manager or call
+        `close()` to release the connections.
+
         """
         super().__init__()
+        setup_logging()
         self._parser = parser
         self._verbose = verbose
+        if log_level is None:
+            log_level = logging.DEBUG if verbose else logging.WARNING
+        self._log = ScraperLog(log_level)
         if get_params:
             self._get_params = get_params
         else:
             self._get_params = {}
 
-        self._max_threads = os.cpu_count()*2 - 4
-        self._max_processes = os.cpu_count() - 2
-
-        self._user_agent = UserAgent()
-        self._headers = {"User-Agent": self._user_agent.random}
+        self._concurrency = concurrency or AIMDController(
+            max_limit=MAX_THREADS)
+        self._max_threads = self._concurrency.max_limit
+        self._max_processes = max_processes or max(os.cpu_count() - 2, 1)
+        self._cache = cache
+        self._doc_cache = doc_cache
+        self._lean = lean
+        self._encodings = EncodingResolver()
+        self._metrics = metrics
+        self._hooks = Hooks(hooks or ())
+        self._limiter = HostLimiter(host_limits, default_host_limit)
+        self._retry = retry
+        self._breaker = circuit_breaker
+
+        if isinstance(user_agent, str):
+            user_agent = UserAgentPool([user_agent])
+        self._user_agents = user_agent or UserAgentPool()
+        # set up the long-lived session and its connection pools
+        adapter_cls = HTTPAdapter if metrics is None else TimedHTTPAdapter
+        self._adapter = adapter_cls(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize or max(self._max_threads, 10),
+            pool_block=pool_block,
+        )
         self._sess = requests.Session()
+        self._sess.mount("http://", self._adapter)
+        self._sess.mount("https://", self._adapter)
         if self._verbose:
-            self._sess.hooks["response"].append(callback)
+            self._sess.hooks["response"].append(
+                functools.partial(callback, log=self._log))
+        self._slots = threading.BoundedSemaphore(
+            max_connections) if max_connections else contextlib.nullcontext()
+        self._idle_timeout = idle_timeout
+        self._last_used = time.monotonic()
 
         # initialize the response and data attributes
         self._res = None
@@ -165,6 +520,111 @@ class Webscraper(Scraper):
             msg = "No url given."
         return msg
 
+    def __enter__(self) -> "Webscraper":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Exit the context manager and ensure that the connections are closed.
+
+        Parameters
+        ----------
+        exc_type : [type]
+            The  execution type.
+        exc_val : [type]
+            The execution value.
+        exc_tb : [type]
+            The execution traceback.
+
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections of the session.
+
+        Notes
+        -----
+        The scraper can still be used after closing it,
+        new connections are opened on demand.
+
+        """
+        self._sess.close()
+
+    @property
+    def concurrency(self) -> AIMDController:
+        """The controller of the number of requests in flight.
+
+        Returns
+        -------
+        AIMDController
+            The controller, its `limit` is the current number of requests
+            allowed in flight, its `history` contains all adjustments.
+
+        """
+        return self._concurrency
+
+    @property
+    def encodings(self) -> EncodingResolver:
+        """The resolver of the encodings of the responses.
+
+        Returns
+        -------
+        EncodingResolver
+            The resolver, its `stats` contain the number of encodings
+            resolved per source and the total time spent.
+
+        """
+        return self._encodings
+
+    @property
+    def hooks(self) -> Hooks:
+        """The hooks of the requests, parses and extractions.
+
+        Returns
+        -------
+        Hooks
+            The hooks, use their `add()`, `remove()`, `enable()` and
+            `disable()` methods to change them at runtime.
+
+        """
+        return self._hooks
+
+    @property
+    def log(self) -> ScraperLog:
+        """The log of the scraper.
+
+        Returns
+        -------
+        ScraperLog
+            The log, use its `setLevel()` method to change the level of the
+            messages of the scraper which are logged.
+
+        """
+        return self._log
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        """The metrics of the requests and parses.
+
+        Returns
+        -------
+        Optional[Metrics]
+            The metrics, None if nothing is timed.
+
+        """
+        return self._metrics
+
+    @property
+    def user_agents(self) -> UserAgentPool:
+        """The pool of User-Agents sent with the requests.
+
+        Returns
+        -------
+        UserAgentPool
+            The pool.
+
+        """
+        return self._user_agents
+
     @property
     def res(self) -> RESPONSE_OBJECT:
         """The response object.
@@ -241,24 +701,12 @@ class Webscraper(Scraper):
         """
         # save the url to the data class
         self._url = url
-        with self._sess as sess:
-            try:
-                res = sess.get(
-                    url,
-                    headers=self._headers,
-                    timeout=self._timeout,
-                    **self._get_params,
-                )
-                if not res.ok:  # check if no bad response is returned
-                    REQUESTS_LOG.warning(
-                        f"Response for {url} failed!\nResponse status code: {res.status_code}.")
-                if self._verbose:
-                    REQUESTS_LOG.debug("Total Time: %3f s",
-                                       res.elapsed.total_seconds())
-            except requests.exceptions.RequestException as e:
-                REQUESTS_LOG.warning(
-                    f"Sending a GET request to {url} has failed!\nThe exception thrown is {e}")
-                res = e
+        res = self._fetch_one(url)
+        attempt = 0
+        while self._retry is not None and self._retry.should_retry(res, attempt):
+            time.sleep(self._retry.delay(res, attempt))
+            attempt += 1
+            res = self._fetch_one(url)
         # set the attribute
         self.__setattr__("_res", res)
         self._http_request["GET"] = True
@@ -282,15 +730,281 @@ class Webscraper(Scraper):
         -----
         This function uses multithreading since loading multiple URLs is an I/O
         bound task. For this, a computer and system dependent maximum number
-        of threads have to be given.
+        of threads have to be given. The requests are scheduled as described
+        in `iter_get()`.
 
         """
         # save the url to the data class
         self._url = url
-        with ThreadPoolExecutor(max_workers=self._max_threads) as executor:
-            responses = list(executor.map(self.get, url, chunksize=8))
-            # wait until all threads are finished
-            executor.shutdown(wait=True)
+        responses = [None] * len(url)
+        for idx, _, res in self._iter_indexed(url):
+            responses[idx] = res
+        self._set_responses(url, responses)
+
+    def iter_get(
+        self,
+        urls: Iterable[str],
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[Tuple[str, RESPONSE_OBJECT]]:
+        """Load urls and yield the responses as soon as they arrive.
+
+        Parameters
+        ----------
+        urls : Iterable[str]
+            The urls to be loaded. The iterable is consumed lazily, only
+            when a request slot is free. If `urls` has a `popleft` method,
+            e.g. a `collections.deque`, urls are popped from its left and
+            urls which are added while iterating are loaded as well.
+        max_in_flight : Optional[int]
+            The maximum number of requests in flight at the same time,
+            by default None, i.e. the number is adapted by the concurrency
+            controller of the scraper.
+
+        Yields
+        ------
+        Tuple[str, RESPONSE_OBJECT]
+            The url and its response object, or the error thrown,
+            in the order in which the requests complete.
+
+        Notes
+        -----
+        Contrary to `get()`, neither the `url` nor the `res` attribute is
+        set, and bad responses and errors are not filtered out. Since at most
+        `max_in_flight` responses are held at once, the memory used does not
+        grow with the number of urls.
+
+        The requests are distributed round-robin over the hosts, respecting
+        the per host limits of the scraper. Urls of a host which has reached
+        its limits are held back, while the free request slots are filled
+        with urls of other hosts further ahead in `urls`.
+
+        Failed requests are retried according to the retry policy of the
+        scraper. Retries wait for their delay without occupying a request
+        slot, and urls of hosts with an open circuit are yielded with a
+        `CircuitOpenError` right away.
+
+        """
+        yield from self._iter_fetch(urls, max_in_flight, self._fetch_one)
+
+    def _iter_fetch(
+        self,
+        urls: Iterable[str],
+        max_in_flight: Optional[int],
+        fetch: Callable[[str], RESPONSE_OBJECT],
+    ) -> Iterator[Tuple[str, RESPONSE_OBJECT]]:
+        """Load urls with the given function like `iter_get()`.
+
+        See the documentation for `iter_get()`, the requests are sent
+        by `fetch`, e.g. `self._fetch_one`.
+        """
+        if max_in_flight is None:
+            controller = self._concurrency
+            max_workers = controller.max_limit
+        else:
+            controller = None
+            max_workers = max_in_flight
+        if hasattr(urls, "popleft"):
+            def next_url() -> Optional[str]:
+                return urls.popleft() if urls else None
+        else:
+            source = iter(urls)
+
+            def next_url() -> Optional[str]:
+                return next(source, None)
+        # the number of urls which are looked ahead for hosts with free slots
+        max_pending = 4 * max_workers
+        pending = HostQueue()
+        # the urls to be retried as heap of (time, counter, url)
+        retries = []
+        attempts = collections.Counter()
+        counter = itertools.count()
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                while True:
+                    if controller is not None:
+                        max_in_flight = controller.limit
+                    now = time.monotonic()
+                    while retries and retries[0][0] <= now:
+                        pending.add(heapq.heappop(retries)[2])
+                    while len(pending) < max_pending:
+                        url = next_url()
+                        if url is None:
+                            break
+                        pending.add(url)
+                    # keep the request slots filled
+                    delay = math.inf
+                    while len(in_flight) < max_in_flight:
+                        url, wait_for = pending.pop(self._limiter, now)
+                        if url is None:
+                            delay = wait_for
+                            break
+                        host = host_of(url)
+                        if self._breaker is not None \
+                                and self._breaker.is_open(host):
+                            # fail fast without occupying a request slot
+                            self._limiter.release(host)
+                            attempts.pop(url, None)
+                            yield url, CircuitOpenError(
+                                f"The circuit of {host} is open.")
+                            continue
+                        in_flight[executor.submit(fetch, url)] = url
+                    if retries:
+                        delay = min(delay, retries[0][0] - now)
+                    if not in_flight:
+                        if not pending and not retries:
+                            break
+                        # wait for the rate limits and the retries
+                        time.sleep(max(delay, 0))
+                        continue
+                    done, _ = wait(
+                        in_flight,
+                        timeout=max(delay, 0) if delay != math.inf else None,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        url = in_flight.pop(future)
+                        self._limiter.release(host_of(url))
+                        res = future.result()
+                        if controller is not None:
+                            controller.record(_latency(res), is_transient(res))
+                        if self._retry is not None \
+                                and self._retry.should_retry(res, attempts[url]):
+                            retry_delay = self._retry.delay(res, attempts[url])
+                            attempts[url] += 1
+                            self._log.info(
+                                "Retrying %s in %.2fs.", url, retry_delay)
+                            heapq.heappush(retries, (
+                                time.monotonic() + retry_delay,
+                                next(counter),
+                                url,
+                            ))
+                            continue
+                        attempts.pop(url, None)
+                        yield url, res
+            finally:
+                # do not wait for requests which have not been started yet
+                for future, url in in_flight.items():
+                    if future.cancel():
+                        self._limiter.release(host_of(url))
+
+    def _iter_indexed(
+        self,
+        urls: List[str],
+        max_in_flight: Optional[int] = None,
+        fetch: Optional[Callable[[str], RESPONSE_OBJECT]] = None,
+    ) -> Iterator[Tuple[int, str, RESPONSE_OBJECT]]:
+        """Load a list of urls like `iter_get()` and additionally yield
+        the position of each url in `urls`.
+        """
+        # remember the position of each url to restore the order of `urls`
+        index = collections.defaultdict(collections.deque)
+        for idx, url in enumerate(urls):
+            index[url].append(idx)
+        for url, res in self._iter_fetch(
+                urls, max_in_flight, fetch or self._fetch_one):
+            yield index[url].popleft(), url, res
+
+    def _fetch_one(
+        self,
+        url: str,
+        stream: Optional[Callable[[requests.Response], int]] = None,
+    ) -> RESPONSE_OBJECT:
+        """Send a GET request to a single url without storing the response.
+
+        Parameters
+        ----------
+        url : str
+            The url to be loaded.
+        stream : Optional[Callable[[requests.Response], int]]
+            A function which reads the body of the response and returns the
+            number of bytes of the body read, by default None. If given,
+            the request is sent in streaming mode and bypasses the response
+            cache, otherwise the whole body is downloaded right away.
+
+        Returns
+        -------
+        RESPONSE_OBJECT
+            The corresponding response object. If the request fails
+            for some reason, the error itself is returned.
+
+        """
+        host = host_of(url)
+        if self._breaker is not None and not self._breaker.allow(host):
+            return CircuitOpenError(f"The circuit of {host} is open.")
+        try:
+            if stream is not None:
+                res = self._request(
+                    "GET", url, **{**self._get_params, "stream": True})
+                size = stream(res)
+                if self._metrics is not None:
+                    self._metrics.record_download(res, size)
+            elif self._cache is None:
+                res = self._request("GET", url, **self._get_params)
+            else:
+                res = self._cache.fetch(
+                    url, functools.partial(self._conditional_get, url))
+            if not res.ok:  # check if no bad response is returned
+                self._log.warning(
+                    "Response for %s failed!\nResponse status code: %s.",
+                    url, res.status_code)
+            if self._log.isEnabledFor(logging.DEBUG):
+                self._log.debug("Total Time: %3f s",
+                                res.elapsed.total_seconds())
+        except requests.exceptions.RequestException as e:
+            self._log.warning(
+                "Sending a GET request to %s has failed!\n"
+                "The exception thrown is %s", url, e)
+            res = e
+        if self._breaker is not None:
+            self._breaker.record(host, is_transient(res))
+        return res
+
+    def _conditional_get(
+        self,
+        url: str,
+        headers: dict,
+    ) -> requests.Response:
+        """Send a GET request with additional headers.
+
+        Parameters
+        ----------
+        url : str
+            The url to be loaded.
+        headers : dict
+            The headers which are sent in addition to the headers of the
+            scraper, e.g. the validators of a cached response.
+
+        Returns
+        -------
+        requests.Response
+            The response object.
+
+        """
+        params = dict(self._get_params)
+        headers = {**params.pop("headers", self._headers(url)), **headers}
+        return self._request("GET", url, headers=headers, **params)
+
+    def _set_responses(
+        self,
+        urls: List[str],
+        responses: List[RESPONSE_OBJECT],
+    ) -> None:
+        """Store the successful responses of a multi-url GET request.
+
+        Parameters
+        ----------
+        urls : List[str]
+            The urls which were requested.
+        responses : List[RESPONSE_OBJECT]
+            The response or the exception for each url in `urls`.
+
+        Notes
+        -----
+        Exceptions and bad responses (status code >= 400) are filtered out,
+        the `url` attribute is set to the urls of the remaining responses.
+
+        """
         # filter out Response >=[400] and exceptions
         _res = []
         _urls = []
@@ -301,7 +1015,7 @@ class Webscraper(Scraper):
             else:
                 if res.ok:
                     _res.append(res)
-                    _urls.append(url[i])
+                    _urls.append(urls[i])
                 else:  # filter out bad responses
                     continue
         self._url = _urls
@@ -309,6 +1023,83 @@ class Webscraper(Scraper):
         self.__setattr__("_res", _res)
         self._http_request["GET"] = True
 
+    def _headers(
+        self,
+        url: str,
+    ) -> dict:
+        """Get the default headers of a request to a url."""
+        return {"User-Agent": self._user_agents.get(url)}
+
+    def _resolve_encoding(
+        self,
+        res: requests.Response,
+    ) -> str:
+        """Resolve the encoding of a response, timed if metrics are kept."""
+        if self._metrics is None:
+            return self._encodings.resolve(res)
+        start = time.perf_counter()
+        encoding = self._encodings.resolve(res)
+        self._metrics.observe(
+            host_of(res.url), "encoding", time.perf_counter() - start)
+        return encoding
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        **kwargs: dict,
+    ) -> requests.Response:
+        """Send a request over the pooled session.
+
+        Parameters
+        ----------
+        method : str
+            The http method of the request.
+        url : str
+            The url to which the request should be made.
+
+        Other Parameters
+        ----------------
+        Parameters passed into `requests.Session.request`, the headers and
+        the timeout of the scraper are used if not given.
+
+        Returns
+        -------
+        requests.Response
+            The response object.
+
+        """
+        if "headers" not in kwargs:
+            kwargs["headers"] = self._headers(url)
+        kwargs.setdefault("timeout", self._timeout)
+        now = time.monotonic()
+        if self._idle_timeout is not None \
+                and now - self._last_used > self._idle_timeout:
+            # drop the connections which have been idle for too long
+            self._adapter.close()
+        self._last_used = now
+        # the hooks are only called after the request if they have been
+        # called before, even if they are switched meanwhile
+        hooked = self._hooks.enabled
+        if hooked:
+            self._hooks.emit("before_request", method, url, kwargs)
+            start = time.perf_counter()
+        try:
+            with self._slots:
+                res = self._sess.request(method, url, **kwargs)
+        except Exception as e:
+            if hooked:
+                self._hooks.emit("after_response", method, url, e,
+                                 time.perf_counter() - start)
+            raise
+        if self._metrics is not None:
+            self._metrics.record_response(
+                res, downloaded=not kwargs.get("stream"))
+        if hooked:
+            self._hooks.emit("after_response", method, url, res,
+                             time.perf_counter() - start)
+        return res
+
     def put(
         self,
         url: str
@@ -322,8 +1113,7 @@ class Webscraper(Scraper):
 
         """
         self._url = url
-        with self._sess as sess:
-            res = sess.put(url)
+        res = self._request("PUT", url)
         # set the attribute
         self.__setattr__("_res", res)
         self._http_request["PUT"] = True
@@ -341,8 +1131,7 @@ class Webscraper(Scraper):
 
         """
         self._url = url
-        with self._sess as sess:
-            res = sess.delete(url)
+        res = self._request("DELETE", url)
         # set the attribute
         self.__setattr__("_res", res)
         self._http_request["DELETE"] = True
@@ -350,7 +1139,7 @@ class Webscraper(Scraper):
     def head(
         self,
         url: str
-    ) -> None:
+    ) -> requests.Response:
         """Make a HEAD request to a single url.
 
         Parameters
@@ -358,13 +1147,18 @@ class Webscraper(Scraper):
         url : str
             The url to which a HEAD request should be made.
 
+        Returns
+        -------
+        requests.Response
+            The response object.
+
         """
         self._url = url
-        with self._sess as sess:
-            res = sess.head(url)
+        res = self._request("HEAD", url)
         # set the attribute
         self.__setattr__("_res", res)
         self._http_request["HEAD"] = True
+        return res
 
     def options(
         self,
@@ -379,8 +1173,7 @@ class Webscraper(Scraper):
 
         """
         self._url = url
-        with self._sess as sess:
-            res = sess.options(url)
+        res = self._request("OPTIONS", url)
         # set the attribute
         self.__setattr__("_res", res)
         self._http_request["OPTIONS"] = True
@@ -402,11 +1195,7 @@ class Webscraper(Scraper):
 
         """
         self._url = url
-        with self._sess as sess:
-            res = sess.post(
-                url,
-                data=payload
-            )
+        res = self._request("POST", url, data=payload)
         # set the attribute
         self.__setattr__("_res", res)
         self._http_request["POST"] = True
@@ -424,8 +1213,7 @@ class Webscraper(Scraper):
 
         """
         self._url = url
-        with self._sess as sess:
-            res = sess.patch(url)
+        res = self._request("PATCH", url)
         # set the attribute
         self.__setattr__("_res", res)
         self._http_request["PATCH"] = True
@@ -433,6 +1221,8 @@ class Webscraper(Scraper):
     def parse(
         self,
         name: Optional[str] = None,
+        parallel: bool = False,
+        extract: Optional[Callable[[BeautifulSoup], Any]] = None,
         **kwargs: dict,
     ) -> None:
         """Parse a single or a list of response objects.
@@ -443,6 +1233,13 @@ class Webscraper(Scraper):
             Parse only a part of the document specified by a name
             (see the documentation for `_parse_response()`),
             by default None.
+        parallel : bool
+            Determine whether a list of responses should be parsed in
+            multiple processes, by default False.
+        extract : Optional[Callable[[BeautifulSoup], Any]]
+            A function which is applied on each parsed document, by default
+            None. If given, the values returned are stored instead of the
+            documents.
 
         Other Parameters
         ----------------
@@ -461,26 +1258,581 @@ class Webscraper(Scraper):
         class which has type Union[BeautifulSoup, List[BeautifulSoup]]
         depending on the input the same output is returned with parsed htmls.
 
+        If the scraper has a `DocumentCache`, documents which have been
+        parsed before are taken from the cache. This is not the case in
+        parallel mode.
+
+        In parallel mode, the raw content of the responses is sent to
+        `max_processes` worker processes and the parsed documents are sent
+        back. Since sending whole documents between processes is expensive,
+        pass an `extract` function (defined on module level) which returns
+        only the values needed. Batches with less than `MIN_PARALLEL_PARSE`
+        responses are parsed serially.
+
         """
         if not self._http_request["GET"]:
             raise AssertionError(
                 f"Expected {self.get} to be called before calling {self.parse}.")
+        self._check_released(self.parse)
+        encoding_time = self._encodings.stats["time"]
         if isinstance(self._res, list):
-            obj = []
-            for response in self._res:
-                obj.append(self._parse_response(response, name, **kwargs))
-            # with ProcessPoolExecutor(max_workers=self._max_processes) as executor:
-            #     obj = list(executor.map(self._parse_response, res))
+            if parallel and self._max_processes > 1 \
+                    and len(self._res) >= MIN_PARALLEL_PARSE:
+                obj = self._parse_parallel(name, extract, kwargs)
+            else:
+                obj = []
+                for response in self._res:
+                    obj.append(self._parse_response(
+                        response, name, extract=extract, **kwargs))
         else:
-            obj = self._parse_response(self._res, name, **kwargs)
+            obj = self._parse_response(
+                self._res, name, extract=extract, **kwargs)
         setattr(self, "_data", obj)
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug(
+                "Resolving the encodings took %.4f s.",
+                self._encodings.stats["time"] - encoding_time)
+        self._release()
+
+    def _check_released(
+        self,
+        method: Callable,
+    ) -> None:
+        """Raise an AssertionError if the bodies of the responses have been
+        released in lean mode."""
+        responses = self._res if isinstance(self._res, list) else [self._res]
+        if any(isinstance(res, ResponseRecord) for res in responses):
+            raise AssertionError(
+                f"The bodies of the responses have been released (lean mode), "
+                f"call {self.get} again before calling {method}.")
+
+    def _release(self) -> None:
+        """Replace the responses by `ResponseRecord` objects in lean mode.
+
+        Notes
+        -----
+        This is called after the responses have been parsed or extracted.
+        Afterwards, the bodies of the responses are only referenced by the
+        response cache and the document cache, if the scraper has them.
+        """
+        if not self._lean:
+            return
+        if isinstance(self._res, list):
+            self._res = [
+                ResponseRecord.from_response(res)
+                if isinstance(res, requests.Response) else res
+                for res in self._res
+            ]
+        elif isinstance(self._res, requests.Response):
+            self._res = ResponseRecord.from_response(self._res)
+
+    def stream_parse(
+        self,
+        url: Union[str, List[str]],
+        name: str,
+        limit: Optional[int] = 1,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        **kwargs: dict,
+    ) -> DATA_OBJECT:
+        """Load and parse url(s), stopping each download as soon as the
+        requested elements are complete.
+
+        Parameters
+        ----------
+        url : Union[str, List[str]]
+            The url or list of urls to be loaded.
+        name : str
+            The name of the elements to be parsed, e.g. "head" or "table".
+        limit : Optional[int]
+            The number of elements per page after which the download stops,
+            by default 1. If None, all elements are parsed.
+        chunk_size : int
+            The number of bytes read at once, by default
+            `STREAM_CHUNK_SIZE`.
+
+        Other Parameters
+        ----------------
+        Parameters passed into the `SoupStrainer` object, the same as for
+        `parse()`.
+
+        Returns
+        -------
+        DATA_OBJECT
+            The parsed elements of each page, see `parse()`.
+
+        Notes
+        -----
+        Other than `get()` followed by `parse()`, the body of each page is
+        fed into an incremental parser while it is downloaded, and the
+        connection is closed as soon as `limit` elements are complete (see
+        `_stream_parse()`), which saves bandwidth and parsing time if the
+        elements are near the start of large pages. The `url`, `res` and
+        `data` attributes are set as by `get()` and `parse()`, the
+        `content` of a response is the part of the body downloaded.
+
+        The requests are scheduled and retried as by `get()`, but the
+        response cache is not used.
+
+        """
+        urls = [url] if isinstance(url, str) else url
+        docs = {}
+
+        def read(res: requests.Response) -> int:
+            if res.ok:
+                docs[res] = _stream_parse(
+                    res, self._parser, name, kwargs, limit, chunk_size)
+            # else read the error page such that the connection is reused
+            return len(res.content)
+
+        responses = [None] * len(urls)
+        for idx, _, res in self._iter_indexed(
+                urls, fetch=functools.partial(self._fetch_one, stream=read)):
+            responses[idx] = res
+        if isinstance(url, str):
+            self._url = url
+            self.__setattr__("_res", responses[0])
+            self._http_request["GET"] = True
+            self._data = docs.get(responses[0])
+        else:
+            self._set_responses(urls, responses)
+            self._data = [docs[res] for res in self._res]
+        self._release()
+        return self._data
+
+    def download(
+        self,
+        urls: Union[str, Iterable[str]],
+        dest: Union[str, os.PathLike],
+        names: Optional[Iterable[str]] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_in_flight: Optional[int] = None,
+    ) -> DownloadReport:
+        """Download url(s) to files, e.g. images or documents.
+
+        Parameters
+        ----------
+        urls : Union[str, Iterable[str]]
+            The url or urls to be downloaded, each url is downloaded once.
+        dest : Union[str, os.PathLike]
+            The directory of the files, which is created if it does not
+            exist.
+        names : Optional[Iterable[str]]
+            The names of the files without extension, one per url,
+            by default None, i.e. the last segment of the path of each url
+            (see `url_stems()`), numbered if it is not unique.
+        chunk_size : int
+            The number of bytes read and written at once,
+            by default `DOWNLOAD_CHUNK_SIZE`.
+        max_in_flight : Optional[int]
+            The maximum number of downloads at the same time,
+            by default None, i.e. the number is adapted by the concurrency
+            controller of the scraper.
+
+        Returns
+        -------
+        DownloadReport
+            The files written and the errors per url, and the number of
+            bytes written, the duration and the throughput in MB/s.
+
+        Raises
+        ------
+        ValueError
+            If the number of `names` differs from the number of urls.
+
+        Notes
+        -----
+        The downloads are scheduled and retried as by `iter_get()`. The
+        body of each response is streamed to a temporary file and renamed
+        once it is complete, the extension of the file is taken from the
+        response (see `save_response()`). Neither the `res` nor the `data`
+        attribute is set, and existing files are replaced.
+
+        """
+        urls = list(dict.fromkeys([urls] if isinstance(urls, str) else urls))
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        names = url_stems(urls) if names is None else list(names)
+        if len(names) != len(urls) or len(set(names)) != len(urls):
+            raise ValueError(
+                f"Expected {len(urls)} unique names, got {len(names)}.")
+        names = dict(zip(urls, names))
+        saved = {}
+
+        def save(url: str, res: requests.Response) -> int:
+            path = saved[url] = save_response(
+                res, dest, names[url], chunk_size)
+            # the error page of a bad response is read but not written
+            return len(res.content) if path is None else path.stat().st_size
+
+        def fetch(url: str) -> RESPONSE_OBJECT:
+            return self._fetch_one(url, stream=functools.partial(save, url))
+
+        paths = {}
+        errors = {}
+        size = 0
+        start = time.perf_counter()
+        for url, res in self._iter_fetch(urls, max_in_flight, fetch):
+            path = saved.get(url)
+            if isinstance(res, requests.Response) and path is not None:
+                paths[url] = path
+                size += path.stat().st_size
+            else:
+                errors[url] = res
+        report = DownloadReport(
+            paths, errors, size, time.perf_counter() - start)
+        self._log.info(
+            "Downloaded %d files (%.1f MB) in %.2f s, %.1f MB/s.",
+            len(paths), size / 1e6, report.seconds, report.mb_per_second)
+        return report
+
+    def download_segmented(
+        self,
+        url: str,
+        dest: Union[str, os.PathLike],
+        name: Optional[str] = None,
+        segment_size: int = SEGMENT_SIZE,
+        max_in_flight: int = 4,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> DownloadReport:
+        """Download a large file in byte ranges over parallel connections.
+
+        Parameters
+        ----------
+        url : str
+            The url of the file.
+        dest : Union[str, os.PathLike]
+            The directory of the file, which is created if it does not
+            exist.
+        name : Optional[str]
+            The name of the file without extension, by default None, i.e.
+            the last segment of the path of the url (see `url_stem()`).
+        segment_size : int
+            The size of the byte ranges in bytes, by default
+            `SEGMENT_SIZE`.
+        max_in_flight : int
+            The maximum number of ranges downloaded at the same time,
+            by default 4.
+        chunk_size : int
+            The number of bytes read and written at once,
+            by default `DOWNLOAD_CHUNK_SIZE`.
+
+        Returns
+        -------
+        DownloadReport
+            The file written or the error of the url, and the number of
+            bytes written by this call, the duration and the throughput.
+
+        Notes
+        -----
+        A HEAD request determines whether the server accepts byte ranges
+        (``Accept-Ranges: bytes``) and the size of the file. If it does not,
+        or the file is not larger than `segment_size`, the file is
+        downloaded in one piece by `download()`.
+
+        Otherwise, the ranges are written into a preallocated part file
+        next to the destination (see `SegmentedFile`), which is renamed
+        once all ranges are complete. Failed ranges are retried according
+        to the retry policy of the scraper. If ranges are still missing,
+        the error is reported and the part file is kept, calling this
+        method again downloads only the missing ranges, provided the size
+        and the ETag (or Last-Modified) of the file are unchanged.
+
+        """
+        start = time.perf_counter()
+        try:
+            # probe without changing the url and response of the scraper
+            res = self._request("HEAD", url)
+        except requests.exceptions.RequestException as e:
+            res = e
+        if isinstance(res, requests.exceptions.RequestException) \
+                or not res.ok:
+            return DownloadReport(
+                {}, {url: res}, 0, time.perf_counter() - start)
+        size = int(res.headers.get("content-length") or 0)
+        if res.headers.get("accept-ranges", "").lower() != "bytes" \
+                or size <= segment_size:
+            return self.download(
+                url, dest, names=None if name is None else [name],
+                chunk_size=chunk_size)
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        etag = res.headers.get("etag")
+        if etag is not None and etag.startswith("W/"):
+            etag = None
+        validator = etag or res.headers.get("last-modified")
+        part = SegmentedFile(
+            dest / ((name or url_stem(url)) + guess_extension(res)),
+            size,
+            segment_size,
+            validator,
+        )
+        params = {**self._get_params, "stream": True}
+        headers = params.pop("headers", self._headers(url))
+        if validator is not None:
+            # the server sends the whole file instead of the range if it
+            # has changed, which fails the range
+            headers = {**headers, "If-Range": validator}
+
+        def fetch(idx: int) -> RESPONSE_OBJECT:
+            # get a range, None if it has been written, else the response
+            # or the error of the last attempt
+            first, last = part.segments[idx]
+            attempt = 0
+            while True:
+                try:
+                    res = self._request("GET", url, headers={
+                        **headers, "Range": f"bytes={first}-{last}"},
+                        **params)
+                    if not is_transient(res):
+                        part.write(idx, res, chunk_size)
+                        if self._metrics is not None:
+                            self._metrics.record_download(
+                                res, last + 1 - first)
+                        return None
+                    res.close()
+                except requests.exceptions.RequestException as e:
+                    res = e
+                if self._retry is None \
+                        or not self._retry.should_retry(res, attempt):
+                    return res
+                time.sleep(self._retry.delay(res, attempt))
+                attempt += 1
+
+        pending = part.pending
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            errors = [err for err in executor.map(fetch, pending)
+                      if err is not None]
+        written = sum(
+            part.segments[idx][1] + 1 - part.segments[idx][0]
+            for idx in set(pending) - set(part.pending))
+        seconds = time.perf_counter() - start
+        if errors:
+            self._log.warning(
+                "Downloading %s has failed, %d of %d ranges are missing!\n"
+                "The exception thrown is %s", url, len(part.pending),
+                len(part.segments), errors[0])
+            return DownloadReport({}, {url: errors[0]}, written, seconds)
+        report = DownloadReport({url: part.finish()}, {}, written, seconds)
+        self._log.info(
+            "Downloaded %s (%.1f MB) in %d ranges in %.2f s, %.1f MB/s.",
+            url, written / 1e6, len(pending), seconds, report.mb_per_second)
+        return report
+
+    def pipeline(
+        self,
+        urls: List[str],
+        name: Optional[str] = None,
+        parallel: bool = False,
+        extract: Optional[Callable[[BeautifulSoup], Any]] = None,
+        max_in_flight: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        **kwargs: dict,
+    ) -> None:
+        """Load and parse a list of urls in overlapping stages.
+
+        Parameters
+        ----------
+        urls : List[str]
+            The urls to be loaded and parsed.
+        name : Optional[str]
+            Parse only a part of the document specified by a name
+            (see the documentation for `_parse_response()`),
+            by default None.
+        parallel : bool
+            Determine whether the responses should be parsed in
+            `max_processes` worker processes instead of a single thread,
+            by default False.
+        extract : Optional[Callable[[BeautifulSoup], Any]]
+            A function which is applied on each parsed document, by default
+            None. See the documentation for `parse()`.
+        max_in_flight : Optional[int]
+            The maximum number of requests in flight at the same time,
+            by default None, i.e. the number is adapted by the concurrency
+            controller of the scraper.
+        queue_size : Optional[int]
+            The maximum number of responses waiting to be parsed,
+            by default None, i.e. twice the number of parse workers.
+
+        Other Parameters
+        ----------------
+        Parameters passed into the `SoupStrainer` object, see the
+        documentation for `parse()`.
+
+        Notes
+        -----
+        Each response is handed to the parse stage as soon as it arrives,
+        such that the network and the parse stage work at the same time.
+        If `queue_size` responses are waiting to be parsed, no new requests
+        are sent until the parse stage has caught up.
+
+        Afterwards, the `url`, `res` and `data` attributes are set as if
+        `get()` and `parse()` had been called. In lean mode, each response
+        is replaced by its `ResponseRecord` as soon as it is handed to the
+        parse stage, such that the memory used does not grow with the
+        size of the pages.
+
+        """
+        workers = self._max_processes if parallel else 1
+        if workers > 1:
+            executor_cls = ProcessPoolExecutor
+        else:
+            # the GIL prevents more than one parsing thread from speeding up
+            executor_cls = ThreadPoolExecutor
+        queue_size = queue_size or 2 * workers
+        queue = {}
+        parsed = []
+        with executor_cls(max_workers=workers) as executor:
+            for idx, url, res in self._iter_indexed(urls, max_in_flight):
+                # filter out Response >=[400] and exceptions
+                if isinstance(res, requests.exceptions.RequestException) \
+                        or not res.ok:
+                    continue
+                if len(queue) >= queue_size:
+                    done, _ = wait(queue, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        parsed.append(self._parsed(
+                            *queue.pop(future), future.result()))
+                args = (res.content, self._resolve_encoding(res),
+                        self._parser, name, kwargs, extract)
+                if workers == 1 and self._hooks.enabled:
+                    future = executor.submit(self._parse_hooked, res, args)
+                else:
+                    future = executor.submit(_parse_timed, *args)
+                if self._lean:
+                    res = ResponseRecord.from_response(res)
+                queue[future] = (idx, url, res)
+            for future, item in queue.items():
+                parsed.append(self._parsed(*item, future.result()))
+        parsed.sort(key=lambda item: item[0])
+        self._url = [url for _, url, _, _ in parsed]
+        self.__setattr__("_res", [res for _, _, res, _ in parsed])
+        self.__setattr__("_data", [obj for _, _, _, obj in parsed])
+        self._http_request["GET"] = True
+
+    def _parse_parallel(
+        self,
+        name: Optional[str],
+        extract: Optional[Callable[[BeautifulSoup], Any]],
+        kwargs: dict,
+    ) -> list:
+        """Parse the list of response objects in multiple processes.
+
+        See the documentation for `parse()`.
+        """
+        contents = [res.content for res in self._res]
+        encodings = [self._resolve_encoding(res) for res in self._res]
+        max_workers = min(self._max_processes, len(contents))
+        # send a few documents at once to each worker
+        chunksize = max(len(contents) // (max_workers * 4), 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            timed = list(executor.map(
+                _parse_timed,
+                contents,
+                encodings,
+                itertools.repeat(self._parser),
+                itertools.repeat(name),
+                itertools.repeat(kwargs),
+                itertools.repeat(extract),
+                chunksize=chunksize,
+            ))
+        if self._metrics is not None:
+            for res, (_, seconds) in zip(self._res, timed):
+                self._metrics.observe(host_of(res.url), "parse", seconds)
+        return [obj for obj, _ in timed]
+
+    def _parse(
+        self,
+        res: requests.Response,
+        name: Optional[str],
+        kwargs: dict,
+        extract: Optional[Callable[[BeautifulSoup], Any]] = None,
+    ) -> Any:
+        """Parse the content of a response, timed if metrics are kept.
+
+        See the documentation for `_parse_content()`.
+        """
+        args = (res.content, self._resolve_encoding(res), self._parser, name,
+                kwargs, extract)
+        if self._hooks.enabled:
+            obj, seconds = self._parse_hooked(res, args)
+        elif self._metrics is None:
+            return _parse_content(*args)
+        else:
+            obj, seconds = _parse_timed(*args)
+        if self._metrics is not None:
+            self._metrics.observe(host_of(res.url), "parse", seconds)
+        return obj
+
+    def _parse_hooked(
+        self,
+        res: requests.Response,
+        args: tuple,
+    ) -> Tuple[Any, float]:
+        """Parse the content of a response like `_parse_timed()` and call
+        the parse and extract hooks.
+
+        The duration returned includes the extraction, as for
+        `_parse_timed()`.
+        """
+        *args, extract = args
+        self._hooks.emit("before_parse", res)
+        start = time.perf_counter()
+        try:
+            obj = _parse_content(*args)
+        except Exception as e:
+            self._hooks.emit(
+                "after_parse", res, e, time.perf_counter() - start)
+            raise
+        seconds = time.perf_counter() - start
+        self._hooks.emit("after_parse", res, obj, seconds)
+        if extract is None:
+            return obj, seconds
+        start = time.perf_counter()
+        obj = self._extract(res, obj, extract)
+        return obj, seconds + time.perf_counter() - start
+
+    def _extract(
+        self,
+        res: requests.Response,
+        obj: Any,
+        extract: Callable[[BeautifulSoup], Any],
+    ) -> Any:
+        """Apply an extract function on a parsed document and call the
+        extract hooks."""
+        if not self._hooks.enabled:
+            return extract(obj)
+        self._hooks.emit("before_extract", res, obj)
+        start = time.perf_counter()
+        try:
+            value = extract(obj)
+        except Exception as e:
+            self._hooks.emit(
+                "after_extract", res, e, time.perf_counter() - start)
+            raise
+        self._hooks.emit(
+            "after_extract", res, value, time.perf_counter() - start)
+        return value
+
+    def _parsed(
+        self,
+        idx: int,
+        url: str,
+        res: Union[requests.Response, ResponseRecord],
+        timed: Tuple[Any, float],
+    ) -> Tuple[int, str, Union[requests.Response, ResponseRecord], Any]:
+        """Record the duration of a parse of the pipeline."""
+        obj, seconds = timed
+        if self._metrics is not None:
+            self._metrics.observe(host_of(url), "parse", seconds)
+        return idx, url, res, obj
 
     def _parse_response(
         self,
         res: requests.Response,
         name: Optional[str],
+        extract: Optional[Callable[[BeautifulSoup], Any]] = None,
         **kwargs: dict,
-    ) -> BeautifulSoup:
+    ) -> Any:
         """Parse a single response object.
 
         Parameters
@@ -490,6 +1842,9 @@ class Webscraper(Scraper):
         name : Optional[str]
             Parse only a part of the document specified by a `name`
             (see [1]), by default `None`.
+        extract : Optional[Callable[[BeautifulSoup], Any]]
+            A function which is applied on the parsed document,
+            by default None.
 
         Other Parameters
         ----------------
@@ -498,8 +1853,9 @@ class Webscraper(Scraper):
 
         Returns
         -------
-        BeautifulSoup
-            The response as Beautifulsoup object.
+        Any
+            The response as Beautifulsoup object, or the value returned by
+            `extract`.
 
         Notes
         -----
@@ -512,18 +1868,13 @@ class Webscraper(Scraper):
         [2] https://www.crummy.com/software/BeautifulSoup/bs4/doc/#find-all
 
         """
-        # deterime the correct encoding
-        http_encoding = res.encoding if "charset" in res.headers.get(
-            "content-type", "").lower() else None
-        html_encoding = EncodingDetector.find_declared_encoding(
-            res.content, is_html=True)
-        encoding = html_encoding or http_encoding
-        # parse the document
-        parse_only = SoupStrainer(name, **kwargs)
-        obj = BeautifulSoup(
-            res.content,
-            self._parser,
-            from_encoding=encoding,
-            parse_only=parse_only,
-        )
+        if self._doc_cache is None:
+            return self._parse(res, name, kwargs, extract)
+        key = self._doc_cache.key(res.content, self._parser, name, kwargs)
+        obj = self._doc_cache.get(key)
+        if obj is None:
+            obj = self._parse(res, name, kwargs)
+            self._doc_cache.put(key, obj)
+        if extract is not None:
+            return self._extract(res, obj, extract)
         return obj